@@ -28,8 +28,22 @@ Modules exported by this package:
 - `scraping`: Provide functions and the Scraper object for getting various data via HTML scraping.
 - `jsonhandles`: Abstract classes for handling JSON data blocks.
 - `basehandles`: Abstract classes with common methods for both JSON and HTML wrappers.
+- `transport`: Provide the pooled HTTP Transport object that all clients share.
+- `decoding`: Provide the JSON Decoder object, fast strict decoding with a json5 fallback.
+- `sse`: Provide the SSEReader object, a fast reader for server-sent event streams like the chat.
+- `config`: Provide the Config object, per-client settings for timeouts, pools, retries and URLs.
+- `metrics`: Provide the MetricsRegistry of counters, gauges and histograms that requests and chat processing update.
+- `profiling`: Hooks around the hot paths, with sampling and cProfile integrations.
+- `events`: Typed events for changes between Live Stream API refreshes.
+- `polling`: Provide the PollScheduler object for polling many Live Stream API keys at once.
+- `asyncapi`: Provide the AsyncRumbleAPI object for polling the Live Stream API from asyncio. Needs aiohttp.
 - `utils`: Various utility functions for internal calculations and checks.
 - `static`: Global data that does not change across the package.
+- `recording`: Provide the RecordingTransport and ReplayTransport objects, for recording traffic and replaying it offline.
+- `testing`: Provide the StandInServer, a local stand-in for every Rumble endpoint, driven by fixtures.
+- `benchmarks`: Performance benchmarks, run with `python -m cocorum.benchmarks`.
+
+The `chatapi`, `servicephp`, `uploadphp`, `scraping`, `basehandles` and `asyncapi` modules are only imported on first use, so `import cocorum` stays fast.
 
 Example usage:
 
@@ -77,14 +91,107 @@ if livestream:
 ```
 S.D.G."""
 
+import functools
+import hashlib
+import importlib
+import json
+import queue
+import re
+import threading
 import time
+import types
 import warnings
-import requests
 
-# Make all submodules available from base name
-from . import chatapi, servicephp, uploadphp, scraping, jsonhandles, utils, static
+# Make the lightweight submodules available from base name
+from . import jsonhandles, utils, static, transport, events, polling, decoding, config, metrics, profiling
+
+# Submodules with heavy dependencies, made available from base name on first use
+LAZY_SUBMODULES = ("chatapi", "servicephp", "uploadphp", "scraping", "basehandles", "asyncapi", "testing", "recording", "sse")
+
+def __getattr__(name):
+    """Import a lazily loaded submodule on first use.
+
+    Args:
+        name (str): The attribute that was not found.
+
+    Returns:
+        Module (types.ModuleType): The submodule.
+        """
+
+    if name in LAZY_SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    """List our attributes, including submodules that are not loaded yet"""
+    return sorted(set(globals()) | set(LAZY_SUBMODULES))
 
 from .jsonhandles import JSONObj, JSONUserAction
+from .transport import Transport, get_default_transport, set_default_transport
+from .config import Config, get_default_config
+
+# The "now" field of the API JSON changes on every response, even when nothing else did
+API_NOW_FIELD = re.compile(rb'"now"\s*:\s*("[^"]*"|[-\d.]+)')
+
+def _fingerprint_response(content: bytes):
+    """Fingerprint a raw Live Stream API response, without the "now" field which is always new.
+
+    Args:
+        content (bytes): The raw response body from the API.
+
+    Returns:
+        Fingerprint (bytes): A hash of the response, minus the "now" field.
+        Now (re.Match): The match of the "now" field, or None if there was none.
+        """
+
+    now_match = API_NOW_FIELD.search(content)
+    view = memoryview(content)
+    hasher = hashlib.blake2b(digest_size = 16)
+    if now_match:
+        hasher.update(view[:now_match.start()])
+        hasher.update(view[now_match.end():])
+    else:
+        hasher.update(view)
+
+    return hasher.digest(), now_match
+
+def _keep_unchanged_blocks(old_jsondata: dict, new_jsondata: dict) -> set:
+    """Find which top-level blocks of the API JSON changed, and swap in the old objects of those that did not.
+    Keeping the old objects lets change detection compare unchanged blocks by identity.
+
+    Args:
+        old_jsondata (dict): The JSON from the previous refresh.
+        new_jsondata (dict): The freshly decoded JSON. Modified in place.
+
+    Returns:
+        Changed (set): The top-level keys whose blocks changed.
+        """
+
+    changed_keys = set()
+    for key, block in new_jsondata.items():
+        if key == "now":
+            continue
+        if key in old_jsondata and old_jsondata[key] == block:
+            new_jsondata[key] = old_jsondata[key]
+        else:
+            changed_keys.add(key)
+
+    return changed_keys
+
+def _keep_unchanged_livestreams(old_list: list, new_list: list):
+    """Swap in the old JSON of livestreams that did not change, so they compare by identity.
+
+    Args:
+        old_list (list): The livestreams JSON block from the previous refresh.
+        new_list (list): The freshly decoded livestreams JSON block. Modified in place.
+        """
+
+    old_streams = {stream_json["id"] : stream_json for stream_json in old_list}
+    for i, stream_json in enumerate(new_list):
+        old_json = old_streams.get(stream_json["id"])
+        if old_json == stream_json:
+            new_list[i] = old_json
 
 class Follower(JSONUserAction):
     """Rumble follower"""
@@ -230,10 +337,10 @@ class Livestream():
         """
 
         # The livestream has not disappeared from the API listing,
-        # the key requested is not a value that doesn't change,
-        # and it has been api.refresh rate since the last time we refreshed
-        if (not self.is_disappeared) and (key not in static.StaticAPIEndpoints.stream) and (time.time() - self.api.last_refresh_time > self.api.refresh_rate):
-            self.api.refresh()
+        # and the key requested is not a value that doesn't change,
+        # so refresh if it has been api.refresh rate since the last time we refreshed
+        if (not self.is_disappeared) and (key not in static.StaticAPIEndpoints.stream):
+            self.api.check_refresh()
 
         return self._jsondata[key]
 
@@ -247,7 +354,7 @@ class Livestream():
         """The livestream ID in base 36"""
         return self.stream_id
 
-    @property
+    @functools.cached_property
     def stream_id_b10(self):
         """The livestream chat ID (stream ID in base 10)"""
         return utils.base_36_to_10(self.stream_id)
@@ -307,6 +414,34 @@ class Livestream():
         """The livestream chat"""
         return self.__chat
 
+class LivestreamSnapshot(Livestream):
+    """Rumble livestream as of one API refresh, which never refreshes"""
+    def __init__(self, jsondata, snapshot):
+        """Rumble livestream as of one API refresh, which never refreshes
+
+    Args:
+        jsondata (dict): The JSON block for a single livestream.
+        snapshot (APISnapshot): The API data snapshot that holds us.
+        """
+
+        Livestream.__init__(self, jsondata, snapshot)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        """Refuse to change attributes once created"""
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Snapshots are read-only")
+        object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        """Return a key from the JSON, without refreshing
+
+    Args:
+        key (str): A valid JSON key.
+        """
+
+        return self._jsondata[key]
+
 class ChatMessage(JSONUserAction):
     """A single message in a Rumble livestream chat"""
     def __eq__(self, other):
@@ -539,7 +674,7 @@ class GiftedSub(JSONObj):
         """The numeric ID of the stream this gift was sent on, in base 10"""
         return self.video_id
 
-    @property
+    @functools.cached_property
     def video_id_b36(self) -> str:
         """The numeric ID of the stream this gift was sent on, in base 36"""
         return utils.base_10_to_36(self.video_id)
@@ -549,88 +684,14 @@ class GiftedSub(JSONObj):
         """The username of who purchased this gift"""
         return self["purchased_by"]
 
-class RumbleAPI():
-    """Rumble Live Stream API wrapper"""
-    def __init__(self, api_url, refresh_rate = static.Delays.api_refresh_default):
-        """Rumble Live Stream API wrapper
-
-    Args:
-        api_url (str): The Rumble API URL, with the key.
-        refresh_rate (int, float): How long to reuse queried data before refreshing.
-            Defaults to static.Delays.api_refresh_default.
-        """
-
-        self.refresh_rate = refresh_rate
-        self.last_refresh_time = 0
-        self.last_newfollower_time = time.time()
-        self.last_newsubscriber_time = time.time()
-        self.__livestreams = {}
-#        self.__gifted_subs = {}
-        self._jsondata = {}
-        self.api_url = api_url
-
-        # Warn about refresh rate being below minimum
-        if self.refresh_rate < static.Delays.api_refresh_minimum:
-            warnings.warn(f"Cocorum set to over-refresh, rate of {self.refresh_rate} seconds (less than {static.Delays.api_refresh_minimum})." + \
-                "Superscript must self-limit or Rumble will reject queries!")
+class APIData():
+    """Data from the Rumble Live Stream API (abstract).
+    Subclasses provide __getitem__ and the livestreams dictionary."""
 
     @property
-    def api_url(self):
-        """Our API URL"""
-        return self.__api_url
-
-    @api_url.setter
-    def api_url(self, url):
-        """Set a new API URL, and refresh
-
-    Args:
-        url (str): The new API URL to use.
-        """
-
-        self.__api_url = url
-        self.refresh()
-
-    def __getitem__(self, key):
-        """Return a key from the JSON, refreshing if necessary
-
-    Args:
-        key (str): A valid JSON key.
-        """
-
-        # This is not a static key, and it's time to refresh our data
-        if key not in static.StaticAPIEndpoints.main and time.time() - self.last_refresh_time > self.refresh_rate:
-            self.refresh()
-
-        return self._jsondata[key]
-
-    def check_refresh(self):
-        """Refresh only if we are past the refresh rate"""
-        if time.time() - self.last_refresh_time > self.refresh_rate:
-            self.refresh()
-
-    def refresh(self):
-        """Reload data from the API"""
-        self.last_refresh_time = time.time()
-        response = requests.get(self.api_url, headers = static.RequestHeaders.user_agent, timeout = static.Delays.request_timeout)
-        assert response.status_code == 200, "Status code " + str(response.status_code)
-
-        self._jsondata = response.json()
-
-        # Remove livestream references that are no longer listed
-        listed_ids = [jsondata["id"] for jsondata in self._jsondata["livestreams"]]
-        for stream_id in self.__livestreams.copy():
-            if stream_id not in listed_ids:
-                self.__livestreams[stream_id].is_disappeared = True
-                del self.__livestreams[stream_id]
-
-        # Update livestream references' JSONs in-place
-        for jsondata in self._jsondata["livestreams"]:
-            try:
-                # Update the JSON of the stored livestream
-                self.__livestreams[jsondata["id"]]._jsondata = jsondata
-
-            except KeyError: # The livestream has not been stored yet
-                self.__livestreams[jsondata["id"]] = Livestream(jsondata, self)
+    def livestreams(self):
+        """A dictionairy of our livestreams"""
+        raise NotImplementedError
 
     @property
     def data_timestamp(self):
@@ -696,18 +757,6 @@ class RumbleAPI():
         data = self["followers"]["recent_followers"].copy()
         return [Follower(jsondata_block) for jsondata_block in data]
 
-    @property
-    def new_followers(self):
-        """Followers that are newer than the last time this was checked (or newer than RumbleAPI object creation)"""
-        recent_followers = self.recent_followers
-
-        nf = [follower for follower in recent_followers if follower.followed_on > self.last_newfollower_time]
-        nf.sort(key = lambda x: x.followed_on)
-
-        self.last_newfollower_time = time.time()
-
-        return nf
-
     @property
     def num_subscribers(self):
         """The number of subscribers of this user or channel"""
@@ -731,30 +780,13 @@ class RumbleAPI():
         data = self["subscribers"]["recent_subscribers"].copy()
         return [Subscriber(jsondata_block) for jsondata_block in data]
 
-    @property
-    def new_subscribers(self):
-        """Subscribers that are newer than the last time this was checked (or newer than RumbleAPI object creation)"""
-        recent_subscribers = self.recent_subscribers
-
-        ns = [subscriber for subscriber in recent_subscribers if subscriber.subscribed_on > self.last_newsubscriber_time]
-        ns.sort(key = lambda x: x.subscribed_on)
-
-        self.last_newsubscriber_time = time.time()
-
-        return ns
-
-    @property
-    def livestreams(self):
-        """A dictionairy of our livestreams"""
-        self.check_refresh()
-        return self.__livestreams
-
     @property
     def latest_livestream(self):
         """Return latest livestream to be created. Use this to get a single running livestream"""
-        if not self.livestreams:
+        livestreams = self.livestreams # Only get it once, a refresh might swap it out in between
+        if not livestreams:
             return None # No livestreams are running
-        return max(self.livestreams.values(), key = lambda x: x.created_on)
+        return max(livestreams.values(), key = lambda x: x.created_on)
 
     @property
     def latest_gifted_sub(self):
@@ -767,3 +799,536 @@ class RumbleAPI():
         """The most recent subscriptions gifts sent on the user or channel.
     WARNING: This is shallow! I have no way to reliably ID particular gifts to update the GiftedSub data."""
         return [GiftedSub(jsondata) for jsondata in self["recent_gifted_subs"]]
+
+class APISnapshot(APIData):
+    """A consistent, read-only view of the Rumble Live Stream API data from one refresh.
+    Reading it never triggers a refresh or freshness check, so it is cheap to read and safe to hand to other threads."""
+    def __init__(self, jsondata, refresh_time):
+        """A consistent, read-only view of the Rumble Live Stream API data from one refresh.
+
+    Args:
+        jsondata (dict): The complete JSON from one API refresh. Must not be modified afterwards.
+        refresh_time (float): When the refresh happened, in seconds since Epoch UTC.
+        """
+
+        self._jsondata = jsondata
+        self.refresh_time = refresh_time
+        self.__livestreams = types.MappingProxyType({stream_json["id"] : LivestreamSnapshot(stream_json, self) for stream_json in jsondata.get("livestreams", ())})
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        """Refuse to change attributes once created"""
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Snapshots are read-only")
+        object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        """Return a key from the JSON, without refreshing
+
+    Args:
+        key (str): A valid JSON key.
+        """
+
+        return self._jsondata[key]
+
+    @property
+    def age(self):
+        """How many seconds old this snapshot's data is"""
+        return time.time() - self.refresh_time
+
+    @property
+    def livestreams(self):
+        """A read-only dictionairy of our livestreams"""
+        return self.__livestreams
+
+class APIIngester:
+    """Takes in raw Live Stream API responses and finds what changed between them, without doing any I/O.
+    RumbleAPI and AsyncRumbleAPI both hand their responses to one of these."""
+    def __init__(self, metrics_registry = None):
+        """Takes in raw Live Stream API responses and finds what changed between them, without doing any I/O.
+
+    Args:
+        metrics_registry (MetricsRegistry): Where to record ingest times and refresh counts.
+            Defaults to the shared default registry.
+        """
+
+        self.metrics = metrics_registry or metrics.get_default_registry()
+        self.jsondata = {} # The JSON of the last response that changed
+        self.now = None # The "now" field of the last response, kept apart so it does not make the data look changed
+        self.success_time = 0 # When the last response was taken in
+        self.changed_keys = frozenset() # Top-level JSON keys that changed with the last response
+        self.changes = [] # Change events found in the last response
+        self.follower_log = events.NewItemLog("followed_on") # Followers by identity, as they are found
+        self.subscriber_log = events.NewItemLog("subscribed_on") # Subscribers by identity, as they are found
+        self.__fingerprint = None # Hash of the last response, minus the "now" field
+        self.__snapshot = None # Cached snapshot of the current data
+
+    @property
+    def snapshot(self):
+        """A snapshot of the data from the last response"""
+        # Only build a new snapshot if the data changed since the last one
+        jsondata = self.jsondata
+        snapshot = self.__snapshot
+        if snapshot is None or snapshot._jsondata is not jsondata:
+            snapshot = APISnapshot(jsondata, self.success_time)
+            self.__snapshot = snapshot
+
+        return snapshot
+
+    def ingest(self, content: bytes, api = None):
+        """Take in a raw API response, only doing the work for the parts that changed, and find the change events.
+
+    Args:
+        content (bytes): The raw response body from the API.
+        api (RumbleAPI, AsyncRumbleAPI): The client the response is for, given to profiling hooks.
+            Defaults to None.
+
+    Returns:
+        Changed (bool): Did the data change since the last response?
+        """
+
+        old_jsondata = self.jsondata
+        old_success_time = self.success_time
+
+        start = time.perf_counter()
+        with profiling.section(profiling.Points.api_parse, api = api, size = len(content)):
+            changed = self.__parse(content)
+        self.metrics.histogram("api_ingest_seconds").observe(time.perf_counter() - start)
+        self.metrics.counter("api_refreshes", changed = changed).inc()
+
+        self.success_time = time.time()
+
+        # Find what changed, only building snapshots if something did
+        self.changes = []
+        if changed and old_jsondata:
+            old_snapshot = self.__snapshot
+            if old_snapshot is None or old_snapshot._jsondata is not old_jsondata:
+                old_snapshot = APISnapshot(old_jsondata, old_success_time)
+            self.changes = events.diff_snapshots(old_snapshot, self.snapshot)
+
+        return changed
+
+    def __parse(self, content: bytes):
+        """Decode a raw API response, keeping the old objects of the parts that did not change.
+
+    Args:
+        content (bytes): The raw response body from the API.
+
+    Returns:
+        Changed (bool): Did the data change since the last response?
+        """
+
+        fingerprint, now_match = _fingerprint_response(content)
+
+        # Nothing changed but the timestamp, so skip decoding the rest
+        if fingerprint == self.__fingerprint:
+            if now_match:
+                self.now = json.loads(now_match.group(1))
+            self.changed_keys = frozenset()
+            return False
+
+        self.__fingerprint = fingerprint
+        new_jsondata = json.loads(content)
+        changed_keys = _keep_unchanged_blocks(self.jsondata, new_jsondata)
+
+        if "livestreams" in changed_keys:
+            _keep_unchanged_livestreams(self.jsondata.get("livestreams", []), new_jsondata["livestreams"])
+
+        self.jsondata = new_jsondata
+        self.now = new_jsondata.get("now")
+        self.changed_keys = frozenset(changed_keys)
+
+        if "followers" in changed_keys:
+            self.follower_log.ingest([Follower(jsondata) for jsondata in new_jsondata["followers"]["recent_followers"]])
+
+        if "subscribers" in changed_keys:
+            self.subscriber_log.ingest([Subscriber(jsondata) for jsondata in new_jsondata["subscribers"]["recent_subscribers"]])
+
+        return True
+
+class RumbleAPI(APIData):
+    """Rumble Live Stream API wrapper"""
+    def __init__(self, api_url, refresh_rate = static.Delays.api_refresh_default, transport: Transport = None, background_refresh: bool = False, min_request_interval = static.Delays.api_refresh_minimum, refresh_wait: bool = True, refresh_policy = None, config: Config = None):
+        """Rumble Live Stream API wrapper
+
+    Args:
+        api_url (str): The Rumble API URL, with the key.
+        refresh_rate (int, float): How long to reuse queried data before refreshing.
+            Defaults to static.Delays.api_refresh_default.
+        transport (Transport): The HTTP transport to make requests with.
+            Defaults to the config's transport if a config is given, otherwise the shared default transport.
+        background_refresh (bool): Refresh from a daemon thread, so reading data never waits on the network.
+            Defaults to False, refresh when data is read after the refresh rate has passed.
+        min_request_interval (int, float): Hard floor on the time between requests, held even across threads.
+            Defaults to static.Delays.api_refresh_minimum.
+        refresh_wait (bool): When data is read while another thread is refreshing, wait for that refresh to finish.
+            Defaults to True. If False, return the previous data instead.
+        refresh_policy (polling.RefreshPolicy): Sets refresh_rate after each successful refresh, e.g. polling.AdaptiveRefreshPolicy().
+            Defaults to None, keep refresh_rate fixed.
+        config (Config): Settings for the request timeout and headers.
+            Defaults to the default config.
+        """
+
+        self.config = config or get_default_config()
+        self.transport = transport or (config.transport if config else get_default_transport())
+        self.refresh_rate = refresh_rate
+        self.refresh_policy = refresh_policy
+        self.min_request_interval = min_request_interval
+        self.refresh_wait = refresh_wait
+        self.last_refresh_time = 0
+        self.__refresh_lock = threading.RLock() # Only one refresh may be in flight at a time
+        self.__ingester = APIIngester(self.transport.metrics) # Parses responses and finds changes
+        self.follower_log = self.__ingester.follower_log # Followers by identity, as they are found
+        self.subscriber_log = self.__ingester.subscriber_log # Subscribers by identity, as they are found
+        self.__new_followers_cursor = self.follower_log.cursor()
+        self.__new_subscribers_cursor = self.subscriber_log.cursor()
+        self.__livestreams = types.MappingProxyType({})
+#        self.__gifted_subs = {}
+        self.last_refresh_error = None # The exception from the last refresh, if it failed
+        self.__background_thread = None
+        self.__background_stop = threading.Event()
+        self.__change_callbacks = [] # Functions to call with each change event
+        self.api_url = api_url
+
+        if background_refresh:
+            self.start_background_refresh()
+
+        # Warn about refresh rate being below minimum
+        if self.refresh_rate < static.Delays.api_refresh_minimum:
+            warnings.warn(f"Cocorum set to over-refresh, rate of {self.refresh_rate} seconds (less than {static.Delays.api_refresh_minimum})." + \
+                f"Requests will still be spaced at least {self.min_request_interval} seconds apart.")
+
+        # Warn about the request spacing floor being below minimum
+        if self.min_request_interval < static.Delays.api_refresh_minimum:
+            warnings.warn(f"Cocorum set to allow requests {self.min_request_interval} seconds apart (less than {static.Delays.api_refresh_minimum})." + \
+                "Superscript must self-limit or Rumble will reject queries!")
+
+    @property
+    def api_url(self):
+        """Our API URL"""
+        return self.__api_url
+
+    @api_url.setter
+    def api_url(self, url):
+        """Set a new API URL, and refresh
+
+    Args:
+        url (str): The new API URL to use.
+        """
+
+        self.__api_url = url
+        self.refresh()
+
+    def __getitem__(self, key):
+        """Return a key from the JSON, refreshing if necessary
+
+    Args:
+        key (str): A valid JSON key.
+        """
+
+        # This is not a static key, so refresh our data if it's time
+        if key not in static.StaticAPIEndpoints.main:
+            self.check_refresh()
+
+        return self._jsondata[key]
+
+    @property
+    def is_stale(self):
+        """Has it been refresh_rate since the last refresh?"""
+        return time.time() - self.last_refresh_time > self.refresh_rate
+
+    def check_refresh(self):
+        """Refresh only if we are past the refresh rate, and not refreshing in the background.
+    If another thread is already refreshing, wait for it or keep the previous data, depending on refresh_wait."""
+
+        if self.background_refreshing or not self.is_stale:
+            return
+
+        # Another thread is already refreshing
+        if not self.__refresh_lock.acquire(blocking = False):
+            if self.refresh_wait:
+                with self.__refresh_lock:
+                    pass
+            return
+
+        changes = []
+        try:
+            # Another thread may have finished a refresh just before we got the lock,
+            # and we never break the request spacing floor just to read data
+            if self.is_stale and time.time() - self.last_refresh_time >= self.min_request_interval:
+                self.__refresh()
+                changes = self.last_changes
+
+        finally:
+            self.__refresh_lock.release()
+
+        self.__announce(changes)
+
+    @property
+    def background_refreshing(self):
+        """Are we refreshing from a background thread?"""
+        return self.__background_thread is not None and self.__background_thread.is_alive()
+
+    def start_background_refresh(self):
+        """Start refreshing every refresh_rate from a daemon thread.
+    Reading data will then always return the last good data immediately, see data_age and last_refresh_error."""
+
+        if self.background_refreshing:
+            return
+
+        self.__background_stop.clear()
+        self.__background_thread = threading.Thread(target = self.__background_loop, daemon = True)
+        self.__background_thread.start()
+
+    def stop_background_refresh(self):
+        """Stop refreshing from the background thread, and go back to refreshing when data is read"""
+        self.__background_stop.set()
+        if self.__background_thread and self.__background_thread is not threading.current_thread():
+            self.__background_thread.join()
+
+        self.__background_thread = None
+
+    def __background_loop(self):
+        """Refresh every refresh_rate until told to stop"""
+        # Wait until the next refresh is due, or we are told to stop
+        while not self.__background_stop.wait(max(self.refresh_rate - (time.time() - self.last_refresh_time), 0)):
+            try:
+                self.refresh()
+
+            # The error is recorded by refresh(), keep the last good data and try again next time
+            except Exception:
+                pass
+
+    @property
+    def _jsondata(self):
+        """The JSON from the last successful refresh"""
+        return self.__ingester.jsondata
+
+    @property
+    def data_timestamp(self):
+        """The timestamp on the last data refresh"""
+        return self.__ingester.now
+
+    @property
+    def last_success_time(self):
+        """Last time a refresh succeeded"""
+        return self.__ingester.success_time
+
+    @property
+    def last_changed_keys(self):
+        """Top-level JSON keys that changed on the last refresh"""
+        return self.__ingester.changed_keys
+
+    @property
+    def last_changes(self):
+        """Change events found by the last refresh"""
+        return self.__ingester.changes
+
+    @property
+    def data_age(self):
+        """How many seconds old our data is, since the last successful refresh"""
+        return time.time() - self.last_success_time
+
+    def add_change_callback(self, callback):
+        """Call a function with each change event found by a refresh.
+
+    Args:
+        callback (callable): Takes one events.APIEvent. Called from whichever thread did the refresh.
+        """
+
+        self.__change_callbacks.append(callback)
+
+    def remove_change_callback(self, callback):
+        """Stop calling a function with change events.
+
+    Args:
+        callback (callable): A function previously passed to add_change_callback().
+        """
+
+        self.__change_callbacks.remove(callback)
+
+    def watch(self):
+        """Generate change events as refreshes find them, forever.
+    Refreshes every refresh_rate, unless we are already refreshing in the background.
+    A failed refresh is recorded in last_refresh_error and retried next time.
+
+    Yields:
+        Event (events.APIEvent): The next change.
+        """
+
+        pending = queue.SimpleQueue()
+        self.add_change_callback(pending.put)
+        try:
+            while True:
+                # Let the background thread find changes
+                if self.background_refreshing:
+                    try:
+                        yield pending.get(timeout = self.refresh_rate)
+                    except queue.Empty:
+                        pass
+                    continue
+
+                # Refresh ourselves when it is due
+                time.sleep(max(self.refresh_rate - (time.time() - self.last_refresh_time), 0))
+                try:
+                    self.refresh()
+
+                # The error is recorded by refresh(), keep the last good data and try again next time
+                except Exception as e:
+                    warnings.warn(f"Live Stream API refresh failed: {e!r}")
+
+                while not pending.empty():
+                    yield pending.get_nowait()
+
+        finally:
+            self.remove_change_callback(pending.put)
+
+    def snapshot(self):
+        """Get a consistent, read-only view of the data from one refresh, refreshing first if necessary.
+    Use this to read several values that must all come from the same poll.
+
+    Returns:
+        Snapshot (APISnapshot): The data as of the last successful refresh.
+        """
+
+        self.check_refresh()
+        return self.__current_snapshot()
+
+    def __current_snapshot(self):
+        """Get a snapshot of the data we hold now, without refreshing
+
+    Returns:
+        Snapshot (APISnapshot): The data as of the last successful refresh.
+        """
+
+        return self.__ingester.snapshot
+
+    def refresh(self):
+        """Reload data from the API.
+    Waits for any refresh already in flight, and then for min_request_interval since the last request.
+
+    Returns:
+        Changed (bool): Did the data change since the last refresh?
+        """
+
+        with self.__refresh_lock:
+            # Hold to the hard floor on request spacing
+            wait = self.last_refresh_time + self.min_request_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+
+            changed = self.__refresh()
+            changes = self.last_changes
+
+        # Callbacks run without the lock, so they may read or refresh the API themselves
+        self.__announce(changes)
+        return changed
+
+    def __refresh(self):
+        """Reload data from the API, assuming we hold the refresh lock and may make a request now
+
+    Returns:
+        Changed (bool): Did the data change since the last refresh?
+        """
+
+        self.last_refresh_time = time.time()
+        try:
+            response = self.transport.get(self.api_url, endpoint = "livestream_api", headers = self.config.headers, timeout = self.config.request_timeout)
+            assert response.status_code == 200, "Status code " + str(response.status_code)
+            changed = self._ingest(response.content)
+
+        except Exception as e:
+            self.last_refresh_error = e
+            raise
+
+        self.last_refresh_error = None
+
+        # Let the policy decide when to refresh next
+        if self.refresh_policy:
+            self.refresh_rate = self.refresh_policy.next_interval(self, changed)
+
+        return changed
+
+    def __announce(self, changes: list):
+        """Call the change callbacks with each change event. A callback that raises does not stop the others.
+
+    Args:
+        changes (list): The change events.
+        """
+
+        for event in changes:
+            for callback in tuple(self.__change_callbacks):
+                try:
+                    callback(event)
+                except Exception as e:
+                    warnings.warn(f"Change callback {callback!r} failed on {event!r}: {e!r}")
+
+    def _ingest(self, content: bytes):
+        """Take in a raw API response, only doing the work for the parts that changed.
+
+    Args:
+        content (bytes): The raw response body from the API.
+
+    Returns:
+        Changed (bool): Did the data change since the last refresh?
+        """
+
+        changed = self.__ingester.ingest(content, self)
+        if "livestreams" in self.last_changed_keys:
+            self.__update_livestreams(self._jsondata["livestreams"])
+
+        return changed
+
+    def __update_livestreams(self, livestreams_json):
+        """Update our livestream references from a changed livestreams block
+
+    Args:
+        livestreams_json (list): The new livestreams JSON block, with the JSON of unchanged livestreams kept from before.
+        """
+
+        listed = {jsondata["id"] : i for i, jsondata in enumerate(livestreams_json)}
+
+        # Build a new dictionary and swap it in at the end, as callers may be iterating over the old one from another thread
+        livestreams = {}
+
+        # Mark livestream references that are no longer listed
+        for stream_id, livestream in self.__livestreams.items():
+            if stream_id not in listed:
+                livestream.is_disappeared = True
+
+        # Update livestream references' JSONs in-place, but only where they changed
+        for stream_id, i in listed.items():
+            jsondata = livestreams_json[i]
+            livestream = self.__livestreams.get(stream_id)
+
+            # The livestream has not been stored yet
+            if livestream is None:
+                livestream = Livestream(jsondata, self)
+
+            # Update the JSON of the stored livestream, if it changed
+            elif livestream._jsondata is not jsondata:
+                livestream._jsondata = jsondata
+
+            livestreams[stream_id] = livestream
+
+        self.__livestreams = types.MappingProxyType(livestreams)
+
+    @property
+    def new_followers(self):
+        """Followers that are new since the last time this was checked (or since RumbleAPI object creation).
+    Use follower_log.cursor() for a reader that does not share its place with this property."""
+        self.check_refresh()
+        return self.__new_followers_cursor.read()
+
+    @property
+    def new_subscribers(self):
+        """Subscribers that are new since the last time this was checked (or since RumbleAPI object creation).
+    Use subscriber_log.cursor() for a reader that does not share its place with this property."""
+        self.check_refresh()
+        return self.__new_subscribers_cursor.read()
+
+    @property
+    def livestreams(self):
+        """A read-only dictionairy of our livestreams, replaced rather than changed by each refresh"""
+        self.check_refresh()
+        return self.__livestreams
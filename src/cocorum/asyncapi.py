@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Asyncio Live Stream API
+
+An asyncio counterpart to the RumbleAPI object, so many Live Stream API keys can be polled from one event loop.
+Needs the optional aiohttp dependency, install with `pip install cocorum[async]`.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import asyncio
+import time
+import warnings
+import aiohttp
+from . import APIData, APIIngester, static
+from .config import get_default_config
+
+class AsyncRumbleAPI(APIData):
+    """Rumble Live Stream API wrapper for asyncio.
+    Properties read the data from the last refresh without touching the network, await snapshot() or refresh() to get fresh data."""
+    def __init__(self, api_url: str, refresh_rate = static.Delays.api_refresh_default, session: aiohttp.ClientSession = None, min_request_interval = static.Delays.api_refresh_minimum, refresh_policy = None, config = None):
+        """Rumble Live Stream API wrapper for asyncio.
+
+    Args:
+        api_url (str): The Rumble API URL, with the key.
+        refresh_rate (int, float): How long to reuse queried data before refreshing.
+            Defaults to static.Delays.api_refresh_default.
+        session (aiohttp.ClientSession): The HTTP session to make requests with. Share one between many APIs to pool their connections.
+            Defaults to creating our own on first use, closed by close().
+        min_request_interval (int, float): Hard floor on the time between requests.
+            Defaults to static.Delays.api_refresh_minimum.
+        refresh_policy (polling.RefreshPolicy): Sets refresh_rate after each successful refresh, e.g. polling.AdaptiveRefreshPolicy().
+            Defaults to None, keep refresh_rate fixed.
+        config (Config): Settings for the request timeout and headers. Its transport is not used.
+            Defaults to the default config.
+        """
+
+        self.api_url = api_url
+        self.config = config or get_default_config()
+        self.refresh_rate = refresh_rate
+        self.min_request_interval = min_request_interval
+        self.refresh_policy = refresh_policy
+        self.__session = session
+        self.__owns_session = session is None
+        self.__refresh_lock = None # Created on first use, so it belongs to the running event loop
+        self.last_refresh_time = 0
+        self.last_refresh_error = None # The exception from the last refresh, if it failed
+        self.__ingester = APIIngester() # Parses responses and finds changes
+        self.follower_log = self.__ingester.follower_log # Followers by identity, as they are found
+        self.subscriber_log = self.__ingester.subscriber_log # Subscribers by identity, as they are found
+
+        # Warn about refresh rate being below minimum
+        if self.refresh_rate < static.Delays.api_refresh_minimum:
+            warnings.warn(f"Cocorum set to over-refresh, rate of {self.refresh_rate} seconds (less than {static.Delays.api_refresh_minimum})." + \
+                f"Requests will still be spaced at least {self.min_request_interval} seconds apart.")
+
+        # Warn about the request spacing floor being below minimum
+        if self.min_request_interval < static.Delays.api_refresh_minimum:
+            warnings.warn(f"Cocorum set to allow requests {self.min_request_interval} seconds apart (less than {static.Delays.api_refresh_minimum})." + \
+                "Superscript must self-limit or Rumble will reject queries!")
+
+    async def __aenter__(self):
+        """Use the API as an async context manager, closing it on exit"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close the API on exiting the context"""
+        await self.close()
+
+    async def close(self):
+        """Close our HTTP session, if we created it"""
+        if self.__owns_session and self.__session:
+            await self.__session.close()
+            self.__session = None
+
+    def __getitem__(self, key):
+        """Return a key from the JSON of the last refresh, without refreshing
+
+    Args:
+        key (str): A valid JSON key.
+        """
+
+        return self._jsondata[key]
+
+    @property
+    def livestreams(self):
+        """A read-only dictionairy of our livestreams, as of the last refresh"""
+        return self.current.livestreams
+
+    @property
+    def current(self):
+        """A snapshot of the data from the last refresh, without refreshing"""
+        return self.__ingester.snapshot
+
+    @property
+    def _jsondata(self):
+        """The JSON from the last successful refresh"""
+        return self.__ingester.jsondata
+
+    @property
+    def data_timestamp(self):
+        """The timestamp on the last data refresh"""
+        return self.__ingester.now
+
+    @property
+    def last_success_time(self):
+        """Last time a refresh succeeded"""
+        return self.__ingester.success_time
+
+    @property
+    def last_changed_keys(self):
+        """Top-level JSON keys that changed on the last refresh"""
+        return self.__ingester.changed_keys
+
+    @property
+    def last_changes(self):
+        """Change events found by the last refresh"""
+        return self.__ingester.changes
+
+    @property
+    def is_stale(self):
+        """Has it been refresh_rate since the last refresh?"""
+        return time.time() - self.last_refresh_time > self.refresh_rate
+
+    @property
+    def data_age(self):
+        """How many seconds old our data is, since the last successful refresh"""
+        return time.time() - self.last_success_time
+
+    def __lock(self):
+        """Get the refresh lock, creating it in the running event loop if needed
+
+    Returns:
+        Lock (asyncio.Lock): Only one refresh may be in flight at a time.
+        """
+
+        if self.__refresh_lock is None:
+            self.__refresh_lock = asyncio.Lock()
+        return self.__refresh_lock
+
+    async def snapshot(self):
+        """Get a consistent, read-only view of the data from one refresh, refreshing first if necessary.
+
+    Returns:
+        Snapshot (APISnapshot): The data as of the last successful refresh.
+        """
+
+        if self.is_stale:
+            async with self.__lock():
+                # Another task may have refreshed while we waited for the lock
+                if self.is_stale and time.time() - self.last_refresh_time >= self.min_request_interval:
+                    await self.__refresh()
+
+        return self.current
+
+    async def refresh(self):
+        """Reload data from the API.
+    Waits for any refresh already in flight, and then for min_request_interval since the last request.
+
+    Returns:
+        Changed (bool): Did the data change since the last refresh?
+        """
+
+        async with self.__lock():
+            # Hold to the hard floor on request spacing
+            wait = self.last_refresh_time + self.min_request_interval - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            return await self.__refresh()
+
+    async def __refresh(self):
+        """Reload data from the API, assuming we hold the refresh lock and may make a request now
+
+    Returns:
+        Changed (bool): Did the data change since the last refresh?
+        """
+
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession()
+
+        self.last_refresh_time = time.time()
+        try:
+            async with self.__session.get(self.api_url, headers = self.config.headers, timeout = aiohttp.ClientTimeout(total = self.config.request_timeout)) as response:
+                assert response.status == 200, "Status code " + str(response.status)
+                content = await response.read()
+
+            changed = self._ingest(content)
+
+        except Exception as e:
+            self.last_refresh_error = e
+            raise
+
+        self.last_refresh_error = None
+
+        # Let the policy decide when to refresh next
+        if self.refresh_policy:
+            self.refresh_rate = self.refresh_policy.next_interval(self, changed)
+
+        return changed
+
+    def _ingest(self, content: bytes):
+        """Take in a raw API response, only doing the work for the parts that changed.
+
+    Args:
+        content (bytes): The raw response body from the API.
+
+    Returns:
+        Changed (bool): Did the data change since the last refresh?
+        """
+
+        return self.__ingester.ingest(content, self)
+
+    async def watch(self):
+        """Generate change events as refreshes find them, forever.
+    Refreshes every refresh_rate. A failed refresh is recorded in last_refresh_error and retried next time.
+
+    Yields:
+        Event (events.APIEvent): The next change.
+        """
+
+        while True:
+            await asyncio.sleep(max(self.refresh_rate - (time.time() - self.last_refresh_time), 0))
+            try:
+                await self.refresh()
+
+            # The error is recorded by refresh(), keep the last good data and try again next time
+            except Exception as e:
+                warnings.warn(f"Live Stream API refresh failed: {e!r}")
+                continue
+
+            for event in self.last_changes:
+                yield event
+
+    def __aiter__(self):
+        """Iterate over change events, see watch()"""
+        return self.watch()
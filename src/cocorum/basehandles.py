@@ -15,8 +15,7 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 S.D.G."""
 
-import requests
-from . import static
+import functools
 from . import utils
 
 class BaseUserBadge:
@@ -49,8 +48,7 @@ class BaseUserBadge:
     def icon(self):
         """The badge's icon as a bytestring"""
         if not self.__icon:  # We never queried the icon before
-            # TODO make the timeout configurable
-            response = requests.get(self.icon_url, timeout = static.Delays.request_timeout)
+            response = self.transport.get(self.icon_url, endpoint = "image", timeout = self.config.request_timeout)
             assert response.status_code == 200, "Status code " + str(response.status_code)
 
             self.__icon = response.content
@@ -72,7 +70,7 @@ class BaseComment:
         """The base 10 ID of the comment"""
         return self.comment_id
 
-    @property
+    @functools.cached_property
     def comment_id_b36(self):
         """The base 36 ID of the comment"""
         return utils.base_10_to_36(self.comment_id)
@@ -202,7 +200,7 @@ class BaseUser:
         """The numeric ID of the user in base 10"""
         return self.user_id
 
-    @property
+    @functools.cached_property
     def user_id_b36(self):
         """The numeric ID of the user in base 36"""
         return utils.base_10_to_36(self.user_id)
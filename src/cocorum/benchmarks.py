@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""Benchmarks
+
+Performance benchmarks for Cocorum, with budgets that they must stay within.
+The chat and API benchmarks run against the local stand-in server from cocorum.testing, so they need no network.
+Run with `python -m cocorum.benchmarks [name ...] [--output results.json]`, exits with status 1 if any budget is exceeded.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+# Longest that a plain `import cocorum` may take in a fresh interpreter, in seconds
+IMPORT_TIME_BUDGET = 0.25
+
+# Modules that a plain `import cocorum` must not load
+IMPORT_FORBIDDEN_MODULES = ("bs4", "json5", "aiohttp", "numpy")
+
+# Run in a fresh interpreter, prints how long the import took and which forbidden modules it loaded
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import cocorum
+duration = time.perf_counter() - start
+print(json.dumps([duration, [name for name in {forbidden!r} if name in sys.modules]]))
+"""
+
+def bench_import(runs: int = 5) -> dict:
+    """Time `import cocorum` in fresh interpreters.
+
+    Args:
+        runs (int): How many interpreters to time the import in.
+            Defaults to 5.
+
+    Returns:
+        Result (dict): The timings in seconds, the heavy modules loaded, and whether the budget was kept.
+        """
+
+    probe = _IMPORT_PROBE.format(forbidden = IMPORT_FORBIDDEN_MODULES)
+    durations = []
+    loaded = set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", probe], capture_output = True, text = True, check = True).stdout
+        duration, forbidden = json.loads(output)
+        durations.append(duration)
+        loaded.update(forbidden)
+
+    return {
+        "name": "import",
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "budget": IMPORT_TIME_BUDGET,
+        "forbidden_loaded": sorted(loaded),
+        "ok": statistics.median(durations) <= IMPORT_TIME_BUDGET and not loaded,
+        }
+
+def _chat_events(num_messages: int, batch_size: int, num_users: int) -> list:
+    """Build the SSE events of a busy chat.
+
+    Args:
+        num_messages (int): How many messages to send after the init event.
+        batch_size (int): How many messages each messages event carries.
+        num_users (int): How many users send the messages.
+
+    Returns:
+        Events (list): The init event, then the messages events.
+        """
+
+    from . import testing
+    events = [testing.chat_init_event(num_users)]
+    for start in range(0, num_messages, batch_size):
+        events.append(testing.chat_messages_event([
+            testing.chat_message_json(i, i % num_users, f"Chat message number {i}, about as long as most")
+            for i in range(start, min(start + batch_size, num_messages))
+            ]))
+
+    return events
+
+def _read_chat(events: list, history_len: int, marks: tuple = ()) -> tuple:
+    """Read every message of a chat from the stand-in server.
+
+    Args:
+        events (list): The SSE events of the chat.
+        history_len (int): The history length of the ChatAPI.
+        marks (tuple): Message counts to note the elapsed time at.
+            Defaults to none.
+
+    Returns:
+        Count (int): How many messages were read.
+        Elapsed (float): How long reading them took, in seconds, not counting the init event.
+        Mark times (list): The elapsed time at each mark.
+        """
+
+    from . import testing, chatapi
+    with testing.StandInServer() as server:
+        server.fixtures.chat_events[1] = events
+        server.close_chat(1)
+
+        # The ChatAPI prints status messages that would get mixed into our JSON
+        with contextlib.redirect_stdout(io.StringIO()):
+            chat = chatapi.ChatAPI(1, history_len = history_len, config = server.config())
+            count = 0
+            mark_times = []
+            start = time.perf_counter()
+            while chat.get_message():
+                count += 1
+                if count in marks:
+                    mark_times.append(time.perf_counter() - start)
+            elapsed = time.perf_counter() - start
+            chat.close()
+
+    return count, elapsed, mark_times
+
+def bench_chat_ingest(num_messages: int = 20000, batch_size: int = 25, num_users: int = 500) -> dict:
+    """Measure how fast ChatAPI.get_message() takes in messages from the SSE stream, and how much memory each one costs.
+
+    Args:
+        num_messages (int): How many messages to read.
+            Defaults to 20000.
+        batch_size (int): How many messages each SSE event carries.
+            Defaults to 25.
+        num_users (int): How many users send the messages.
+            Defaults to 500.
+
+    Returns:
+        Result (dict): The throughput, and the memory retained and peak memory per message as traced by tracemalloc.
+        """
+
+    events = _chat_events(num_messages, batch_size, num_users)
+    count, elapsed, _ = _read_chat(events, history_len = num_messages)
+
+    # A smaller run under tracemalloc, which slows everything down
+    traced = max(num_messages // 10, 1)
+    tracemalloc.start()
+    try:
+        _read_chat(_chat_events(traced, batch_size, num_users), history_len = traced)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "name": "chat_ingest",
+        "messages": count,
+        "seconds": elapsed,
+        "messages_per_second": count / elapsed if elapsed else None,
+        "retained_bytes_per_message": current / traced,
+        "peak_bytes_per_message": peak / traced,
+        "ok": count == num_messages,
+        }
+
+def bench_history_trim(history_len: int = 20000) -> dict:
+    """Measure the cost of ChatAPI.get_message() once the history is full and must be trimmed on every message.
+
+    Args:
+        history_len (int): The history length, twice as many messages are read.
+            Defaults to 20000.
+
+    Returns:
+        Result (dict): The time per message while the history fills, and once it is full.
+        """
+
+    count, elapsed, (filled,) = _read_chat(_chat_events(history_len * 2, 25, 500), history_len, marks = (history_len,))
+    return {
+        "name": "history_trim",
+        "history_len": history_len,
+        "seconds_per_message_filling": filled / history_len,
+        "seconds_per_message_full": (elapsed - filled) / (count - history_len),
+        "ok": count == history_len * 2,
+        }
+
+def bench_api_refresh(num_livestreams: int = 200, num_messages: int = 50, refreshes: int = 20) -> dict:
+    """Measure RumbleAPI.refresh() and reading the livestream properties, with many livestreams.
+
+    Args:
+        num_livestreams (int): How many livestreams the API returns.
+            Defaults to 200.
+        num_messages (int): How many recent chat messages each livestream has.
+            Defaults to 50.
+        refreshes (int): How many refreshes to time.
+            Defaults to 20.
+
+    Returns:
+        Result (dict): The refresh times, the response size, and the time to read every livestream's properties.
+        """
+
+    from . import testing, RumbleAPI
+    data = testing.livestream_api_json(num_livestreams, num_messages)
+
+    # Something changes on every refresh, as it would on a live account
+    def livestream_api():
+        data["livestreams"][0]["watching_now"] += 1
+        return data
+
+    with testing.StandInServer() as server, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        server.fixtures.livestream_api = livestream_api
+        api = RumbleAPI(server.api_url, refresh_rate = 3600, min_request_interval = 0, config = server.config())
+
+        durations = []
+        for _ in range(refreshes):
+            start = time.perf_counter()
+            api.refresh()
+            durations.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for livestream in api.livestreams.values():
+            livestream.title, livestream.is_live, livestream.watching_now, livestream.created_on
+            livestream.chat.recent_messages
+        sweep = time.perf_counter() - start
+
+    return {
+        "name": "api_refresh",
+        "livestreams": num_livestreams,
+        "response_bytes": len(json.dumps(data)),
+        "refresh_seconds_median": statistics.median(durations),
+        "refresh_seconds_min": min(durations),
+        "property_sweep_seconds": sweep,
+        "ok": len(api.livestreams) == num_livestreams,
+        }
+
+def bench_new_messages(sizes: tuple = (10, 100, 1000, 5000), repeats: int = 20) -> dict:
+    """Measure LiveChat.new_messages as the number of recent messages grows.
+
+    Args:
+        sizes (tuple): The numbers of recent messages to measure at.
+            Defaults to 10, 100, 1000 and 5000.
+        repeats (int): How many times to time it at each size.
+            Defaults to 20.
+
+    Returns:
+        Result (dict): The median time at each size.
+        """
+
+    from . import testing, RumbleAPI
+    seconds = {}
+    with testing.StandInServer() as server, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for size in sizes:
+            server.fixtures.livestream_api = testing.livestream_api_json(1, size)
+            api = RumbleAPI(server.api_url, refresh_rate = 3600, min_request_interval = 0, config = server.config())
+            chat = api.latest_livestream.chat
+            durations = []
+            for _ in range(repeats):
+                # Every message is new each time
+                chat.last_newmessage_time = 0
+                start = time.perf_counter()
+                chat.new_messages
+                durations.append(time.perf_counter() - start)
+            seconds[str(size)] = statistics.median(durations)
+
+    return {
+        "name": "new_messages",
+        "seconds_median": seconds,
+        "ok": True,
+        }
+
+class _MemoryRaw:
+    """Stands in for the raw urllib3 response of a chunked SSE stream, from bytes in memory"""
+    chunked = True
+
+    def __init__(self, body: bytes):
+        """Stands in for the raw urllib3 response of a chunked SSE stream.
+
+    Args:
+        body (bytes): The whole stream.
+        """
+
+        self.body = body
+
+    def stream(self, amt = 2 ** 16, decode_content = None):
+        """Yield the stream amt bytes at a time"""
+        for start in range(0, len(self.body), amt):
+            yield self.body[start:start + amt]
+
+class _MemoryResponse:
+    """Stands in for a streamed requests response of an SSE stream, from bytes in memory"""
+    def __init__(self, body: bytes):
+        """Stands in for a streamed requests response of an SSE stream.
+
+    Args:
+        body (bytes): The whole stream.
+        """
+
+        self.raw = _MemoryRaw(body)
+
+    def __iter__(self):
+        """Iterate over the body 128 bytes at a time, like a requests response does"""
+        return self.raw.stream(128)
+
+    def close(self):
+        """Nothing to close"""
+
+def bench_sse_parse(num_messages: int = 50000, batch_size: int = 5, repeats: int = 5) -> dict:
+    """Measure how fast the chat SSE stream is split into events, compared to the sseclient library if it is installed.
+
+    Args:
+        num_messages (int): How many chat messages the stream carries.
+            Defaults to 50000.
+        batch_size (int): How many messages each SSE event carries.
+            Defaults to 5.
+        repeats (int): How many times to time each reader.
+            Defaults to 5.
+
+    Returns:
+        Result (dict): The events per second and megabytes per second of each reader, and how many times faster ours is.
+        """
+
+    from . import sse
+    events = _chat_events(num_messages, batch_size, 500)
+    body = b"".join(b"data: " + json.dumps(event).encode() + b"\n\n" for event in events)
+
+    readers = {"cocorum": lambda response: sse.SSEReader(response).events()}
+    try:
+        import sseclient
+        readers["sseclient"] = lambda response: sseclient.SSEClient(response).events()
+    except ImportError:
+        pass
+
+    results = {}
+    counts = set()
+    for name, reader in readers.items():
+        durations = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            count = sum(1 for _ in reader(_MemoryResponse(body)))
+            durations.append(time.perf_counter() - start)
+            counts.add(count)
+        results[name] = {
+            "events_per_second": count / min(durations),
+            "megabytes_per_second": len(body) / min(durations) / 1e6,
+            }
+
+    speedup = None
+    if "sseclient" in results:
+        speedup = results["cocorum"]["events_per_second"] / results["sseclient"]["events_per_second"]
+
+    return {
+        "name": "sse_parse",
+        "events": len(events),
+        "stream_bytes": len(body),
+        "readers": results,
+        "speedup": speedup,
+        "ok": counts == {len(events)} and (speedup is None or speedup >= 1),
+        }
+
+# All of the benchmarks to run by default
+BENCHMARKS = (bench_import, bench_chat_ingest, bench_history_trim, bench_api_refresh, bench_new_messages, bench_sse_parse)
+
+def run_all(names = None) -> list:
+    """Run every benchmark, or only some.
+
+    Args:
+        names (list): Names of the benchmarks to run, such as chat_ingest.
+            Defaults to None, run all of them.
+
+    Returns:
+        Results (list): The result dict of each benchmark.
+        """
+
+    return [benchmark() for benchmark in BENCHMARKS if not names or benchmark.__name__.removeprefix("bench_") in names]
+
+def main() -> int:
+    """Run the benchmarks named on the command line, or all of them, and print the results as JSON.
+
+    Returns:
+        Status (int): 0 if every budget was kept, 1 otherwise.
+        """
+
+    parser = argparse.ArgumentParser(description = "Run Cocorum's performance benchmarks.")
+    parser.add_argument("names", nargs = "*", help = "benchmarks to run, defaults to all: " + ", ".join(benchmark.__name__.removeprefix("bench_") for benchmark in BENCHMARKS))
+    parser.add_argument("--output", help = "also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_all(args.names)
+    report = {
+        "cocorum": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.time(),
+        "results": results,
+        }
+    text = json.dumps(report, indent = 2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+    return 0 if all(result["ok"] for result in results) else 1
+
+def _version():
+    """The installed version of Cocorum, if it is installed"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        return version("cocorum")
+    except PackageNotFoundError:
+        return None
+
+if __name__ == "__main__":
+    sys.exit(main())
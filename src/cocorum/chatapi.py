@@ -15,16 +15,23 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 S.D.G."""
 
+import collections
+import functools
+import itertools
 import time
+import warnings
 import requests
-import json5 as json # For parsing SSE message data
-import sseclient
 from .basehandles import *
 from .jsonhandles import JSONObj, JSONUserAction
 from .servicephp import ServicePHP
 from . import scraping
 from . import static
 from . import utils
+from . import profiling
+from . import sse
+from .transport import get_default_transport
+from .config import get_default_config
+from .decoding import get_default_decoder
 
 class ChatAPIObj(JSONObj):
     """Object in the internal chat API"""
@@ -39,6 +46,16 @@ class ChatAPIObj(JSONObj):
         JSONObj.__init__(self, jsondata)
         self.chat = chat
 
+    @property
+    def transport(self):
+        """The HTTP transport to use for any further requests about this object"""
+        return self.chat.transport
+
+    @property
+    def config(self):
+        """The settings to use for any further requests about this object"""
+        return self.chat.config
+
 class Chatter(JSONUserAction, ChatAPIObj):
     """A user or channel in the internal chat API (abstract)"""
     def __init__(self, jsondata, chat):
@@ -67,10 +84,40 @@ class User(Chatter, BaseUser):
         """
 
         Chatter.__init__(self, jsondata, chat)
-        self.previous_channel_ids = [] # List of channels the user has appeared as, including the current one
-        self._set_channel_id = None # Channel ID set from message
+        self.previous_channel_ids = set() # Set of channels the user has appeared as, including the current one
+        self.__set_channel_id = None # Channel ID set from message
         self.servicephp = self.chat.servicephp
 
+    def _note_channel_id(self, channel_id):
+        """Record that we appeared as a channel, so the chat can find us by it
+
+    Args:
+        channel_id (int, None): The numeric channel ID in base 10, None for appearing as ourselves.
+        """
+
+        if channel_id in self.previous_channel_ids:
+            return
+
+        self.previous_channel_ids.add(channel_id)
+        if channel_id is not None:
+            self.chat.channel_users[channel_id] = self
+
+    @property
+    def _set_channel_id(self):
+        """The channel ID set from our latest message"""
+        return self.__set_channel_id
+
+    @_set_channel_id.setter
+    def _set_channel_id(self, channel_id):
+        """Set our channel ID from a message
+
+    Args:
+        channel_id (int, None): The numeric channel ID in base 10, None for appearing as ourselves.
+        """
+
+        self.__set_channel_id = channel_id
+        self._note_channel_id(channel_id)
+
     @property
     def user_id(self):
         """The numeric ID of the user in base 10"""
@@ -88,8 +135,7 @@ class User(Chatter, BaseUser):
         except KeyError:
             new = self._set_channel_id
 
-        if new not in self.previous_channel_ids: # Record the appearance of a new chanel appearance, including None
-            self.previous_channel_ids.append(new)
+        self._note_channel_id(new) # Record the appearance of a new chanel appearance, including None
         return new
 
     @property
@@ -135,12 +181,15 @@ class Channel(Chatter):
         """
 
         super().__init__(jsondata, chat)
+        self.__user = None
 
-        # Find the user who has this channel
-        for user in self.chat.users.values():
-            if user.channel_id == self.channel_id or self.channel_id in user.previous_channel_ids:
-                self.user = user
-                break
+    @property
+    def user(self):
+        """The user who has this channel, None if no message has shown them appearing as it yet"""
+        if not self.__user:
+            self.__user = self.chat.channel_users.get(self.channel_id)
+
+        return self.__user
 
     @property
     def is_appearing(self):
@@ -157,7 +206,7 @@ class Channel(Chatter):
         """The ID of this channel in base 10"""
         return self.channel_id
 
-    @property
+    @functools.cached_property
     def channel_id_b36(self):
         """The ID of this channel in base 36"""
         return utils.base_10_to_36(self.channel_id)
@@ -199,7 +248,7 @@ class UserBadge(ChatAPIObj, BaseUserBadge):
     @property
     def icon_url(self):
         """The URL of the badge's icon"""
-        return static.URI.rumble_base + self["icons"][static.Misc.badge_icon_size]
+        return self.config.rumble_base + self["icons"][static.Misc.badge_icon_size]
 
 class GiftPurchaseNotification(ChatAPIObj):
     """A subscription gift under a message"""
@@ -234,7 +283,7 @@ class GiftPurchaseNotification(ChatAPIObj):
         """The numeric ID of the stream this gift was sent on, in base 10"""
         return self.video_id
 
-    @property
+    @functools.cached_property
     def video_id_b36(self) -> str:
         """The numeric ID of the stream this gift was sent on, in base 36"""
         return utils.base_10_to_36(self.video_id)
@@ -254,7 +303,7 @@ class GiftPurchaseNotification(ChatAPIObj):
         """The numeric ID of the user whose stream this gift was given on, in base 10"""
         return self.creator_user_id
 
-    @property
+    @functools.cached_property
     def creator_user_id_b36(self) -> str:
         """The numeric ID of the user whose stream this gift was given on, in base 36"""
         return utils.base_10_to_36(self.creator_user_id)
@@ -269,7 +318,7 @@ class GiftPurchaseNotification(ChatAPIObj):
         """The numeric ID of the channel whose stream this gift was given on, in base 10 (can be zero)"""
         return self.creator_channel_id
 
-    @property
+    @functools.cached_property
     def creator_channel_id_b36(self) -> str:
         """The numeric ID of the channel whose stream this gift was given on, in base 36 (can be zero)"""
         return utils.base_10_to_36(self.creator_channel_id)
@@ -335,7 +384,7 @@ class Message(ChatAPIObj):
         """The chat message in integer (ID) form"""
         return self.message_id
 
-    @property
+    @functools.cached_property
     def message_id(self):
         """The unique numerical ID of the chat message in base 10"""
         return int(self["id"])
@@ -345,7 +394,7 @@ class Message(ChatAPIObj):
         """The unique numerical ID of the chat message in base 10"""
         return self.message_id
 
-    @property
+    @functools.cached_property
     def message_id_b36(self):
         """The unique numerical ID of the chat message in base 36"""
         return utils.base_10_to_36(self.message_id)
@@ -365,7 +414,7 @@ class Message(ChatAPIObj):
         """The numeric ID of the user in base 10"""
         return self.user_id
 
-    @property
+    @functools.cached_property
     def user_id_b36(self):
         """The numeric ID of the user in base 36"""
         return utils.base_10_to_36(self.user_id)
@@ -384,7 +433,7 @@ class Message(ChatAPIObj):
         """The ID of the channel who posted the message in base 10"""
         return self.channel_id
 
-    @property
+    @functools.cached_property
     def channel_id_b36(self):
         """The ID of the channel who posted the message in base 36"""
         if not self.channel_id:
@@ -469,7 +518,7 @@ class Message(ChatAPIObj):
 
 class ChatAPI():
     """The Rumble internal chat API"""
-    def __init__(self, stream_id, username: str = None, password: str = None, session = None, history_len = 1000):
+    def __init__(self, stream_id, username: str = None, password: str = None, session = None, history_len = 1000, transport = None, decoder = None, config = None, queue_messages = True):
         """The Rumble internal chat API
 
     Args:
@@ -483,35 +532,70 @@ class ChatAPI():
             Defaults to no login.
         session (str, dict): Session token or cookie dict to authenticate with.
             Defaults to getting new session with username and password.
-        history_len (int): Length of message history to store.
+        history_len (int): Length of message history to store, None to keep every message.
             Defaults to 1000.
+        transport (Transport): The HTTP transport to make requests with.
+            Defaults to the config's transport if a config is given, otherwise the shared default transport.
+        decoder (decoding.Decoder): The JSON decoder for SSE event data.
+            Defaults to the shared default decoder.
+        config (Config): Settings for timeouts, base URLs and headers.
+            Defaults to the default config.
+        queue_messages (bool): Wether to queue new messages in the mailbox for get_message().
+            If False, messages go straight to the history, and are only surfaced through on_message() callbacks.
+            Defaults to True.
             """
 
         self.stream_id = utils.ensure_b36(stream_id)
-
-        self.__mailbox = []  #  A mailbox if you will
-        self.__history = []  #  Chat history
-        self.history_len = history_len  #  How many messages to store in history
+        self.config = config or get_default_config()
+        self.transport = transport or (config.transport if config else get_default_transport())
+        self.decoder = decoder or get_default_decoder()
+
+        # Metrics updated on every event, looked up once here to keep them off the hot path
+        self.__event_bytes_counter = self.transport.metrics.counter("chat_event_bytes", stream = self.stream_id)
+        self.__decode_histogram = self.transport.metrics.histogram("chat_decode_seconds", stream = self.stream_id)
+        self.__mailbox_gauge = self.transport.metrics.gauge("chat_mailbox_depth", stream = self.stream_id)
+        self.__event_counters = {}  #  Event type : counter
+
+        self.__mailbox = collections.deque()  #  A mailbox if you will
+        self.__history = collections.deque(maxlen = history_len)  #  Chat history, the oldest messages fall off the end
+        self.__messages_by_id = {}  #  Every message in the mailbox and history by message ID
         self.pinned_message = None  #  If a message is pinned, it is assigned to this
         self.users = {}  #  Dictionary of users by user ID
+        self.channel_users = {}  #  Dictionary of users by the IDs of channels they appeared as
         self.channels = {}  #  Dictionary of channels by channel ID
         self.badges = {}
+        self.queue_messages = queue_messages
+
+        # Handlers for each SSE event type, and for any type not listed
+        self.__event_handlers = {
+            "messages": self.handle_messages,
+            "delete_messages": self.handle_delete,
+            "delete_non_rant_messages": self.handle_delete,
+            "pin_message": self.handle_pin,
+            "init": self.parse_init_data,
+            }
+        self.__unknown_event_handler = self.handle_unknown
+
+        # Functions to call as events are decoded
+        self.__message_callbacks = []
+        self.__delete_callbacks = []
+        self.__pin_callbacks = []
 
         # Generate our URLs
-        self.sse_url = static.URI.ChatAPI.sse_stream.format(stream_id_b10 = self.stream_id_b10)
+        self.sse_url = self.config.chat_sse_url.format(stream_id_b10 = self.stream_id_b10)
         print("SSE stream URL:", self.sse_url)
-        self.message_api_url = static.URI.ChatAPI.message.format(stream_id_b10 = self.stream_id_b10)
+        self.message_api_url = self.config.chat_message_url.format(stream_id_b10 = self.stream_id_b10)
 
         #  Connect to SSE stream
         #  Note: We do NOT want this request to have a timeout
-        self.response = requests.get(self.sse_url, stream = True, headers = static.RequestHeaders.sse_api)
-        self.client = sseclient.SSEClient(self.response)
+        self.response = self.transport.get(self.sse_url, endpoint = "chat.sse", stream = True, headers = static.RequestHeaders.sse_api)
+        self.client = sse.SSEReader(self.response)
         self.event_generator = self.client.events()
         self.chat_running = True
 
         #  If we have session login, use them
         if (username and password) or session:
-            self.servicephp = ServicePHP(username, password, session)
+            self.servicephp = ServicePHP(username, password, session, self.transport, self.config)
             self.scraper = scraping.Scraper(self.servicephp)
         else:
             self.servicephp = None
@@ -539,6 +623,142 @@ class ChatAPI():
         """The chat history, trimmed to history_len"""
         return tuple(self.__history)
 
+    @property
+    def history_len(self):
+        """How many messages to store in history"""
+        return self.__history.maxlen
+
+    @history_len.setter
+    def history_len(self, value: int):
+        """Change how many messages to store in history, dropping the oldest ones if there are now too many
+
+    Args:
+        value (int): The new history length.
+        """
+
+        history = collections.deque(self.__history, maxlen = value)
+        for message in itertools.islice(self.__history, len(self.__history) - len(history)):
+            self.__forget(message)
+        self.__history = history
+
+    def __forget(self, message):
+        """Remove a message that left the mailbox and history from the message ID index
+
+    Args:
+        message (Message): The message.
+        """
+
+        if self.__messages_by_id.get(message.message_id) is message:
+            del self.__messages_by_id[message.message_id]
+
+    def message_by_id(self, message_id):
+        """Find a message in the mailbox or history.
+
+    Args:
+        message_id (int, Message): Object which when converted to integer is the message ID.
+
+    Returns:
+        Message (Message, None): The message, or None if it is in neither.
+        """
+
+        return self.__messages_by_id.get(int(message_id))
+
+    def flag_deleted(self, message_ids):
+        """Flag messages in the mailbox or history as deleted.
+
+    Args:
+        message_ids (iter): The IDs of the deleted messages.
+        """
+
+        for message_id in message_ids:
+            message = self.__messages_by_id.get(int(message_id))
+            if message:
+                message.deleted = True
+
+    def register_handler(self, event_type: str, handler):
+        """Set the function that handles one type of SSE event, replacing the current one.
+
+    Args:
+        event_type (str): The SSE event type, e.g. pin_message, or None for any type without a handler.
+        handler (callable): Takes the event JSON data.
+
+    Returns:
+        Previous (callable): The handler that was replaced, so the new one can call it too.
+        """
+
+        if event_type is None:
+            previous = self.__unknown_event_handler
+            self.__unknown_event_handler = handler
+        else:
+            previous = self.__event_handlers.get(event_type, self.__unknown_event_handler)
+            self.__event_handlers[event_type] = handler
+
+        return previous
+
+    def on_message(self, callback):
+        """Call a function with each new chat message as it is decoded. Can be used as a decorator.
+
+    Args:
+        callback (callable): Takes the Message.
+
+    Returns:
+        Callback (callable): The callback, unchanged.
+        """
+
+        self.__message_callbacks.append(callback)
+        return callback
+
+    def on_delete(self, callback):
+        """Call a function with each deleted message ID as the deletion is decoded. Can be used as a decorator.
+
+    Args:
+        callback (callable): Takes the message ID and the Message, which is None if we no longer have it.
+
+    Returns:
+        Callback (callable): The callback, unchanged.
+        """
+
+        self.__delete_callbacks.append(callback)
+        return callback
+
+    def on_pin(self, callback):
+        """Call a function with each newly pinned message as the pin is decoded. Can be used as a decorator.
+
+    Args:
+        callback (callable): Takes the Message.
+
+    Returns:
+        Callback (callable): The callback, unchanged.
+        """
+
+        self.__pin_callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, callback):
+        """Stop calling a function that was passed to on_message(), on_delete() or on_pin()
+
+    Args:
+        callback (callable): The function.
+        """
+
+        for callbacks in (self.__message_callbacks, self.__delete_callbacks, self.__pin_callbacks):
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    def __add_to_history(self, message):
+        """Add a message to the history, which drops the oldest message once it is full
+
+    Args:
+        message (Message): The message.
+        """
+
+        if len(self.__history) == self.__history.maxlen:
+            if self.__history:
+                self.__forget(self.__history[0])
+            else: # The history holds nothing at all
+                self.__forget(message)
+        self.__history.append(message)
+
     def send_message(self, text: str, channel_id: int = None):
         """Send a message in chat.
 
@@ -556,9 +776,10 @@ class ChatAPI():
         assert len(text) <= static.Message.max_len, "Mesage is too long"
         curtime = time.time()
         assert self.last_send_time + static.Message.send_cooldown <= curtime, "Sending messages too fast"
-        assert utils.options_check(self.message_api_url, "POST"), "Rumble denied options request to post message"
-        r = requests.post(
+        assert utils.options_check(self.message_api_url, "POST", origin = self.config.rumble_base, transport = self.transport, config = self.config), "Rumble denied options request to post message"
+        r = self.transport.post(
             self.message_api_url,
+            endpoint = "chat.message",
             cookies = self.session_cookie,
             json = {
                 "data": {
@@ -571,7 +792,7 @@ class ChatAPI():
                     }
                 },
             #  headers = static.RequestHeaders.user_agent,
-            timeout = static.Delays.request_timeout,
+            timeout = self.config.request_timeout,
             )
 
         if r.status_code != 200:
@@ -591,15 +812,16 @@ class ChatAPI():
         """
 
         assert command_message.startswith(static.Message.command_prefix), "Not a command message"
-        r = requests.post(
-            static.URI.ChatAPI.command,
+        r = self.transport.post(
+            self.config.chat_command_url,
+            endpoint = "chat.command",
             data = {
                 "video_id" : self.stream_id_b10,
                 "message" : command_message,
                 },
             cookies = self.session_cookie,
-            headers = static.RequestHeaders.user_agent,
-            timeout = static.Delays.request_timeout,
+            headers = self.config.headers,
+            timeout = self.config.request_timeout,
             )
         assert r.status_code == 200, f"Command failed: {r}\n{r.text}"
         return r.json()
@@ -618,13 +840,14 @@ class ChatAPI():
         assert not hasattr(message, "deleted") or not message.deleted, "Message was already deleted"
 
         assert self.session_cookie, "Not logged in, cannot delete message"
-        assert utils.options_check(self.message_api_url + f"/{int(message)}", "DELETE"), "Rumble denied options request to delete message"
+        assert utils.options_check(self.message_api_url + f"/{int(message)}", "DELETE", origin = self.config.rumble_base, transport = self.transport, config = self.config), "Rumble denied options request to delete message"
 
-        r = requests.delete(
+        r = self.transport.delete(
             self.message_api_url + f"/{int(message)}",
+            endpoint = "chat.delete",
             cookies = self.session_cookie,
             #  headers = static.RequestHeaders.user_agent,
-            timeout = static.Delays.request_timeout,
+            timeout = self.config.request_timeout,
             )
 
         if r.status_code != 200:
@@ -704,7 +927,8 @@ class ChatAPI():
             return
 
         try:
-            event = next(self.event_generator, None)
+            with profiling.section(profiling.Points.sse_read, chat = self):
+                event = next(self.event_generator, None)
         except requests.exceptions.ReadTimeout:
             print("Request read timeout.")
             event = None
@@ -718,7 +942,18 @@ class ChatAPI():
             # Self recursion should work so long as we don't get dozens of blank events in a row
             return self.__next_event_json()
 
-        return json.loads(event.data)
+        self.__event_bytes_counter.inc(len(event.data))
+        start = time.perf_counter()
+        with profiling.section(profiling.Points.json_decode, chat = self, size = len(event.data)):
+            jsondata = self.decoder.loads(event.data)
+        self.__decode_histogram.observe(time.perf_counter() - start)
+
+        event_type = jsondata.get("type")
+        counter = self.__event_counters.get(event_type)
+        if counter is None:
+            counter = self.__event_counters[event_type] = self.transport.metrics.counter("chat_events", stream = self.stream_id, type = event_type)
+        counter.inc()
+        return jsondata
 
     def parse_init_data(self, jsondata):
         """Extract initial chat data from the SSE init event JSON
@@ -751,12 +986,47 @@ class ChatAPI():
         jsondata (dict): A JSON data block from an SSE event.
         """
 
-        # Add new messages
-        self.__mailbox += [Message(message_json, self) for message_json in jsondata["data"].get("messages", []) if int(message_json["id"]) not in self.__mailbox]
+        # Add new messages, skipping any we already have, such as those re-sent by an init event after reconnecting
+        new_messages = []
+        with profiling.section(profiling.Points.update_mailbox, chat = self):
+            for message_json in jsondata["data"].get("messages", []):
+                if int(message_json["id"]) in self.__messages_by_id:
+                    continue
+
+                message = Message(message_json, self)
+                self.__messages_by_id[message.message_id] = message
+                if self.queue_messages:
+                    self.__mailbox.append(message)
+                else: # Skip the mailbox
+                    self.__add_to_history(message)
+                new_messages.append(message)
+        self.__mailbox_gauge.set(len(self.__mailbox))
+
+        # Only call back once the whole batch is stored, so a failing callback cannot lose any of it
+        if self.__message_callbacks:
+            for message in new_messages:
+                self.__call_back(self.__message_callbacks, message)
+
+    def __call_back(self, callbacks, *args):
+        """Call each callback in a list. A callback that raises does not stop the others.
+
+    Args:
+        callbacks (list): The callbacks.
+        *args: What to pass to each.
+        """
+
+        for callback in tuple(callbacks):
+            try:
+                callback(*args)
+            except Exception as e:
+                warnings.warn(f"Chat callback {callback!r} failed on {args!r}: {e!r}")
 
     def clear_mailbox(self):
         """Delete anything in the mailbox"""
-        self.__mailbox = []
+        for message in self.__mailbox:
+            self.__forget(message)
+        self.__mailbox.clear()
+        self.__mailbox_gauge.set(0)
 
     def update_users(self, jsondata):
         """Update our dictionary of users from an SSE data JSON
@@ -765,11 +1035,18 @@ class ChatAPI():
         jsondata (dict): A JSON data block from an SSE event.
         """
 
-        for user_json in jsondata["data"].get("users", []):
-            try:
-                self.users[int(user_json["id"])]._jsondata = user_json # Update an existing user's JSON
-            except KeyError: # User is new
-                self.users[int(user_json["id"])] = User(user_json, self)
+        with profiling.section(profiling.Points.update_users, chat = self):
+            for user_json in jsondata["data"].get("users", []):
+                user = self.users.get(int(user_json["id"]))
+                if user is not None:
+                    user._jsondata = user_json # Update an existing user's JSON
+                else: # User is new
+                    user = User(user_json, self)
+                    self.users[user.user_id] = user
+
+                # Index the channel the user is appearing as, if the JSON says
+                if user_json.get("channel_id") is not None:
+                    user._note_channel_id(int(user_json["channel_id"]))
 
     def update_channels(self, jsondata):
         """Update our dictionary of channels from an SSE data JSON
@@ -778,11 +1055,12 @@ class ChatAPI():
         jsondata (dict): A JSON data block from an SSE event.
         """
 
-        for channel_json in jsondata["data"].get("channels", []):
-            try:
-                self.channels[int(channel_json["id"])]._jsondata = channel_json # Update an existing channel's JSON
-            except KeyError: # Channel is new
-                self.channels.update({int(channel_json["id"]) : Channel(channel_json, self)})
+        with profiling.section(profiling.Points.update_channels, chat = self):
+            for channel_json in jsondata["data"].get("channels", []):
+                try:
+                    self.channels[int(channel_json["id"])]._jsondata = channel_json # Update an existing channel's JSON
+                except KeyError: # Channel is new
+                    self.channels.update({int(channel_json["id"]) : Channel(channel_json, self)})
 
     def load_badges(self, jsondata):
         """Create our dictionary of badges from an SSE data JSON
@@ -793,11 +1071,78 @@ class ChatAPI():
 
         self.badges = {badge_slug : UserBadge(badge_slug, jsondata["data"]["config"]["badges"][badge_slug], self) for badge_slug in jsondata["data"]["config"]["badges"].keys()}
 
-    @property
+    @functools.cached_property
     def stream_id_b10(self):
         """The chat ID in use"""
         return utils.base_36_to_10(self.stream_id)
 
+    def handle_messages(self, jsondata):
+        """Handle a messages SSE event
+
+    Args:
+        jsondata (dict): The event JSON data.
+        """
+
+        # Parse users, channels, then messages
+        self.update_users(jsondata)
+        self.update_channels(jsondata)
+        self.update_mailbox(jsondata)
+
+    def handle_delete(self, jsondata):
+        """Handle a delete_messages or delete_non_rant_messages SSE event
+
+    Args:
+        jsondata (dict): The event JSON data.
+        """
+
+        # Flag the messages in our mailbox and history as being deleted
+        message_ids = jsondata["data"]["message_ids"]
+        self.flag_deleted(message_ids)
+
+        if self.__delete_callbacks:
+            for message_id in message_ids:
+                self.__call_back(self.__delete_callbacks, int(message_id), self.message_by_id(message_id))
+
+    def handle_pin(self, jsondata):
+        """Handle a pin_message SSE event
+
+    Args:
+        jsondata (dict): The event JSON data.
+        """
+
+        self.pinned_message = self.message_by_id(jsondata["data"]["message"]["id"]) or Message(jsondata["data"]["message"], self)
+        self.__call_back(self.__pin_callbacks, self.pinned_message)
+
+    def handle_unknown(self, jsondata):
+        """Handle an SSE event of a type we have no handler for
+
+    Args:
+        jsondata (dict): The event JSON data.
+        """
+
+        warnings.warn(f"API sent an unimplemented SSE event type: {jsondata.get('type')!r}\n{jsondata}")
+
+    def poll_event(self):
+        """Wait for the next SSE event and handle it, firing any callbacks.
+
+    Returns:
+        Data (dict | None): The event JSON data, or None if chat closed.
+        """
+
+        jsondata = self.__next_event_json()
+
+        # The chat has closed
+        if not jsondata:
+            return
+
+        self.__event_handlers.get(jsondata["type"], self.__unknown_event_handler)(jsondata)
+        return jsondata
+
+    def run(self):
+        """Handle SSE events until chat closes, for use with callbacks"""
+        while self.poll_event():
+            pass
+
     def get_message(self):
         """Return the next chat message (parsing any additional data).
         Waits for it to come in, returns None if chat closed.
@@ -806,47 +1151,18 @@ class ChatAPI():
         result (Message | None): Either the next chat message or NoneType.
         """
 
+        assert self.queue_messages, "Messages are not being queued, use on_message() instead"
+
         # We don't already have messages
         while not self.__mailbox:
-            jsondata = self.__next_event_json()
-
             # The chat has closed
-            if not jsondata:
+            if not self.poll_event():
                 return
 
-            # Messages were deleted
-            if jsondata["type"] in ("delete_messages", "delete_non_rant_messages"):
-                # Flag the messages in our history as being deleted
-                for message in self.__history:
-                    if message.message_id in jsondata["data"]["message_ids"]:
-                        message.deleted = True
-
-
-            # Re-initialize (could contain new messages)
-            elif jsondata["type"] == "init":
-                self.parse_init_data(jsondata)
-
-            # Pinned message
-            elif jsondata["type"] == "pin_message":
-                self.pinned_message = Message(jsondata["data"]["message"], self)
-
-            # New messages
-            elif jsondata["type"] == "messages":
-                # Parse users, channels, then messages
-                self.update_users(jsondata)
-                self.update_channels(jsondata)
-                self.update_mailbox(jsondata)
-
-            # Unimplemented event type
-            else:
-                print("API sent an unimplemented SSE event type")
-                print(jsondata)
-
-        m = self.__mailbox.pop(0) # Get the oldest message in the mailbox
-        self.__history.append(m) # Add the message to the history
+        m = self.__mailbox.popleft() # Get the oldest message in the mailbox
+        self.__mailbox_gauge.set(len(self.__mailbox))
 
-        # Make sure the history is not too long, clipping off the oldest messages
-        del self.__history[ : max((len(self.__history) - self.history_len, 0))]
+        self.__add_to_history(m)
 
         # Return the next message from the mailbox
         return m
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Client configuration
+
+Per-client settings for timeouts, connection pools, upload chunking, retries, base URLs and headers.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import threading
+from . import static
+from .transport import Transport
+
+class Config:
+    """Settings for Cocorum clients, so each workload can be tuned separately.
+    The defaults match the static module. Clients given a Config make their requests over its own transport."""
+    def __init__(self,
+        request_timeout: float = static.Delays.request_timeout,
+        upload_timeout: float = static.Delays.upload_timeout,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        host_pool_sizes: dict = None,
+        upload_chunk_size: int = static.Upload.chunksz,
+        retries: int = 0,
+        retry_backoff: float = 0.5,
+        retry_statuses = (429, 500, 502, 503, 504),
+        retry_methods = None,
+        rumble_base: str = static.URI.rumble_base,
+        chat_base: str = static.URI.chat_base,
+        upload_base: str = static.URI.upload_base,
+        headers: dict = None,
+        ):
+        """Settings for Cocorum clients, so each workload can be tuned separately.
+
+    Args:
+        request_timeout (float): How long to wait before giving up on a network request, in seconds.
+            Defaults to static.Delays.request_timeout.
+        upload_timeout (float): How long to wait before giving up on uploading one chunk of a video, in seconds.
+            Defaults to static.Delays.upload_timeout.
+        pool_connections (int): How many hosts to keep connection pools for.
+            Defaults to 10.
+        pool_maxsize (int): How many connections to keep alive per host.
+            Defaults to 10.
+        host_pool_sizes (dict): URL prefix : pool size pairs, for hosts that need a different pool size.
+            Defaults to no per-host sizes.
+        upload_chunk_size (int): Size of video upload chunks, in bytes.
+            Defaults to static.Upload.chunksz.
+        retries (int): How many times to retry a failed request.
+            Defaults to 0, no retries.
+        retry_backoff (float): Backoff factor between retries, in seconds, see urllib3.util.Retry.
+            Defaults to 0.5.
+        retry_statuses (tuple): HTTP status codes to retry on.
+            Defaults to rate limiting and server errors.
+        retry_methods (tuple): HTTP methods to retry. Retrying a POST may repeat it, e.g. send a chat message twice.
+            Defaults to urllib3's idempotent methods, which do not include POST.
+        rumble_base (str): Base URL of Rumble's website and service.php.
+            Defaults to static.URI.rumble_base.
+        chat_base (str): Base URL of the server hosting the chat API.
+            Defaults to static.URI.chat_base.
+        upload_base (str): Base URL of the server hosting upload.php.
+            Defaults to static.URI.upload_base.
+        headers (dict): Headers to send in place of the fake user-agent header.
+            Defaults to static.RequestHeaders.user_agent.
+        """
+
+        self.request_timeout = request_timeout
+        self.upload_timeout = upload_timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = host_pool_sizes or {}
+        self.upload_chunk_size = upload_chunk_size
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_methods = tuple(retry_methods) if retry_methods is not None else None
+        self.rumble_base = rumble_base.rstrip("/")
+        self.chat_base = chat_base.rstrip("/")
+        self.upload_base = upload_base.rstrip("/")
+        self.headers = dict(static.RequestHeaders.user_agent if headers is None else headers)
+
+        self.__transport = None
+        self.__transport_lock = threading.Lock()
+
+    @property
+    def transport(self):
+        """The transport built from these settings, created on first use and shared by every client given this config"""
+        with self.__transport_lock:
+            if self.__transport is None:
+                self.__transport = Transport(
+                    pool_connections = self.pool_connections,
+                    pool_maxsize = self.pool_maxsize,
+                    host_pool_sizes = self.host_pool_sizes,
+                    retries = self.retry_policy(),
+                    )
+
+            return self.__transport
+
+    def retry_policy(self):
+        """Build the retry policy for our transport.
+
+    Returns:
+        Retry (urllib3.util.Retry, int): The retry policy, or 0 for no retries.
+        """
+
+        if not self.retries:
+            return 0
+
+        # Only imported if we need it, it is part of requests anyway
+        from urllib3.util import Retry
+        return Retry(
+            total = self.retries,
+            backoff_factor = self.retry_backoff,
+            status_forcelist = self.retry_statuses,
+            raise_on_status = False, # Hand back the last response, so callers see its status code
+            allowed_methods = self.retry_methods or Retry.DEFAULT_ALLOWED_METHODS,
+            )
+
+    @property
+    def login_test_url(self):
+        """Page to test the session token on, see static.URI.login_test"""
+        return self.rumble_base + static.URI.Paths.login_test
+
+    @property
+    def mutes_page_url(self):
+        """Webpage with all the mutes on it, format with page number"""
+        return self.rumble_base + static.URI.Paths.mutes_page
+
+    @property
+    def channels_page_url(self):
+        """Channels under a user, format with username"""
+        return self.rumble_base + static.URI.Paths.channels_page
+
+    @property
+    def playlists_page_url(self):
+        """The logged-in user's playlist page"""
+        return self.rumble_base + static.URI.Paths.playlists_page
+
+    @property
+    def servicephp_url(self):
+        """The Service.PHP API"""
+        return self.rumble_base + static.URI.Paths.servicephp
+
+    @property
+    def uploadphp_url(self):
+        """The video upload PHP"""
+        return self.upload_base + static.URI.Paths.uploadphp
+
+    @property
+    def chat_sse_url(self):
+        """SSE stream of chat events, format with stream_id_b10"""
+        return self.chat_base + static.URI.Paths.chat_sse_stream
+
+    @property
+    def chat_message_url(self):
+        """Chat message actions, format with stream_id_b10"""
+        return self.chat_base + static.URI.Paths.chat_message
+
+    @property
+    def chat_command_url(self):
+        """Chat commands"""
+        return self.rumble_base + static.URI.Paths.chat_command
+
+_default_config = None
+_default_lock = threading.Lock()
+
+def get_default_config() -> Config:
+    """Get the config used by every client that was not given its own.
+    Clients using it make their requests over the shared default transport, not the config's own.
+
+    Returns:
+        Config (Config): The default config, created on first use.
+        """
+
+    global _default_config
+    with _default_lock:
+        if _default_config is None:
+            _default_config = Config()
+
+        return _default_config
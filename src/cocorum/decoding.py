@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""JSON decoding
+
+Decode JSON with a fast strict decoder first, falling back to the slow but lenient json5 only when that fails.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import json
+import threading
+from . import static
+
+def fastest_loads():
+    """Find the fastest strict JSON decoder available.
+
+    Returns:
+        Loads (callable): orjson.loads if orjson is installed, otherwise json.loads from the standard library.
+        """
+
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+class Decoder:
+    """Decodes JSON with a fast strict decoder, falling back to json5 for anything it rejects"""
+    def __init__(self, fast_loads = None):
+        """Decodes JSON with a fast strict decoder, falling back to json5 for anything it rejects.
+
+    Args:
+        fast_loads (callable): Strict decoder taking str or bytes, that raises ValueError on invalid JSON.
+            Defaults to the fastest one available, see fastest_loads().
+        """
+
+        self.fast_loads = fast_loads or fastest_loads()
+
+        # How many documents we decoded, and how many of them needed json5
+        self.decodes = 0
+        self.fallbacks = 0
+
+        self.__lock = threading.Lock()
+
+    @property
+    def fallback_rate(self):
+        """The fraction of decodes that needed json5"""
+        return self.fallbacks / self.decodes if self.decodes else 0.0
+
+    def loads(self, data):
+        """Decode a JSON document.
+
+    Args:
+        data (str, bytes): The JSON document. May be JSON5.
+
+    Returns:
+        Data (Any): The decoded data.
+        """
+
+        with self.__lock:
+            self.decodes += 1
+
+        try:
+            return self.fast_loads(data)
+
+        # Not strict JSON, so try the lenient decoder
+        except ValueError:
+            with self.__lock:
+                self.fallbacks += 1
+
+            # Only imported if we ever need it, as it is slow to import too
+            import json5
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                data = bytes(data).decode(static.Misc.text_encoding)
+            return json5.loads(data)
+
+_default_decoder = None
+_default_lock = threading.Lock()
+
+def get_default_decoder() -> Decoder:
+    """Get the decoder shared by every client that was not given its own.
+
+    Returns:
+        Decoder (Decoder): The default decoder, created on first use.
+        """
+
+    global _default_decoder
+    with _default_lock:
+        if _default_decoder is None:
+            _default_decoder = Decoder()
+
+        return _default_decoder
+
+def set_default_decoder(decoder: Decoder):
+    """Replace the decoder shared by every client that was not given its own.
+    Clients that already exist keep the decoder they were created with.
+
+    Args:
+        decoder (Decoder): The new default decoder.
+        """
+
+    global _default_decoder
+    with _default_lock:
+        _default_decoder = decoder
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Live Stream API change events
+
+Typed events for what changed between two Rumble Live Stream API refreshes.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import collections
+import threading
+
+class APIEvent:
+    """A change found between two Live Stream API refreshes (abstract)"""
+
+    # Short name of the event type, for dispatching on
+    kind = None
+
+    def __repr__(self):
+        """The event in debugging form"""
+        attrs = ", ".join(f"{key} = {value!r}" for key, value in vars(self).items())
+        return f"{type(self).__name__}({attrs})"
+
+class FollowerAdded(APIEvent):
+    """A new follower appeared"""
+    kind = "follower_added"
+
+    def __init__(self, follower):
+        """A new follower appeared.
+
+    Args:
+        follower (Follower): The new follower.
+        """
+
+        self.follower = follower
+
+class SubscriberAdded(APIEvent):
+    """A new subscriber appeared"""
+    kind = "subscriber_added"
+
+    def __init__(self, subscriber):
+        """A new subscriber appeared.
+
+    Args:
+        subscriber (Subscriber): The new subscriber.
+        """
+
+        self.subscriber = subscriber
+
+class GiftedSubAdded(APIEvent):
+    """A new subscriptions gift appeared"""
+    kind = "gifted_sub_added"
+
+    def __init__(self, gifted_sub):
+        """A new subscriptions gift appeared.
+
+    Args:
+        gifted_sub (GiftedSub): The new gift.
+        """
+
+        self.gifted_sub = gifted_sub
+
+class LivestreamEvent(APIEvent):
+    """Something happened to a livestream (abstract)"""
+    def __init__(self, livestream):
+        """Something happened to a livestream.
+
+    Args:
+        livestream (LivestreamSnapshot): The livestream, as of the refresh where this happened.
+        """
+
+        self.livestream = livestream
+
+class LivestreamAppeared(LivestreamEvent):
+    """A livestream was newly listed"""
+    kind = "livestream_appeared"
+
+class LivestreamWentLive(LivestreamEvent):
+    """A livestream started being live"""
+    kind = "livestream_went_live"
+
+class LivestreamEnded(LivestreamEvent):
+    """A livestream stopped being live"""
+    kind = "livestream_ended"
+
+class LivestreamDisappeared(LivestreamEvent):
+    """A livestream is no longer listed"""
+    kind = "livestream_disappeared"
+
+class LivestreamChanged(LivestreamEvent):
+    """A detail of a livestream changed, such as the title, visibility, or categories"""
+    kind = "livestream_changed"
+
+    def __init__(self, livestream, field: str, old, new):
+        """A detail of a livestream changed.
+
+    Args:
+        livestream (LivestreamSnapshot): The livestream, as of the refresh where this happened.
+        field (str): The JSON key of the detail that changed.
+        old (Any): The previous JSON value.
+        new (Any): The new JSON value.
+        """
+
+        LivestreamEvent.__init__(self, livestream)
+        self.field = field
+        self.old = old
+        self.new = new
+
+class LivestreamCountChanged(LivestreamChanged):
+    """A count on a livestream changed, such as likes or watchers"""
+    kind = "livestream_count_changed"
+
+    @property
+    def delta(self):
+        """How much the count went up (negative if down)"""
+        return self.new - self.old
+
+# Livestream JSON keys whose changes are reported as LivestreamChanged
+LIVESTREAM_DETAIL_KEYS = ("title", "visibility", "categories")
+
+# Livestream JSON keys whose changes are reported as LivestreamCountChanged
+LIVESTREAM_COUNT_KEYS = ("likes", "dislikes", "watching_now")
+
+def _block_unchanged(old, new, key: str) -> bool:
+    """Check if a top-level JSON block is the same object in two snapshots.
+    RumbleAPI keeps the old object for blocks that did not change, so this is O(1).
+
+    Args:
+        old (APISnapshot): The earlier snapshot.
+        new (APISnapshot): The later snapshot.
+        key (str): The top-level JSON key of the block.
+
+    Returns:
+        Result (bool): Was the block kept unchanged?
+        """
+
+    return old._jsondata.get(key) is new._jsondata.get(key)
+
+def _new_user_actions(old_list: list, new_list: list, time_key: str) -> list:
+    """Find user actions in a recent list that were not in the previous one.
+
+    Args:
+        old_list (list): The previous list of JSONUserAction objects.
+        new_list (list): The current list of JSONUserAction objects.
+        time_key (str): The JSON key of the action's timestamp.
+
+    Returns:
+        Actions (list): The actions that are new, oldest first.
+        """
+
+    seen = {(action.username, action[time_key]) for action in old_list}
+    added = [action for action in new_list if (action.username, action[time_key]) not in seen]
+    added.sort(key = lambda action: action[time_key])
+    return added
+
+def _gift_identity(gifted_sub) -> tuple:
+    """Identify a gift as well as we can, since gifts have no ID or timestamp
+
+    Args:
+        gifted_sub (GiftedSub): The gift to identify.
+
+    Returns:
+        Identity (tuple): Details that tell this gift apart from others.
+        """
+
+    return (gifted_sub.get("purchased_by"), gifted_sub.get("video_id"), gifted_sub.get("total_gifts"), gifted_sub.get("gift_type"))
+
+def diff_snapshots(old, new) -> list:
+    """Find what changed between two Live Stream API snapshots.
+    Only blocks that changed are examined, so the work done is proportional to the changes.
+
+    Args:
+        old (APISnapshot): The earlier snapshot. If it has no data, it is treated as the baseline and no events are made.
+        new (APISnapshot): The later snapshot.
+
+    Returns:
+        Events (list): APIEvent objects, in the order followers, subscribers, gifted subs, livestreams.
+        """
+
+    # There is nothing to compare against yet
+    if not old._jsondata:
+        return []
+
+    events = []
+
+    if not _block_unchanged(old, new, "followers"):
+        events += [FollowerAdded(follower) for follower in _new_user_actions(old.recent_followers, new.recent_followers, "followed_on")]
+
+    if not _block_unchanged(old, new, "subscribers"):
+        events += [SubscriberAdded(subscriber) for subscriber in _new_user_actions(old.recent_subscribers, new.recent_subscribers, "subscribed_on")]
+
+    if not _block_unchanged(old, new, "recent_gifted_subs"):
+        # Gifts cannot be told apart reliably, so count identical-looking gifts instead
+        remaining = collections.Counter(_gift_identity(gifted_sub) for gifted_sub in old.recent_gifted_subs)
+        for gifted_sub in new.recent_gifted_subs:
+            identity = _gift_identity(gifted_sub)
+            if remaining[identity]:
+                remaining[identity] -= 1
+            else:
+                events.append(GiftedSubAdded(gifted_sub))
+
+    if not _block_unchanged(old, new, "livestreams"):
+        events += _diff_livestreams(old.livestreams, new.livestreams)
+
+    return events
+
+def _diff_livestreams(old_streams, new_streams) -> list:
+    """Find what changed between two sets of livestreams.
+
+    Args:
+        old_streams (Mapping): Stream ID : LivestreamSnapshot pairs from the earlier snapshot.
+        new_streams (Mapping): Stream ID : LivestreamSnapshot pairs from the later snapshot.
+
+    Returns:
+        Events (list): LivestreamEvent objects.
+        """
+
+    events = []
+
+    for stream_id, livestream in old_streams.items():
+        if stream_id not in new_streams:
+            if livestream.is_live:
+                events.append(LivestreamEnded(livestream))
+            events.append(LivestreamDisappeared(livestream))
+
+    for stream_id, livestream in new_streams.items():
+        old_livestream = old_streams.get(stream_id)
+
+        if old_livestream is None:
+            events.append(LivestreamAppeared(livestream))
+            if livestream.is_live:
+                events.append(LivestreamWentLive(livestream))
+            continue
+
+        old_json, new_json = old_livestream._jsondata, livestream._jsondata
+
+        # RumbleAPI keeps the old JSON of unchanged livestreams
+        if old_json is new_json:
+            continue
+
+        if old_json["is_live"] != new_json["is_live"]:
+            events.append((LivestreamEnded, LivestreamWentLive)[bool(new_json["is_live"])](livestream))
+
+        for key in LIVESTREAM_DETAIL_KEYS:
+            if old_json.get(key) != new_json.get(key):
+                events.append(LivestreamChanged(livestream, key, old_json.get(key), new_json.get(key)))
+
+        for key in LIVESTREAM_COUNT_KEYS:
+            if old_json.get(key) != new_json.get(key):
+                events.append(LivestreamCountChanged(livestream, key, old_json.get(key), new_json.get(key)))
+
+    return events
+
+class NewItemLog:
+    """Detects new user actions (such as followers) by identity, and keeps a bounded log of them for any number of readers"""
+    def __init__(self, time_key: str, max_seen: int = 5000, max_log: int = 1000):
+        """Detects new user actions (such as followers) by identity, and keeps a bounded log of them for any number of readers.
+
+    Args:
+        time_key (str): The JSON key of the action's timestamp, e.g. followed_on.
+        max_seen (int): How many action identities to remember.
+            Defaults to 5000.
+        max_log (int): How many new actions to keep for readers that have not caught up.
+            Defaults to 1000.
+        """
+
+        self.time_key = time_key
+        self.max_seen = max_seen
+
+        # Identities of actions we have seen, as (username, timestamp), oldest first
+        self.__seen = collections.OrderedDict()
+
+        # Newest timestamp among identities we have forgotten, anything not newer than it is old
+        self.__forgotten_watermark = None
+
+        # Newest timestamp we have seen
+        self.watermark = None
+
+        # Log of new actions, as (sequence number, action)
+        self.__log = collections.deque(maxlen = max_log)
+        self.__next_seq = 0
+
+        # The first batch we take in is what was already there, not new
+        self.__seeded = False
+
+        self.__lock = threading.Lock()
+
+    @property
+    def next_seq(self):
+        """The sequence number the next new action will get"""
+        return self.__next_seq
+
+    def ingest(self, actions) -> list:
+        """Take in the current list of recent actions, and log the ones that are new.
+    Rumble's timestamps share one fixed format and offset, so they are compared as strings.
+
+    Args:
+        actions (list): JSONUserAction objects from the API, in any order.
+
+    Returns:
+        New (list): The actions that were new, oldest first.
+        """
+
+        with self.__lock:
+            new = []
+            for action in actions:
+                timestamp = action[self.time_key]
+                identity = (action.username, timestamp)
+                if identity in self.__seen:
+                    continue
+
+                self.__remember(identity)
+
+                if self.watermark is None or timestamp > self.watermark:
+                    self.watermark = timestamp
+
+                # We only forgot about this action because we saw it long ago
+                if self.__forgotten_watermark is not None and timestamp <= self.__forgotten_watermark:
+                    continue
+
+                new.append(action)
+
+            if not self.__seeded:
+                self.__seeded = True
+                return []
+
+            new.sort(key = lambda action: action[self.time_key])
+            for action in new:
+                self.__log.append((self.__next_seq, action))
+                self.__next_seq += 1
+
+            return new
+
+    def __remember(self, identity: tuple):
+        """Add an identity to the seen set, forgetting the oldest if it is full
+
+    Args:
+        identity (tuple): The (username, timestamp) of an action.
+        """
+
+        self.__seen[identity] = None
+        while len(self.__seen) > self.max_seen:
+            _, forgotten_time = self.__seen.popitem(last = False)[0]
+            if self.__forgotten_watermark is None or forgotten_time > self.__forgotten_watermark:
+                self.__forgotten_watermark = forgotten_time
+
+    def read_since(self, seq: int):
+        """Get the new actions logged from a sequence number onwards.
+
+    Args:
+        seq (int): The first sequence number to return.
+
+    Returns:
+        Actions (list): The logged actions, oldest first. Ones that were dropped from the log are skipped.
+        Next (int): The sequence number to read from next time.
+        """
+
+        with self.__lock:
+            return [action for action_seq, action in self.__log if action_seq >= seq], self.__next_seq
+
+    def cursor(self):
+        """Create an independent reader of this log, starting from now
+
+    Returns:
+        Cursor (NewItemCursor): The new reader.
+        """
+
+        return NewItemCursor(self)
+
+class NewItemCursor:
+    """An independent reader of a NewItemLog, so several readers can each get every new action"""
+    def __init__(self, log: NewItemLog):
+        """An independent reader of a NewItemLog.
+
+    Args:
+        log (NewItemLog): The log to read from, starting from now.
+        """
+
+        self.log = log
+        self.position = log.next_seq
+
+    def read(self) -> list:
+        """Get the actions that were logged since the last read
+
+    Returns:
+        Actions (list): The new actions, oldest first.
+        """
+
+        actions, self.position = self.log.read_since(self.position)
+        return actions
@@ -15,8 +15,8 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 S.D.G."""
 
-import requests
-from . import static
+from .transport import get_default_transport
+from .config import get_default_config
 
 class JSONObj():
     """Abstract class for handling a JSON data block as an object"""
@@ -38,6 +38,16 @@ class JSONObj():
         """Get a key from the JSON with fallback"""
         return self._jsondata.get
 
+    @property
+    def transport(self):
+        """The HTTP transport to use for any further requests about this object"""
+        return get_default_transport()
+
+    @property
+    def config(self):
+        """The settings to use for any further requests about this object"""
+        return get_default_config()
+
 class JSONUserAction(JSONObj):
     """Abstract class for Rumble JSON user actions"""
     def __init__(self, jsondata):
@@ -98,7 +108,7 @@ class JSONUserAction(JSONObj):
             return b''
 
         if not self.__profile_pic: # We never queried the profile pic before
-            response = requests.get(self.profile_pic_url, timeout = static.Delays.request_timeout)
+            response = self.transport.get(self.profile_pic_url, endpoint = "image", timeout = self.config.request_timeout)
             assert response.status_code == 200, "Status code " + str(response.status_code)
 
             self.__profile_pic = response.content
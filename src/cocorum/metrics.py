@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Metrics
+
+An in-process registry of counters, gauges and histograms, updated by Cocorum's network calls and chat processing.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import bisect
+import threading
+
+# Default histogram bucket upper bounds, suited to latencies in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float("inf"))
+
+class Counter:
+    """A value that only goes up, such as a number of requests"""
+    kind = "counter"
+
+    def __init__(self):
+        """A value that only goes up, such as a number of requests"""
+        self.value = 0
+        self.__lock = threading.Lock()
+
+    def inc(self, amount = 1):
+        """Increase the count.
+
+    Args:
+        amount (int, float): How much to increase it by.
+            Defaults to 1.
+        """
+
+        with self.__lock:
+            self.value += amount
+
+    def collect(self) -> dict:
+        """Get the current value.
+
+    Returns:
+        Data (dict): The value.
+        """
+
+        return {"value": self.value}
+
+class Gauge:
+    """A value that goes up and down, such as a queue depth"""
+    kind = "gauge"
+
+    def __init__(self):
+        """A value that goes up and down, such as a queue depth"""
+        self.value = 0
+        self.__lock = threading.Lock()
+
+    def set(self, value):
+        """Set the value.
+
+    Args:
+        value (int, float): The new value.
+        """
+
+        self.value = value
+
+    def inc(self, amount = 1):
+        """Increase the value.
+
+    Args:
+        amount (int, float): How much to increase it by, negative to decrease it.
+            Defaults to 1.
+        """
+
+        with self.__lock:
+            self.value += amount
+
+    def collect(self) -> dict:
+        """Get the current value.
+
+    Returns:
+        Data (dict): The value.
+        """
+
+        return {"value": self.value}
+
+class Histogram:
+    """A distribution of observed values, such as request latencies"""
+    kind = "histogram"
+
+    def __init__(self, buckets = LATENCY_BUCKETS):
+        """A distribution of observed values, such as request latencies.
+
+    Args:
+        buckets (tuple): Ascending upper bounds of the buckets, the last one should be infinity.
+            Defaults to LATENCY_BUCKETS.
+        """
+
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.__lock = threading.Lock()
+
+    def observe(self, value):
+        """Record a value.
+
+    Args:
+        value (int, float): The observed value.
+        """
+
+        i = bisect.bisect_left(self.buckets, value)
+        with self.__lock:
+            if i < len(self.bucket_counts):
+                self.bucket_counts[i] += 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    @property
+    def mean(self):
+        """The mean of the observed values"""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile from the buckets.
+
+    Args:
+        q (float): The quantile, from 0 to 1.
+
+    Returns:
+        Value (float): The upper bound of the bucket holding the quantile, capped at the largest observed value.
+        """
+
+        if not self.count:
+            return 0.0
+
+        target = q * self.count
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            running += bucket_count
+            if running >= target:
+                return min(bound, self.max)
+
+        return self.max
+
+    def collect(self) -> dict:
+        """Get the current distribution.
+
+    Returns:
+        Data (dict): The count, sum, min, max, mean, median and 99th percentile, and the bucket counts.
+        """
+
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip((str(bound) for bound in self.buckets), self.bucket_counts)),
+            }
+
+class MetricsRegistry:
+    """Holds named, labelled metrics, creating each one on first use"""
+    def __init__(self):
+        """Holds named, labelled metrics, creating each one on first use"""
+        # (name, sorted label items with string values) : metric
+        self.__metrics = {}
+        self.__lock = threading.Lock()
+
+    def __get(self, metric_type, name: str, labels: dict, *args):
+        """Get a metric, creating it if it does not exist
+
+    Args:
+        metric_type (type): Counter, Gauge or Histogram.
+        name (str): The metric name.
+        labels (dict): The label : value pairs that pick out this metric. Values are converted to strings.
+        *args: Arguments to create the metric with.
+
+    Returns:
+        Metric (Counter, Gauge, Histogram): The metric.
+        """
+
+        # String values, so keys with None next to text under one name can still be sorted
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        metric = self.__metrics.get(key)
+        if metric is None:
+            with self.__lock:
+                metric = self.__metrics.setdefault(key, metric_type(*args))
+
+        assert isinstance(metric, metric_type), f"Metric {name} is a {metric.kind}, not a {metric_type.kind}"
+        return metric
+
+    def counter(self, name: str, **labels) -> Counter:
+        """Get a counter.
+
+    Args:
+        name (str): The metric name.
+        **labels: Label values that pick out this counter.
+
+    Returns:
+        Counter (Counter): The counter.
+        """
+
+        return self.__get(Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        """Get a gauge.
+
+    Args:
+        name (str): The metric name.
+        **labels: Label values that pick out this gauge.
+
+    Returns:
+        Gauge (Gauge): The gauge.
+        """
+
+        return self.__get(Gauge, name, labels)
+
+    def histogram(self, name: str, buckets = LATENCY_BUCKETS, **labels) -> Histogram:
+        """Get a histogram.
+
+    Args:
+        name (str): The metric name.
+        buckets (tuple): Bucket upper bounds, only used if the histogram is new.
+            Defaults to LATENCY_BUCKETS.
+        **labels: Label values that pick out this histogram.
+
+    Returns:
+        Histogram (Histogram): The histogram.
+        """
+
+        return self.__get(Histogram, name, labels, buckets)
+
+    def collect(self) -> list:
+        """Get the current state of every metric.
+
+    Returns:
+        Metrics (list): A dict for each metric, with its name, type, labels and data.
+        """
+
+        with self.__lock:
+            items = list(self.__metrics.items())
+
+        return [
+            {"name": name, "type": metric.kind, "labels": dict(labels), **metric.collect()}
+            for (name, labels), metric in sorted(items, key = lambda item: item[0])
+            ]
+
+    def reset(self):
+        """Forget every metric"""
+        with self.__lock:
+            self.__metrics.clear()
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+def get_default_registry() -> MetricsRegistry:
+    """Get the registry shared by every transport that was not given its own.
+
+    Returns:
+        Registry (MetricsRegistry): The default registry, created on first use.
+        """
+
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+
+        return _default_registry
+
+def set_default_registry(registry: MetricsRegistry):
+    """Replace the registry shared by every transport that was not given its own.
+    Transports that already exist keep the registry they were created with.
+
+    Args:
+        registry (MetricsRegistry): The new default registry.
+        """
+
+    global _default_registry
+    with _default_lock:
+        _default_registry = registry
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Live Stream API polling
+
+Poll many Rumble Live Stream API keys from one scheduler, with their refreshes spread evenly over time, and adapt how often each one is refreshed to its activity.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import concurrent.futures
+import heapq
+import itertools
+import random
+import threading
+import time
+from . import static
+
+class RefreshPolicy:
+    """Decides how long a RumbleAPI waits between refreshes (abstract).
+    Subclasses implement next_interval(), and keep the current interval in the interval attribute."""
+
+    # The current interval in seconds
+    interval = static.Delays.api_refresh_default
+
+    def next_interval(self, api, changed: bool) -> float:
+        """Decide the refresh interval after a successful refresh.
+
+    Args:
+        api (RumbleAPI): The API that was refreshed.
+        changed (bool): Did the refresh find changed data?
+
+    Returns:
+        Interval (float): Seconds to wait before the next refresh.
+        """
+
+        raise NotImplementedError
+
+class FixedRefreshPolicy(RefreshPolicy):
+    """Always refresh at the same interval"""
+    def __init__(self, interval: float = static.Delays.api_refresh_default):
+        """Always refresh at the same interval.
+
+    Args:
+        interval (float): Seconds between refreshes.
+            Defaults to static.Delays.api_refresh_default.
+        """
+
+        self.interval = interval
+
+    def next_interval(self, api, changed: bool) -> float:
+        """Decide the refresh interval after a successful refresh, see RefreshPolicy"""
+        return self.interval
+
+class AdaptiveRefreshPolicy(RefreshPolicy):
+    """Refresh quickly while a livestream is live or data recently changed, and back off exponentially while nothing changes.
+    Keeps state, so each RumbleAPI needs its own instance."""
+    def __init__(self, minimum: float = static.Delays.api_refresh_minimum, maximum: float = 300, backoff: float = 2, active_window: float = 60):
+        """Refresh quickly while a livestream is live or data recently changed, and back off exponentially while nothing changes.
+
+    Args:
+        minimum (float): Seconds between refreshes while active.
+            Defaults to static.Delays.api_refresh_minimum.
+        maximum (float): The longest to ever wait between refreshes, in seconds.
+            Defaults to 300.
+        backoff (float): What to multiply the interval by after each refresh with no activity.
+            Defaults to 2.
+        active_window (float): How many seconds after data last changed to keep counting as active.
+            Defaults to 60.
+        """
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.active_window = active_window
+        self.interval = minimum
+
+        # When data last changed, in seconds since Epoch UTC
+        self.last_change_time = 0
+
+    @staticmethod
+    def is_live(api) -> bool:
+        """Does the API's latest data have a livestream that is live?
+
+    Args:
+        api (RumbleAPI): The API to check, without refreshing it.
+
+    Returns:
+        Result (bool): Is a livestream live?
+        """
+
+        return any(stream_json["is_live"] for stream_json in api._jsondata.get("livestreams", ()))
+
+    def next_interval(self, api, changed: bool) -> float:
+        """Decide the refresh interval after a successful refresh, see RefreshPolicy"""
+        now = time.time()
+        if changed:
+            self.last_change_time = now
+
+        # Active, so poll as fast as allowed
+        if self.is_live(api) or now - self.last_change_time < self.active_window:
+            self.interval = self.minimum
+
+        # Idle, so back off
+        else:
+            self.interval = min(self.interval * self.backoff, self.maximum)
+
+        return self.interval
+
+class PollStats:
+    """Polling statistics for one RumbleAPI in a PollScheduler"""
+    def __init__(self):
+        """Polling statistics for one RumbleAPI in a PollScheduler"""
+
+        # Number of refreshes that succeeded
+        self.successes = 0
+
+        # Number of refreshes that raised an error, in total and since the last success
+        self.failures = 0
+        self.consecutive_failures = 0
+
+        # The error raised by the last failed refresh
+        self.last_error = None
+
+        # Number of polls skipped because something else had just refreshed
+        self.skips = 0
+
+        # How late the last poll started after it was due, and the worst so far, in seconds
+        self.lag = 0.0
+        self.max_lag = 0.0
+
+        # When the last poll started, in seconds since Epoch UTC, and how long it took in seconds
+        self.last_poll_time = 0.0
+        self.last_duration = 0.0
+
+    def __repr__(self):
+        """The statistics in debugging form"""
+        return f"PollStats(successes = {self.successes}, failures = {self.failures}, skips = {self.skips}, lag = {self.lag:.3f}, max_lag = {self.max_lag:.3f})"
+
+class PollScheduler:
+    """Refresh many RumbleAPI objects from one scheduler thread and a bounded pool of workers"""
+    def __init__(self, max_workers: int = 8):
+        """Refresh many RumbleAPI objects from one scheduler thread and a bounded pool of workers.
+
+    Args:
+        max_workers (int): The most refreshes to have in flight at once.
+            Defaults to 8.
+        """
+
+        self.max_workers = max_workers
+
+        # RumbleAPI : PollStats
+        self.stats = {}
+
+        # Heap of (due time, tiebreaker, RumbleAPI)
+        self.__queue = []
+        self.__counter = itertools.count()
+
+        # APIs being polled right now, which have no queue entry until their poll queues the next one
+        self.__in_flight = set()
+
+        # Guards the queue and stats, and wakes the scheduler thread when the queue changes
+        self.__condition = threading.Condition()
+
+        # Limits the refreshes in flight, so polls that cannot start yet stay in the queue and show as lag
+        self.__slots = threading.BoundedSemaphore(max_workers)
+
+        self.__executor = None
+        self.__thread = None
+        self.__running = False
+
+    @staticmethod
+    def interval_of(api) -> float:
+        """How often to poll a RumbleAPI, respecting Rumble's minimum
+
+    Args:
+        api (RumbleAPI): The API to poll.
+
+    Returns:
+        Interval (float): Seconds between polls.
+        """
+
+        return max(api.refresh_rate, api.min_request_interval, static.Delays.api_refresh_minimum)
+
+    def add(self, api):
+        """Start polling a RumbleAPI.
+    It is first polled at a random point within its interval, see rebalance() to spread everything evenly.
+
+    Args:
+        api (RumbleAPI): The API to poll. Should not also refresh in the background.
+        """
+
+        with self.__condition:
+            if api in self.stats:
+                return
+
+            self.stats[api] = PollStats()
+
+            # Removed and added back while a poll was in flight, which will queue the next one
+            if api in self.__in_flight:
+                return
+
+            self.__push(time.time() + random.uniform(0, self.interval_of(api)), api)
+
+    def remove(self, api):
+        """Stop polling a RumbleAPI.
+
+    Args:
+        api (RumbleAPI): The API to stop polling.
+        """
+
+        with self.__condition:
+            self.stats.pop(api, None)
+            self.__queue = [entry for entry in self.__queue if entry[2] is not api]
+            heapq.heapify(self.__queue)
+            self.__condition.notify()
+
+    def rebalance(self):
+        """Spread the next polls of all APIs evenly across their intervals"""
+        with self.__condition:
+            # APIs being polled queue their own next poll when done
+            apis = [api for api in self.stats if api not in self.__in_flight]
+            now = time.time()
+            self.__queue = []
+            for i, api in enumerate(apis):
+                self.__push(now + self.interval_of(api) * i / len(apis), api)
+
+            self.__condition.notify()
+
+    def __push(self, due: float, api):
+        """Queue a poll, assuming we hold the condition lock
+
+    Args:
+        due (float): When to poll, in seconds since Epoch UTC.
+        api (RumbleAPI): The API to poll.
+        """
+
+        heapq.heappush(self.__queue, (due, next(self.__counter), api))
+        self.__condition.notify()
+
+    @property
+    def running(self):
+        """Is the scheduler running?"""
+        return self.__running
+
+    def start(self):
+        """Start polling, with the first polls spread evenly"""
+        if self.__running:
+            return
+
+        self.__running = True
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.max_workers, thread_name_prefix = "cocorum-poll")
+        self.rebalance()
+        self.__thread = threading.Thread(target = self.__loop, daemon = True)
+        self.__thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop polling.
+
+    Args:
+        wait (bool): Wait for refreshes in flight to finish.
+            Defaults to True.
+        """
+
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify()
+
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+
+        if self.__executor:
+            self.__executor.shutdown(wait = wait)
+            self.__executor = None
+
+    def __loop(self):
+        """Hand each poll to the workers when it is due"""
+        while True:
+            # Wait for a free worker first, so late polls are measured as lag
+            self.__slots.acquire()
+
+            with self.__condition:
+                while self.__running and (not self.__queue or self.__queue[0][0] > time.time()):
+                    self.__condition.wait(self.__queue[0][0] - time.time() if self.__queue else None)
+
+                if not self.__running:
+                    self.__slots.release()
+                    return
+
+                due, _, api = heapq.heappop(self.__queue)
+                self.__in_flight.add(api)
+
+            self.__executor.submit(self.__poll, api, due)
+
+    def __poll(self, api, due: float):
+        """Refresh one API and queue its next poll
+
+    Args:
+        api (RumbleAPI): The API to refresh.
+        due (float): When the poll was due, in seconds since Epoch UTC.
+        """
+
+        start = time.time()
+        error = None
+        skipped = False
+
+        try:
+            # Something else refreshed this API recently, so don't make it wait out the request floor
+            if start - api.last_refresh_time < api.min_request_interval:
+                skipped = True
+            else:
+                api.refresh()
+
+        except Exception as e:
+            error = e
+
+        finally:
+            self.__slots.release()
+
+        end = time.time()
+
+        with self.__condition:
+            self.__in_flight.discard(api)
+            stats = self.stats.get(api)
+
+            # The API was removed while we polled it
+            if stats is None:
+                return
+
+            stats.last_poll_time = start
+            stats.last_duration = end - start
+            stats.lag = max(start - due, 0)
+            stats.max_lag = max(stats.max_lag, stats.lag)
+
+            if skipped:
+                stats.skips += 1
+            elif error:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                stats.last_error = error
+            else:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+
+            # Keep to the API's slot in the schedule, unless we fell behind it.
+            # The refresh policy may have just changed the interval, so read it after the refresh.
+            next_due = max(due + self.interval_of(api), api.last_refresh_time + api.min_request_interval, end)
+            self.__push(next_due, api)
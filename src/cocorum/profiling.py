@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""Profiling
+
+Hooks around Cocorum's hot paths, plus ready-made sampling and cProfile integrations that can be switched on for a while in a running program.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import collections
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import warnings
+
+class Points:
+    """Names of the hot paths that hooks can be registered around"""
+
+    # Waiting for and reading the next chat SSE event
+    sse_read = "sse_read"
+
+    # Decoding the JSON of a chat SSE event
+    json_decode = "json_decode"
+
+    # Taking in the users, channels and messages of a chat SSE event
+    update_users = "update_users"
+    update_channels = "update_channels"
+    update_mailbox = "update_mailbox"
+
+    # Parsing a Live Stream API response
+    api_parse = "api_parse"
+
+    # Building BeautifulSoup HTML trees, in Scraper.soup_request() and ServicePHP.comment_list()
+    soup_parse = "soup_parse"
+
+    # Sending one chunk of a video upload
+    upload_chunk = "upload_chunk"
+
+    # All of them
+    all = (sse_read, json_decode, update_users, update_channels, update_mailbox, api_parse, soup_parse, upload_chunk)
+
+class Hook:
+    """A pair of callbacks registered around a hot path"""
+    def __init__(self, point: str, before = None, after = None):
+        """A pair of callbacks registered around a hot path.
+
+    Args:
+        point (str): The hot path, see Points.
+        before (callable): Called as before(point, info) when the hot path is entered.
+            Defaults to None.
+        after (callable): Called as after(point, elapsed, info) when it is left, elapsed in seconds from a monotonic clock.
+            Defaults to None.
+        """
+
+        self.point = point
+        self.before = before
+        self.after = after
+
+# Hot path name : tuple of Hook objects, replaced whole so readers never need the lock
+_hooks = {}
+_hooks_lock = threading.Lock()
+
+def register_hook(point: str, before = None, after = None) -> Hook:
+    """Call functions around a hot path, from whichever thread runs it.
+
+    Args:
+        point (str): The hot path, see Points.
+        before (callable): Called as before(point, info) when the hot path is entered.
+            Defaults to None.
+        after (callable): Called as after(point, elapsed, info) when it is left, elapsed in seconds from a monotonic clock.
+            Defaults to None.
+
+    Returns:
+        Hook (Hook): The registered hook, to pass to unregister_hook() later.
+        """
+
+    assert point in Points.all, f"Unknown hot path {point}"
+    hook = Hook(point, before, after)
+    with _hooks_lock:
+        _hooks[point] = _hooks.get(point, ()) + (hook,)
+
+    return hook
+
+def unregister_hook(hook: Hook):
+    """Stop calling a hook.
+
+    Args:
+        hook (Hook): A hook returned by register_hook().
+        """
+
+    with _hooks_lock:
+        remaining = tuple(registered for registered in _hooks.get(hook.point, ()) if registered is not hook)
+        if remaining:
+            _hooks[hook.point] = remaining
+        else:
+            _hooks.pop(hook.point, None)
+
+class _NoSection:
+    """Stands in for a section when nothing is hooked, so an unhooked hot path costs one dict lookup"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NO_SECTION = _NoSection()
+
+class _Section:
+    """Runs the hooks of a hot path around one pass through it"""
+    def __init__(self, point: str, hooks: tuple, info: dict):
+        """Runs the hooks of a hot path around one pass through it.
+
+    Args:
+        point (str): The hot path.
+        hooks (tuple): The hooks registered on it.
+        info (dict): Details about this pass, given to the callbacks.
+        """
+
+        self.point = point
+        self.hooks = hooks
+        self.info = info
+        self.start = None
+
+    def __enter__(self):
+        for hook in self.hooks:
+            if hook.before:
+                # A broken hook must never break the hot path itself
+                try:
+                    hook.before(self.point, self.info)
+                except Exception as e:
+                    warnings.warn(f"Profiling hook failed before {self.point}: {e!r}")
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        for hook in self.hooks:
+            if hook.after:
+                try:
+                    hook.after(self.point, elapsed, self.info)
+                except Exception as e:
+                    warnings.warn(f"Profiling hook failed after {self.point}: {e!r}")
+
+        return False
+
+def section(point: str, **info):
+    """Mark a pass through a hot path, for use in a with statement.
+
+    Args:
+        point (str): The hot path, see Points.
+        **info: Details about this pass, given to the callbacks.
+
+    Returns:
+        Section (context manager): Runs the hot path's hooks, if it has any.
+        """
+
+    hooks = _hooks.get(point)
+    if not hooks:
+        return _NO_SECTION
+
+    return _Section(point, hooks, info)
+
+class MetricsHooks:
+    """Record how long each hot path takes into a metrics registry, as profile_seconds histograms"""
+    def __init__(self, registry = None, points = Points.all):
+        """Record how long each hot path takes into a metrics registry.
+
+    Args:
+        registry (MetricsRegistry): Where to record the timings.
+            Defaults to the shared default registry.
+        points (tuple): The hot paths to time.
+            Defaults to all of them.
+        """
+
+        # Imported here so the profiling module stays standalone
+        from .metrics import get_default_registry
+        self.registry = registry or get_default_registry()
+        self.points = points
+        self.hooks = []
+        self.__histograms = {} # Point : histogram, looked up once per point
+
+    def start(self):
+        """Start recording"""
+        self.hooks = [register_hook(point, after = self.__after) for point in self.points]
+
+    def stop(self):
+        """Stop recording"""
+        for hook in self.hooks:
+            unregister_hook(hook)
+        self.hooks = []
+
+    def __after(self, point: str, elapsed: float, info: dict):
+        """Record one timing"""
+        histogram = self.__histograms.get(point)
+        if histogram is None:
+            histogram = self.__histograms[point] = self.registry.histogram("profile_seconds", point = point)
+        histogram.observe(elapsed)
+
+class CProfileWindow:
+    """Run cProfile while any thread is inside a hot path, for a window of time"""
+    def __init__(self, points = Points.all):
+        """Run cProfile while any thread is inside a hot path, for a window of time.
+    Only one profiler can be active per process, so a single one is shared by every thread,
+    and it is enabled while at least one thread is inside a hot path.
+
+    Args:
+        points (tuple): The hot paths to profile inside.
+            Defaults to all of them.
+        """
+
+        self.points = points
+        self.hooks = []
+        self.__local = threading.local()
+
+        # The profiler, and how many threads are inside a hot path with it enabled
+        self.__profiler = cProfile.Profile()
+        self.__active = 0
+        self.__lock = threading.Lock()
+        self.__timer = None
+
+    @property
+    def running(self):
+        """Is the window open?"""
+        return bool(self.hooks)
+
+    def start(self, duration: float = None):
+        """Open the window.
+
+    Args:
+        duration (float): Close the window by itself after this many seconds.
+            Defaults to None, stay open until stop() is called.
+        """
+
+        if self.running:
+            return
+
+        self.hooks = [register_hook(point, before = self.__before, after = self.__after) for point in self.points]
+        if duration:
+            self.__timer = threading.Timer(duration, self.stop)
+            self.__timer.daemon = True
+            self.__timer.start()
+
+    def stop(self):
+        """Close the window. Hot paths already in progress finish profiling normally."""
+        for hook in self.hooks:
+            unregister_hook(hook)
+        self.hooks = []
+
+        if self.__timer and self.__timer is not threading.current_thread():
+            self.__timer.cancel()
+        self.__timer = None
+
+    def __before(self, point: str, info: dict):
+        """Count this thread as profiled, unless it is already inside a hot path"""
+        depth = getattr(self.__local, "depth", 0)
+        if not depth:
+            self.__local.counted = False
+            with self.__lock:
+                if not self.__active:
+                    try:
+                        self.__profiler.enable()
+
+                    # Some other profiler is already running in this process, so sit this pass out
+                    except ValueError as e:
+                        warnings.warn(f"Could not start cProfile: {e}")
+                        self.__local.depth = depth + 1
+                        return
+
+                self.__active += 1
+                self.__local.counted = True
+
+        self.__local.depth = depth + 1
+
+    def __after(self, point: str, elapsed: float, info: dict):
+        """Stop counting this thread once it leaves the outermost hot path, and stop profiling once no thread is inside one"""
+        depth = getattr(self.__local, "depth", 0)
+
+        # The window opened while this thread was already inside the hot path
+        if not depth:
+            return
+
+        self.__local.depth = depth - 1
+        if depth == 1 and self.__local.counted:
+            self.__local.counted = False
+            with self.__lock:
+                self.__active -= 1
+                if not self.__active:
+                    self.__profiler.disable()
+
+    def stats(self):
+        """Get the profile so far.
+
+    Returns:
+        Stats (pstats.Stats, None): The profile, or None if nothing was profiled yet.
+        """
+
+        with self.__lock:
+            # Making the Stats disables the profiler, so turn it back on if a thread is still inside a hot path
+            try:
+                return pstats.Stats(self.__profiler)
+
+            # A profiler with no data cannot make Stats
+            except TypeError:
+                return None
+
+            finally:
+                if self.__active:
+                    self.__profiler.enable()
+
+class SamplingProfiler:
+    """Sample the stacks of every thread from a background thread, at low overhead"""
+    def __init__(self, interval: float = 0.005, include_all: bool = False):
+        """Sample the stacks of every thread from a background thread, at low overhead.
+
+    Args:
+        interval (float): Seconds between samples.
+            Defaults to 0.005.
+        include_all (bool): Count frames from every module, not only frames inside Cocorum.
+            Defaults to False.
+        """
+
+        self.interval = interval
+        self.include_all = include_all
+
+        # (filename, line number, function name) : number of samples it was running in, and at the top of the stack.
+        # Total counts use the function's first line, self counts the line that was running.
+        self.total_counts = collections.Counter()
+        self.self_counts = collections.Counter()
+        self.samples = 0
+
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    @property
+    def running(self):
+        """Are we sampling?"""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self, duration: float = None):
+        """Start sampling.
+
+    Args:
+        duration (float): Stop by itself after this many seconds.
+            Defaults to None, sample until stop() is called.
+        """
+
+        if self.running:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target = self.__loop, args = (duration,), daemon = True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        self.__stop.set()
+        if self.__thread and self.__thread is not threading.current_thread():
+            self.__thread.join()
+        self.__thread = None
+
+    def __loop(self, duration: float):
+        """Take samples until told to stop or the duration runs out"""
+        own_id = threading.get_ident()
+        end = time.monotonic() + duration if duration else None
+        while not self.__stop.wait(self.interval):
+            if end and time.monotonic() >= end:
+                return
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.__sample(frame)
+
+            self.samples += 1
+
+    def __sample(self, frame):
+        """Count the frames of one stack
+
+    Args:
+        frame (frame): The top frame of the stack.
+        """
+
+        seen = set()
+        top = True
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename != __file__ and (self.include_all or "cocorum" in code.co_filename):
+                key = (code.co_filename, frame.f_lineno if top else code.co_firstlineno, code.co_name)
+                if top:
+                    self.self_counts[key] += 1
+                    top = False
+
+                # Count recursive functions once per sample
+                function = (code.co_filename, code.co_firstlineno, code.co_name)
+                if function not in seen:
+                    seen.add(function)
+                    self.total_counts[function] += 1
+
+            frame = frame.f_back
+
+    def top(self, n: int = 20, by_self: bool = False) -> list:
+        """Get the functions that were seen running the most.
+
+    Args:
+        n (int): How many functions to return.
+            Defaults to 20.
+        by_self (bool): Rank by samples at the top of the stack (or innermost Cocorum frame) instead of anywhere in it.
+            Defaults to False.
+
+    Returns:
+        Functions (list): ((filename, line number, function name), samples) pairs, most samples first.
+        """
+
+        return (self.self_counts if by_self else self.total_counts).most_common(n)
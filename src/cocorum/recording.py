@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""Recording
+
+Transports that record every HTTP exchange Cocorum makes, including the timing of streamed chat SSE bytes, to a gzipped JSON lines file, and replay them later at the original or an accelerated speed.
+
+Example usage:
+```
+from cocorum import chatapi, recording
+
+# Record a session
+with recording.RecordingTransport("session.jsonl.gz") as transport:
+    chat = chatapi.ChatAPI(stream_id, transport = transport)
+    ...
+
+# Replay it ten times as fast, without touching the network
+chat = chatapi.ChatAPI(stream_id, transport = recording.ReplayTransport("session.jsonl.gz", speed = 10))
+```
+
+Recordings hold response bodies as they were received, including session tokens returned by logins. Request headers, cookies and bodies are never recorded, and credentials in query strings, such as the Live Stream API key, are redacted.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import base64
+import collections
+import datetime
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+import warnings
+import requests
+import requests.structures
+from . import static
+from .transport import Transport
+
+# Query string parameters whose values are credentials, and must not be written to a recording
+CREDENTIAL_PARAMS = ("key", "api_key", "token", "access_token", "session", "password")
+
+# Matches the value of a credential parameter in a URL, or in an error message that quotes one
+_CREDENTIAL_PARAM = re.compile(r"([?&](?:" + "|".join(CREDENTIAL_PARAMS) + r")=)[^&#\s'\"]*", re.IGNORECASE)
+
+def _redact(text: str) -> str:
+    """Blank out the values of credential query parameters.
+
+    Args:
+        text (str): A URL, or text that may contain one.
+
+    Returns:
+        Text (str): The text, with each credential value replaced by REDACTED.
+        """
+
+    return _CREDENTIAL_PARAM.sub(r"\1REDACTED", text)
+
+def _prepared_url(method: str, url: str, params) -> str:
+    """Build the URL a request goes to, with its query string and credentials redacted, the same way when recording and replaying.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL without parameters.
+        params (dict): The query string parameters.
+
+    Returns:
+        URL (str): The full URL, redacted.
+        """
+
+    return _redact(requests.Request(method, url, params = params).prepare().url)
+
+def _encode_body(data: bytes) -> dict:
+    """Encode a body for a JSON line, as text if it is valid text and base 64 otherwise.
+
+    Args:
+        data (bytes): The body.
+
+    Returns:
+        Fields (dict): Either a text or a b64 key with the encoded body.
+        """
+
+    try:
+        return {"text": data.decode(static.Misc.text_encoding)}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(data).decode("ascii")}
+
+def _decode_body(line: dict) -> bytes:
+    """Decode a body encoded by _encode_body().
+
+    Args:
+        line (dict): The JSON line holding the body.
+
+    Returns:
+        Body (bytes): The body.
+        """
+
+    if "b64" in line:
+        return base64.b64decode(line["b64"])
+    return line.get("text", "").encode(static.Misc.text_encoding)
+
+class _RecordingRaw:
+    """Wraps the raw urllib3 response of a streamed request, recording each chunk as it is read"""
+    def __init__(self, raw, transport, exchange_id: int):
+        """Wraps the raw urllib3 response of a streamed request, recording each chunk as it is read.
+
+    Args:
+        raw (urllib3.response.HTTPResponse): The raw response.
+        transport (RecordingTransport): The transport to record the chunks with.
+        exchange_id (int): The ID of the exchange the chunks belong to.
+        """
+
+        self._raw = raw
+        self._transport = transport
+        self._exchange_id = exchange_id
+        self._start = time.monotonic()
+        self._ended = False
+
+    def __getattr__(self, name):
+        """Anything we do not wrap comes from the raw response"""
+        return getattr(self._raw, name)
+
+    def __record(self, data: bytes):
+        """Record a chunk, or the end of the stream if the chunk is empty"""
+        if self._ended:
+            return
+
+        if data:
+            self._transport._write({"kind": "chunk", "id": self._exchange_id, "t": time.monotonic() - self._start, **_encode_body(data)})
+        else:
+            self._ended = True
+            self._transport._write({"kind": "end", "id": self._exchange_id, "t": time.monotonic() - self._start})
+
+    def stream(self, amt = 2 ** 16, decode_content = None):
+        """Yield chunks of the body, recording each one"""
+        for data in self._raw.stream(amt, decode_content = decode_content):
+            self.__record(data)
+            yield data
+
+        self.__record(b"")
+
+    def read(self, amt = None, decode_content = None, **kwargs):
+        """Read from the body, recording what was read"""
+        data = self._raw.read(amt, decode_content = decode_content, **kwargs)
+        self.__record(data)
+        return data
+
+    def read1(self, amt = None, decode_content = None):
+        """Read whatever part of the body is available, recording it"""
+        data = self._raw.read1(amt, decode_content = decode_content)
+        self.__record(data)
+        return data
+
+    def close(self):
+        """Close the raw response, recording the end of the stream"""
+        self.__record(b"")
+        return self._raw.close()
+
+class RecordingTransport(Transport):
+    """A transport that records every exchange it makes to a gzipped JSON lines file"""
+    def __init__(self, path: str, **kwargs):
+        """A transport that records every exchange it makes to a gzipped JSON lines file.
+    Close it when done, so the end of the file is written out.
+
+    Args:
+        path (str): The file to record to. It is overwritten.
+        **kwargs: Any other arguments accepted by Transport.
+        """
+
+        super().__init__(**kwargs)
+        self.path = path
+        self.__file = gzip.open(path, "wt", encoding = static.Misc.text_encoding)
+        self.__lock = threading.Lock()
+        self.__ids = itertools.count()
+        self.__start = time.monotonic()
+
+    def __enter__(self):
+        """Use the transport in a with statement"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the transport and the recording at the end of a with statement"""
+        self.close()
+
+    def _write(self, line: dict):
+        """Write one JSON line to the recording.
+
+    Args:
+        line (dict): The line.
+        """
+
+        text = json.dumps(line, separators = (",", ":")) + "\n"
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.write(text)
+
+    def _send(self, method: str, url: str, endpoint: str, **kwargs):
+        """Make a request and record the exchange"""
+        exchange_id = next(self.__ids)
+        start = time.monotonic()
+        line = {
+            "kind": "exchange",
+            "id": exchange_id,
+            "t": start - self.__start,
+            "method": method,
+            "url": _prepared_url(method, url, kwargs.get("params")),
+            "endpoint": endpoint,
+            }
+
+        try:
+            response = super()._send(method, url, endpoint, **kwargs)
+
+        # Record the failure so replays fail the same way
+        except requests.exceptions.RequestException as e:
+            self._write({**line, "kind": "error", "elapsed": time.monotonic() - start, "error": type(e).__name__, "message": _redact(str(e))})
+            raise
+
+        line.update({
+            "elapsed": time.monotonic() - start,
+            "status": response.status_code,
+            "reason": response.reason,
+            "final_url": _redact(response.url),
+            "headers": {key: value for key, value in response.headers.items() if key.lower() != "set-cookie"},
+            "stream": bool(kwargs.get("stream")),
+            })
+
+        # The body has not been read yet, so record it as it is
+        if kwargs.get("stream"):
+            self._write(line)
+            response.raw = _RecordingRaw(response.raw, self, exchange_id)
+        else:
+            self._write({**line, **_encode_body(response.content)})
+
+        return response
+
+    def flush(self):
+        """Write everything recorded so far out to the file"""
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.flush()
+
+    def close(self):
+        """Close all pooled connections and finish the recording"""
+        super().close()
+        with self.__lock:
+            self.__file.close()
+
+class _ReplayRaw:
+    """Stands in for the raw urllib3 response of a streamed request, giving out recorded chunks at their recorded times"""
+    def __init__(self, chunks: list, speed: float):
+        """Stands in for the raw urllib3 response of a streamed request.
+
+    Args:
+        chunks (list): (seconds after the response, data) pairs.
+        speed (float): How many times faster than recorded to give out the chunks, None for no waiting.
+        """
+
+        self.chunks = chunks
+        self.speed = speed
+        self.closed = False
+        self.retries = None
+        self.__start = time.monotonic()
+        self.__index = 0
+        self.__buffer = b""
+
+    def __next_chunk(self):
+        """Wait for the next chunk's recorded time and give it out.
+
+    Returns:
+        Data (bytes, None): The chunk, or None at the end of the stream.
+        """
+
+        if self.closed or self.__index >= len(self.chunks):
+            return None
+
+        offset, data = self.chunks[self.__index]
+        self.__index += 1
+        if self.speed:
+            delay = self.__start + offset / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        return data
+
+    def stream(self, amt = 2 ** 16, decode_content = None):
+        """Yield the recorded chunks at their recorded times"""
+        if self.__buffer:
+            data, self.__buffer = self.__buffer, b""
+            yield data
+
+        while (data := self.__next_chunk()) is not None:
+            yield data
+
+    def read(self, amt = None, decode_content = None, **kwargs):
+        """Read up to amt bytes, or everything if amt is None"""
+        while amt is None or len(self.__buffer) < amt:
+            data = self.__next_chunk()
+            if data is None:
+                break
+            self.__buffer += data
+
+        if amt is None:
+            data, self.__buffer = self.__buffer, b""
+        else:
+            data, self.__buffer = self.__buffer[:amt], self.__buffer[amt:]
+        return data
+
+    def close(self):
+        """Stop giving out chunks"""
+        self.closed = True
+
+class ReplayTransport(Transport):
+    """A transport that answers requests from a recording instead of the network"""
+    def __init__(self, path: str, speed: float = 1.0, **kwargs):
+        """A transport that answers requests from a recording instead of the network.
+    Each request gets the next unused recorded exchange with the same method and URL,
+    or failing that the next one with the same method and endpoint, in recorded order.
+
+    Args:
+        path (str): The recording made by a RecordingTransport.
+        speed (float): How many times faster than recorded to replay response latencies and SSE chunks.
+            Defaults to 1.0, the original speed. Pass None to never wait.
+        **kwargs: Any other arguments accepted by Transport.
+        """
+
+        super().__init__(**kwargs)
+        self.path = path
+        self.speed = speed
+        self.__lock = threading.Lock()
+
+        # Exchanges in recorded order, queued by method and URL, and by method and endpoint
+        self.exchanges = self.load(path)
+        self.__by_url = collections.defaultdict(collections.deque)
+        self.__by_endpoint = collections.defaultdict(collections.deque)
+        for exchange in self.exchanges:
+            self.__by_url[(exchange["method"], exchange["url"])].append(exchange)
+            self.__by_endpoint[(exchange["method"], exchange["endpoint"])].append(exchange)
+
+    @staticmethod
+    def load(path: str) -> list:
+        """Load the exchanges of a recording, with their chunks. A recording cut off by a crash loads up to where it ends.
+
+    Args:
+        path (str): The recording.
+
+    Returns:
+        Exchanges (list): The exchange and error lines, in recorded order, each with a chunks list of (offset, data) pairs.
+        """
+
+        exchanges = {}
+        with gzip.open(path, "rt", encoding = static.Misc.text_encoding) as f:
+            try:
+                for text in f:
+                    try:
+                        line = json.loads(text)
+
+                    # A line cut off at the end of the file
+                    except ValueError:
+                        break
+
+                    if line["kind"] in ("exchange", "error"):
+                        line["chunks"] = []
+                        exchanges[line["id"]] = line
+                    elif line["kind"] == "chunk" and line["id"] in exchanges:
+                        exchanges[line["id"]]["chunks"].append((line["t"], _decode_body(line)))
+
+            # The file was not closed properly
+            except EOFError:
+                warnings.warn(f"Recording {path} ends early, replaying what it has")
+
+        return list(exchanges.values())
+
+    @property
+    def remaining(self):
+        """How many recorded exchanges have not been replayed yet"""
+        return sum(not exchange.get("used") for exchange in self.exchanges)
+
+    def __take(self, method: str, url: str, endpoint: str) -> dict:
+        """Take the next unused exchange matching a request.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The full URL with the query string.
+        endpoint (str): What the request is for.
+
+    Returns:
+        Exchange (dict): The recorded exchange.
+        """
+
+        with self.__lock:
+            for queue in (self.__by_url[(method, url)], self.__by_endpoint[(method, endpoint)]):
+                while queue:
+                    exchange = queue.popleft()
+                    if not exchange.get("used"):
+                        exchange["used"] = True
+                        return exchange
+
+        raise ValueError(f"No recorded exchange left for {method} {url} ({endpoint})")
+
+    def __wait(self, seconds: float):
+        """Wait for a recorded duration, adjusted for the replay speed"""
+        if self.speed and seconds > 0:
+            time.sleep(seconds / self.speed)
+
+    def _send(self, method: str, url: str, endpoint: str, **kwargs):
+        """Answer a request from the recording"""
+        prepared = requests.Request(method, url, params = kwargs.get("params"), data = kwargs.get("data"), json = kwargs.get("json")).prepare()
+        exchange = self.__take(method, _redact(prepared.url), endpoint)
+        self.__wait(exchange["elapsed"])
+
+        # The recorded request failed, so fail the same way
+        if exchange["kind"] == "error":
+            error = getattr(requests.exceptions, exchange["error"], requests.exceptions.ConnectionError)
+            raise error(exchange["message"])
+
+        response = requests.Response()
+        response.status_code = exchange["status"]
+        response.reason = exchange["reason"]
+        response.url = exchange["final_url"]
+        response.headers = requests.structures.CaseInsensitiveDict(exchange["headers"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.elapsed = datetime.timedelta(seconds = exchange["elapsed"])
+        response.request = prepared
+
+        if exchange["stream"]:
+            response.raw = _ReplayRaw(exchange["chunks"], self.speed)
+        else:
+            response._content = _decode_body(exchange)
+            response._content_consumed = True
+
+        return response
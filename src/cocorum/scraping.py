@@ -16,10 +16,11 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 S.D.G."""
 
-import requests
 import bs4
-from . import static
 from . import utils
+from . import profiling
+from .transport import get_default_transport
+from .config import get_default_config
 from .basehandles import *
 
 
@@ -47,6 +48,20 @@ class HTMLObj:
 
         return self._elem.attrs[key]
 
+    @property
+    def transport(self):
+        """The HTTP transport to use for any further requests about this object"""
+        if self.servicephp:
+            return self.servicephp.transport
+        return get_default_transport()
+
+    @property
+    def config(self):
+        """The settings to use for any further requests about this object"""
+        if self.servicephp:
+            return self.servicephp.config
+        return get_default_config()
+
 
 class HTMLUserBadge(HTMLObj, BaseUserBadge):
     """A user badge as extracted from a bs4 HTML element"""
@@ -71,7 +86,7 @@ class HTMLUserBadge(HTMLObj, BaseUserBadge):
     @property
     def icon_url(self):
         """The URL of the badge's icon"""
-        return static.URI.rumble_base + self["src"]
+        return self.config.rumble_base + self["src"]
 
 class HTMLComment(HTMLObj, BaseComment):
     """A comment on a video as returned by service.php comment.list"""
@@ -195,7 +210,7 @@ class HTMLPlaylist(HTMLObj, BasePlaylist):
     def _pagesoup(self):
         """The loaded page of the playlist"""
         if not self.__pagesoup:
-            self.__pagesoup = self.scraper.soup_request(self.url)
+            self.__pagesoup = self.scraper.soup_request(self.url, page_type="playlist")
 
         return self.__pagesoup
 
@@ -208,7 +223,7 @@ class HTMLPlaylist(HTMLObj, BasePlaylist):
     def thumbnail(self):
         """The playlist thumbnail as a binary string"""
         if not self.__thumbnail:  # We never queried the thumbnail before
-            response = requests.get(self.thumbnail_url, timeout=static.Delays.request_timeout)
+            response = self.transport.get(self.thumbnail_url, endpoint="image", timeout=self.config.request_timeout)
             assert response.status_code == 200, "Status code " + str(response.status_code)
 
             self.__thumbnail = response.content
@@ -223,7 +238,7 @@ class HTMLPlaylist(HTMLObj, BasePlaylist):
     @property
     def url(self):
         """The URL of the playlist page """
-        return static.URI.rumble_base + self._url_raw
+        return self.config.rumble_base + self._url_raw
 
     @property
     def playlist_id(self):
@@ -238,7 +253,7 @@ class HTMLPlaylist(HTMLObj, BasePlaylist):
     @property
     def channel_url(self):
         """The URL of the base user or channel the playlist under"""
-        return static.URI.rumble_base + self._channel_url_raw
+        return self.config.rumble_base + self._channel_url_raw
 
     @property
     def is_under_channel(self):
@@ -403,7 +418,7 @@ class HTMLVideo(HTMLObj):
     def thumbnail(self):
         """The video thumbnail as a binary string"""
         if not self.__thumbnail:  # We never queried the thumbnail before
-            response = requests.get(self.thumbnail_url, timeout=static.Delays.request_timeout)
+            response = self.transport.get(self.thumbnail_url, endpoint="image", timeout=self.config.request_timeout)
             assert response.status_code == 200, "Status code " + str(response.status_code)
 
             self.__thumbnail = response.content
@@ -413,7 +428,7 @@ class HTMLVideo(HTMLObj):
     @property
     def video_url(self):
         """The URL of the video's viewing page"""
-        return static.URI.rumble_base + self._elem.find("a", attrs={"class": "videostream__link link"}).get("href")
+        return self.config.rumble_base + self._elem.find("a", attrs={"class": "videostream__link link"}).get("href")
 
     @property
     def title(self):
@@ -429,14 +444,20 @@ class HTMLVideo(HTMLObj):
 class Scraper:
     """Scraper for general information"""
 
-    def __init__(self, servicephp):
+    def __init__(self, servicephp, transport = None, config = None):
         """Scraper for general information.
 
     Args:
         servicephp (ServicePHP): A ServicePHP instance, for authentication.
+        transport (Transport): The HTTP transport to make requests with.
+            Defaults to the one the ServicePHP instance uses, or the config's if one is given.
+        config (Config): Settings for timeouts, base URLs and headers.
+            Defaults to the one the ServicePHP instance uses.
         """
 
         self.servicephp = servicephp
+        self.config = config or self.servicephp.config
+        self.transport = transport or (config.transport if config else self.servicephp.transport)
 
     @property
     def session_cookie(self):
@@ -448,7 +469,7 @@ class Scraper:
         """Our username"""
         return self.servicephp.username
 
-    def soup_request(self, url: str, allow_soft_404: bool = False):
+    def soup_request(self, url: str, allow_soft_404: bool = False, page_type: str = "page"):
         """Make a GET request to a URL, and return HTML beautiful soup for
         scraping.
 
@@ -456,22 +477,26 @@ class Scraper:
         url (str): The URL to query.
         allow_soft_404 (bool): Treat a 404 as a success if text is returned.
             Defaults to False
+        page_type (str): What kind of page this is, to label the request metrics with.
+            Defaults to page.
 
     Returns:
         Soup (bs4.BeautifulSoup): The webpage at the URL, logged-in version.
         """
 
-        r = requests.get(
+        r = self.transport.get(
             url,
+            endpoint="scrape." + page_type,
             cookies=self.session_cookie,
-            timeout=static.Delays.request_timeout,
-            headers=static.RequestHeaders.user_agent,
+            timeout=self.config.request_timeout,
+            headers=self.config.headers,
             )
 
         assert r.status_code == 200 or (allow_soft_404 and r.status_code == 404 and r.text), \
             f"Fetching page {url} failed: {r}\n{r.text}"
 
-        return bs4.BeautifulSoup(r.text, features="html.parser")
+        with profiling.section(profiling.Points.soup_parse, url = url, page_type = page_type):
+            return bs4.BeautifulSoup(r.text, features="html.parser")
 
     def get_muted_user_record(self, username: str = None):
         """Get the record IDs for mutes.
@@ -494,7 +519,7 @@ class Scraper:
         # While there are more pages
         while True:
             # Get the next page of mutes and search for mute buttons
-            soup = self.soup_request(static.URI.mutes_page.format(page=pagenum))
+            soup = self.soup_request(self.config.mutes_page_url.format(page=pagenum), page_type="mutes")
             elems = soup.find_all("button", attrs={"class": "unmute_action button-small"})
 
             # We reached the last page
@@ -534,7 +559,7 @@ class Scraper:
             username = self.username
 
         # Get the page of channels and parse for them
-        soup = self.soup_request(static.URI.channels_page.format(username=username))
+        soup = self.soup_request(self.config.channels_page_url.format(username=username), page_type="channels")
         elems = soup.find_all("div", attrs={"data-type": "channel"})
         return [HTMLChannel(e) for e in elems]
 
@@ -563,7 +588,7 @@ class Scraper:
         uc = ("user", "c")[is_channel]
 
         # The base userpage URL currently has all their videos / livestreams on it
-        url_start = f"{static.URI.rumble_base}/{uc}/{username}"
+        url_start = f"{self.config.rumble_base}/{uc}/{username}"
 
         # Start the loop with:
         # no videos found yet
@@ -574,7 +599,7 @@ class Scraper:
         pagenum = 1
         while new_video_elems and (not max_num or len(videos) < max_num):
             # Get the next page of videos
-            soup = self.soup_request(f"{url_start}?page={pagenum}", allow_soft_404=True)
+            soup = self.soup_request(f"{url_start}?page={pagenum}", allow_soft_404=True, page_type="videos")
 
             # Search for video listings
             new_video_elems = soup.find_all("div", attrs={"class": "videostream thumbnail__grid--item"})
@@ -590,7 +615,7 @@ class Scraper:
 
     def get_playlists(self):
         """Get the playlists under the logged in user"""
-        soup = self.soup_request(static.URI.playlists_page)
+        soup = self.soup_request(self.config.playlists_page_url, page_type="playlists")
         return [HTMLPlaylist(elem, self) for elem in soup.find_all("div", attrs={"class": "playlist"})]
 
     def get_categories(self):
@@ -604,7 +629,7 @@ class Scraper:
         # See issue # 13
 
         print("Loading categories")
-        soup = self.soup_request(static.URI.uploadphp)
+        soup = self.soup_request(self.config.uploadphp_url, page_type="upload")
 
         options_box1 = soup.find("input", attrs={"id": "category_primary"}).parent
         options_elems1 = options_box1.find_all("div", attrs={"class": "select-option"})
@@ -15,11 +15,13 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 S.D.G."""
 
-import requests
 import bs4
 from . import scraping
 from . import static
 from . import utils
+from . import profiling
+from .transport import get_default_transport
+from .config import get_default_config
 from .basehandles import *
 from .jsonhandles import JSONObj
 
@@ -45,7 +47,7 @@ class APIUserBadge(JSONObj, BaseUserBadge):
     @property
     def icon_url(self):
         """The URL of the badge's icon"""
-        return static.URI.rumble_base + self["icons"][static.Misc.badge_icon_size]
+        return self.config.rumble_base + self["icons"][static.Misc.badge_icon_size]
 
 class APIComment(JSONObj, BaseComment):
     """A comment on a video as returned by a successful attempt to make it"""
@@ -186,7 +188,7 @@ class APIUser(JSONObj, BaseUser):
             return b''
 
         if not self.__picture: # We never queried the profile pic before
-            response = requests.get(self.picture_url, timeout = static.Delays.request_timeout)
+            response = self.servicephp.transport.get(self.picture_url, endpoint = "image", timeout = self.servicephp.config.request_timeout)
             assert response.status_code == 200, "Status code " + str(response.status_code)
 
             self.__picture = response.content
@@ -289,7 +291,7 @@ class APIPlaylist(JSONObj, BasePlaylist):
 
 class ServicePHP:
     """Interact with Rumble's service.php API"""
-    def __init__(self, username: str, password: str = None, session = None):
+    def __init__(self, username: str, password: str = None, session = None, transport = None, config = None):
         """Interact with Rumble's service.php API.
 
     Args:
@@ -298,11 +300,19 @@ class ServicePHP:
             Defaults to using the session token/cookie instead.
         session (str, dict): The session token or cookie dict to authenticate with.
             Defaults to using the password instead.
+        transport (Transport): The HTTP transport to make requests with.
+            Defaults to the config's transport if a config is given, otherwise the shared default transport.
+        config (Config): Settings for timeouts, base URLs and headers.
+            Defaults to the default config.
             """
 
         # Save the username
         self.username = username
 
+        # Our settings, and the pooled HTTP transport we make requests with
+        self.config = config or get_default_config()
+        self.transport = transport or (config.transport if config else get_default_transport())
+
         # Session is the token directly
         if isinstance(session, str):
             self.session_cookie = {static.Misc.session_token_key, session}
@@ -324,7 +334,7 @@ class ServicePHP:
         else:
             raise ValueError("Must pass either userame and password, or a session token")
 
-        assert utils.test_session_cookie(self.session_cookie), "Session cookie is invalid."
+        assert utils.test_session_cookie(self.session_cookie, self.transport, self.config), "Session cookie is invalid."
 
         # Stored ID of the logged in user
         self.__user_id = None
@@ -360,14 +370,15 @@ class ServicePHP:
         logged_in: The request should use the session cookie"""
         params = {"name" : service_name}
         params.update(additional_params)
-        r = requests.request(
+        r = self.transport.request(
                 method,
-                static.URI.servicephp,
+                self.config.servicephp_url,
+                endpoint = "servicephp." + service_name,
                 params = params,
                 data = data,
-                headers = static.RequestHeaders.user_agent,
+                headers = self.config.headers,
                 cookies = self.session_cookie if logged_in else None,
-                timeout = static.Delays.request_timeout,
+                timeout = self.config.request_timeout,
                 )
         assert r.status_code == 200, f"Service.PHP request for {service_name} failed: {r}\n{r.text}"
         # If the request json has a data -> success value, make sure it is True
@@ -501,7 +512,8 @@ class ServicePHP:
                 },
             method = "GET",
             )
-        soup = bs4.BeautifulSoup(r.json()["html"], features = "html.parser")
+        with profiling.section(profiling.Points.soup_parse, url = self.config.servicephp_url, page_type = "comment_list"):
+            soup = bs4.BeautifulSoup(r.json()["html"], features = "html.parser")
         comment_elems = soup.find_all(self._is_comment_elem)
         return [scraping.HTMLComment(e, self) for e in comment_elems]
 
@@ -604,7 +616,8 @@ class ServicePHP:
                 },
             method = "GET",
             )
-        soup = bs4.BeautifulSoup(r.json()["html"], features = "html.parser")
+        with profiling.section(profiling.Points.soup_parse, url = self.config.servicephp_url, page_type = "media_share"):
+            soup = bs4.BeautifulSoup(r.json()["html"], features = "html.parser")
         elem = soup.find("div", attrs = {"class" : "fb-share-button share-fb"})
         return elem.attrs["data-url"]
 
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Server-sent events
+
+A fast reader for server-sent event streams, such as the Rumble chat stream.
+It reads the response in large chunks, splits events on byte boundaries, and hands out the data of each as bytes, ready for a JSON decoder.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import requests
+import urllib3
+from . import static
+
+class Event:
+    """A server-sent event"""
+    def __init__(self, data: bytes, event: str = "message", event_id: str = None, retry: int = None):
+        """A server-sent event.
+
+    Args:
+        data (bytes): The event data, with the lines of multi-line data joined by newlines.
+        event (str): The event type.
+            Defaults to message.
+        event_id (str): The event ID.
+            Defaults to None, no ID.
+        retry (int): The reconnection time the server asked for, in milliseconds.
+            Defaults to None, not set.
+        """
+
+        self.data = data
+        self.event = event
+        self.event_id = event_id
+        self.retry = retry
+
+    def __repr__(self):
+        """The event in debugging form"""
+        return f"Event(data = {self.data!r}, event = {self.event!r}, event_id = {self.event_id!r}, retry = {self.retry!r})"
+
+def parse_event(block: bytes):
+    """Parse the lines of one server-sent event.
+
+    Args:
+        block (bytes): The event's lines, separated by single newlines, without the blank line that ended it.
+
+    Returns:
+        Event (Event, None): The event, or None if it had no data field and so is not dispatched.
+        """
+
+    # Most events are one data line, which needs no splitting
+    if block.startswith(b"data:") and b"\n" not in block:
+        data = block[5:]
+        return Event(data[1:] if data.startswith(b" ") else data)
+
+    data = []
+    event = Event(None)
+    for line in block.split(b"\n"):
+        # Blank lines and comments
+        if not line or line.startswith(b":"):
+            continue
+
+        field, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+
+        if field == b"data":
+            data.append(value)
+        elif field == b"event":
+            event.event = value.decode(static.Misc.text_encoding)
+        elif field == b"id":
+            event.event_id = value.decode(static.Misc.text_encoding)
+        elif field == b"retry" and value.isdigit():
+            event.retry = int(value)
+
+    # Events with no data are not dispatched
+    if not data:
+        return None
+
+    event.data = b"\n".join(data)
+    return event
+
+class SSEReader:
+    """Reads server-sent events from a streamed requests response"""
+    def __init__(self, response, chunk_size: int = 2 ** 16):
+        """Reads server-sent events from a streamed requests response.
+
+    Args:
+        response (requests.models.Response): The response, requested with stream = True.
+        chunk_size (int): The most bytes to read from the response at once.
+            Defaults to 64 KiB.
+        """
+
+        self.response = response
+        self.chunk_size = chunk_size
+
+    def chunks(self):
+        """Read the response body as it arrives.
+
+    Returns:
+        Chunks (generator): Yields each piece of the body as bytes.
+        """
+
+        raw = self.response.raw
+        try:
+            # A body without chunked encoding would block stream() until a whole chunk_size arrived,
+            # so take whatever is available instead
+            if getattr(raw, "chunked", True) is False and hasattr(raw, "read1"):
+                while data := raw.read1(self.chunk_size, decode_content = True):
+                    yield data
+            else:
+                yield from raw.stream(self.chunk_size, decode_content = True)
+
+        # Raise the same exceptions as iterating over the response would
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(e) from e
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e) from e
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e) from e
+
+    def events(self):
+        """Parse the events in the response body as it arrives.
+
+    Returns:
+        Events (generator): Yields each Event that has data.
+        """
+
+        pending = bytearray()
+        held = b""
+        for chunk in self.chunks():
+            if held:
+                chunk, held = held + chunk, b""
+
+            # Lines may end with CRLF or a lone CR as well as LF, so make them all LF.
+            # A CR at the very end might be the first half of a CRLF, so hold it back for the next chunk.
+            if b"\r" in chunk:
+                if chunk.endswith(b"\r"):
+                    chunk, held = chunk[:-1], b"\r"
+                chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+            # Events end with a blank line. Only search the new data for one, plus the last byte we had,
+            # so a large event arriving in many small pieces is not rescanned each time.
+            start = len(pending) - 1 if pending else 0
+            pending += chunk
+            if pending.find(b"\n\n", start) < 0:
+                continue
+
+            # The last piece has not ended yet
+            blocks = bytes(pending).split(b"\n\n")
+            pending = bytearray(blocks.pop())
+            for block in blocks:
+                event = parse_event(block)
+                if event:
+                    yield event
+
+        # The stream ended partway through an event
+        pending = (bytes(pending) + held).replace(b"\r\n", b"\n").replace(b"\r", b"\n").strip(b"\n")
+        if pending:
+            event = parse_event(pending)
+            if event:
+                yield event
+
+    def __iter__(self):
+        """Iterate over the events, see events()"""
+        return self.events()
+
+    def close(self):
+        """Close the response"""
+        self.response.close()
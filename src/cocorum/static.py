@@ -54,23 +54,48 @@ class URI:
     # Base URL to Rumble's website, for URLs that are relative to it
     rumble_base = "https://rumble.com"
 
+    # Base URL of the server hosting the chat API
+    chat_base = "https://web7.rumble.com"
+
+    # Base URL of the server hosting upload.php
+    upload_base = "https://web18.rumble.com"
+
+    class Paths:
+        """Paths of the URIs, relative to their base URL"""
+
+        # Relative to rumble_base
+        login_test = "/login.php"
+        mutes_page = "/account/moderation/muting?pg={page}"
+        channels_page = "/user/{username}/channels"
+        playlists_page = "/my-library/playlists"
+        servicephp = "/service.php"
+        chat_command = "/chat/command"
+
+        # Relative to upload_base
+        uploadphp = "/upload.php"
+
+        # Relative to chat_base, format with a stream_id_b10
+        chat_base = "/chat/api/chat/{stream_id_b10}"
+        chat_sse_stream = chat_base + "/stream"
+        chat_message = chat_base + "/message"
+
     # Test the session token by sending it here and checking the title
-    login_test = rumble_base + "/login.php"
+    login_test = rumble_base + Paths.login_test
 
     # Webpage with all the mutes on it, format with page number
-    mutes_page = rumble_base + "/account/moderation/muting?pg={page}"
+    mutes_page = rumble_base + Paths.mutes_page
 
     # Channels under a user, format with username
-    channels_page = rumble_base + "/user/{username}/channels"
+    channels_page = rumble_base + Paths.channels_page
 
     # The logged-in user's playlist page
-    playlists_page = rumble_base + "/my-library/playlists"
+    playlists_page = rumble_base + Paths.playlists_page
 
     # The Service.PHP API
-    servicephp = "https://rumble.com/service.php"
+    servicephp = rumble_base + Paths.servicephp
 
     # The video upload PHP
-    uploadphp = "https://web18.rumble.com/upload.php"
+    uploadphp = upload_base + Paths.uploadphp
 
     class ChatAPI:
         """URIs of the chat API"""
@@ -94,6 +119,9 @@ class Delays:
     # How long to wait before giving up on a network request, in seconds
     request_timeout = 20
 
+    # How long to wait before giving up on uploading one video chunk, in seconds
+    upload_timeout = 300
+
     # How long to reuse old data from the main API, in seconds
     api_refresh_default = 10
 
@@ -148,9 +176,12 @@ class Misc:
     # Size of chat badge icons to retrieve, only valid one has long been the string 48
     badge_icon_size = "48"
 
-    # Rumble timestamp format, not including the 6 TODO characters at the end
+    # Rumble timestamp format, not including the 6 character timezone offset at the end
     timestamp_format = "%Y-%m-%dT%H:%M:%S"
 
+    # How many parsed timestamps to keep cached
+    timestamp_cache_size = 4096
+
     # Key of the session token within the session cookie dict
     session_token_key = "u_s"
 
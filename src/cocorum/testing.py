@@ -0,0 +1,803 @@
+#!/usr/bin/env python3
+"""Testing
+
+A local stand-in server for every Rumble endpoint that Cocorum uses, driven by fixtures.
+Point a Config at it to run Cocorum offline, in CI, or under load.
+
+Example usage:
+```
+from cocorum import testing, chatapi
+
+with testing.StandInServer() as server:
+    chat = chatapi.ChatAPI(123, config = server.config())
+    server.push_chat_event(123, testing.chat_messages_event([testing.chat_message_json(1, 0, "Hello")]))
+    print(chat.get_message())
+```
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import html
+import http.server
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.parse
+from . import static
+from . import utils
+from .config import Config
+
+# Path of the Live Stream API on the stand-in server
+LIVESTREAM_API_PATH = "/-livestream-api/get-data/"
+
+# Timestamp used throughout the fixtures
+FIXTURE_TIMESTAMP = "2025-01-01T00:00:00+00:00"
+
+def livestream_json(index: int, num_messages: int = 0, num_rants: int = 0, is_live: bool = True) -> dict:
+    """Build the JSON block of one livestream, as the Live Stream API returns it.
+
+    Args:
+        index (int): Number of the livestream, used to make its ID and title.
+        num_messages (int): How many recent chat messages it has.
+            Defaults to 0.
+        num_rants (int): How many recent rants it has.
+            Defaults to 0.
+        is_live (bool): Is the livestream live?
+            Defaults to True.
+
+    Returns:
+        Livestream (dict): The JSON block.
+        """
+
+    messages = [
+        {"username": f"user{i}", "badges": {}, "text": f"Message {i}", "created_on": FIXTURE_TIMESTAMP}
+        for i in range(num_messages)
+        ]
+    rants = [
+        {"username": f"user{i}", "badges": {}, "text": f"Rant {i}", "created_on": FIXTURE_TIMESTAMP,
+            "expires_on": FIXTURE_TIMESTAMP, "amount_cents": 100, "amount_dollars": 1}
+        for i in range(num_rants)
+        ]
+
+    return {
+        "id": utils.base_10_to_36(100000 + index),
+        "title": f"Livestream {index}",
+        "created_on": FIXTURE_TIMESTAMP,
+        "is_live": is_live,
+        "visibility": "public",
+        "categories": {"primary": {"slug": "gaming", "title": "Gaming"}, "secondary": None},
+        "likes": 0,
+        "dislikes": 0,
+        "watching_now": 1,
+        "chat": {
+            "latest_message": messages[-1] if messages else None,
+            "recent_messages": messages,
+            "latest_rant": rants[-1] if rants else None,
+            "recent_rants": rants,
+            },
+        }
+
+def livestream_api_json(num_livestreams: int = 1, num_messages: int = 0, num_rants: int = 0) -> dict:
+    """Build a Live Stream API response.
+
+    Args:
+        num_livestreams (int): How many livestreams to include.
+            Defaults to 1.
+        num_messages (int): How many recent chat messages each livestream has.
+            Defaults to 0.
+        num_rants (int): How many recent rants each livestream has.
+            Defaults to 0.
+
+    Returns:
+        Response (dict): The response JSON, "now" is filled in when it is served.
+        """
+
+    return {
+        "now": 0,
+        "type": "user",
+        "user_id": "a1b2c",
+        "username": "standin",
+        "channel_id": None,
+        "channel_name": None,
+        "followers": {"num_followers": 0, "num_followers_total": 0, "latest_follower": None, "recent_followers": []},
+        "subscribers": {"num_subscribers": 0, "num_subscribers_total": 0, "latest_subscriber": None, "recent_subscribers": []},
+        "livestreams": [livestream_json(i, num_messages, num_rants) for i in range(num_livestreams)],
+        "latest_gifted_sub": None,
+        "recent_gifted_subs": [],
+        }
+
+def chat_user_json(user_id: int) -> dict:
+    """Build the JSON block of a chat user.
+
+    Args:
+        user_id (int): The numeric ID of the user in base 10.
+
+    Returns:
+        User (dict): The JSON block.
+        """
+
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "link": f"/user/user{user_id}",
+        "is_follower": False,
+        "image.1": None,
+        "color": "e8e8e8",
+        "badges": [],
+        }
+
+def chat_message_json(message_id: int, user_id: int, text: str = "Hello", channel_id: int = None) -> dict:
+    """Build the JSON block of a chat message.
+
+    Args:
+        message_id (int): The numeric ID of the message in base 10.
+        user_id (int): The numeric ID of the user who sent it in base 10.
+        text (str): The text of the message.
+            Defaults to "Hello".
+        channel_id (int): The numeric ID of the channel it was sent as.
+            Defaults to None, sent as the user.
+
+    Returns:
+        Message (dict): The JSON block.
+        """
+
+    message = {
+        "id": str(message_id),
+        "time": FIXTURE_TIMESTAMP,
+        "user_id": str(user_id),
+        "text": text,
+        "blocks": [{"type": "text.1", "data": {"text": text}}],
+        }
+    if channel_id is not None:
+        message["channel_id"] = channel_id
+
+    return message
+
+def chat_init_event(num_users: int = 0, num_messages: int = 0) -> dict:
+    """Build a chat init SSE event.
+
+    Args:
+        num_users (int): How many users are in the chat already.
+            Defaults to 0.
+        num_messages (int): How many messages were sent already, spread over the users.
+            Defaults to 0.
+
+    Returns:
+        Event (dict): The event JSON.
+        """
+
+    return {
+        "type": "init",
+        "data": {
+            "users": [chat_user_json(i) for i in range(num_users)],
+            "channels": [],
+            "messages": [chat_message_json(i, i % num_users, f"Message {i}") for i in range(num_messages)] if num_users else [],
+            "config": {
+                "badges": {},
+                "rants": {"enable": True},
+                "message_length_max": static.Message.max_len,
+                },
+            },
+        }
+
+def chat_messages_event(messages: list, users: list = None, channels: list = None) -> dict:
+    """Build a chat messages SSE event.
+
+    Args:
+        messages (list): JSON blocks of the messages, see chat_message_json().
+        users (list): JSON blocks of the users who sent them.
+            Defaults to building one for each user ID in the messages.
+        channels (list): JSON blocks of the channels they were sent as.
+            Defaults to none.
+
+    Returns:
+        Event (dict): The event JSON.
+        """
+
+    if users is None:
+        users = [chat_user_json(int(user_id)) for user_id in dict.fromkeys(message["user_id"] for message in messages)]
+
+    return {"type": "messages", "data": {"messages": messages, "users": users, "channels": channels or []}}
+
+class Fixtures:
+    """The data that the stand-in server serves. Change it at any time, even while the server runs."""
+    def __init__(self):
+        """The data that the stand-in server serves. Change it at any time, even while the server runs."""
+
+        # Live Stream API response, or a callable that returns one
+        self.livestream_api = livestream_api_json()
+
+        # Stream ID in base 10 : SSE events to send when a chat stream connects, defaults to an empty init event
+        self.chat_events = {}
+
+        # Service.PHP name : response JSON, or a callable taking (params, form) that returns one, overriding the built-in responses
+        self.servicephp = {}
+
+        # The account that can log in, any password is accepted
+        self.username = "standin"
+        self.user_id = 1000
+        self.session_token = "standin-session-token"
+
+        # Username : mute record ID
+        self.mutes = {}
+
+        # Channels under the account, as dicts with id, slug and title keys
+        self.channels = []
+
+        # Videos on every user and channel page, as dicts with id and title keys
+        self.videos = []
+
+        # Playlists of the account, as dicts with id, title, description and visibility keys
+        self.playlists = []
+
+        # Video ID in base 36 : comments, as dicts with id, username and text keys
+        self.comments = {}
+
+        # Upload categories, name : numeric ID
+        self.categories1 = {"Gaming": 1, "News": 2}
+        self.categories2 = {"Entertainment": 3, "Music": 4}
+
+        # Duration the server reports for any uploaded video, in seconds
+        self.video_duration = 60.0
+
+        # Status code for OPTIONS requests
+        self.options_status = 200
+
+class _ChatStream:
+    """The events of one chat SSE stream, with a condition to wait for new ones on"""
+    def __init__(self, events: list):
+        """The events of one chat SSE stream.
+
+    Args:
+        events (list): The events to start with.
+        """
+
+        self.events = list(events)
+        self.closed = False
+        self.condition = threading.Condition()
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Routes requests to the StandInServer that owns our HTTP server"""
+    protocol_version = "HTTP/1.1"
+
+    # Method, path pattern, name of the StandInServer method that serves it
+    routes = (
+        ("GET", re.compile(re.escape(LIVESTREAM_API_PATH) + "$"), "_serve_livestream_api"),
+        ("GET", re.compile(r"/chat/api/chat/(\d+)/stream$"), "_serve_chat_stream"),
+        ("POST", re.compile(r"/chat/api/chat/(\d+)/message$"), "_serve_chat_message"),
+        ("DELETE", re.compile(r"/chat/api/chat/(\d+)/message/(\d+)$"), "_serve_chat_delete"),
+        ("POST", re.compile(re.escape(static.URI.Paths.chat_command) + "$"), "_serve_chat_command"),
+        (None, re.compile(re.escape(static.URI.Paths.servicephp) + "$"), "_serve_servicephp"),
+        (None, re.compile(re.escape(static.URI.Paths.uploadphp) + "$"), "_serve_uploadphp"),
+        ("GET", re.compile(re.escape(static.URI.Paths.login_test) + "$"), "_serve_login_test"),
+        ("GET", re.compile(r"/account/moderation/muting$"), "_serve_mutes_page"),
+        ("GET", re.compile(r"/user/([^/]+)/channels$"), "_serve_channels_page"),
+        ("GET", re.compile(re.escape(static.URI.Paths.playlists_page) + "$"), "_serve_playlists_page"),
+        ("GET", re.compile(r"/playlists/([^/]+)$"), "_serve_playlist_page"),
+        ("GET", re.compile(r"/(?:user|c)/([^/]+)$"), "_serve_videos_page"),
+        )
+
+    def __route(self, method: str):
+        """Find the server method for a request and call it"""
+        parsed = urllib.parse.urlsplit(self.path)
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        standin = self.server.standin
+        standin._record(method, parsed.path, params, len(body))
+
+        if method == "OPTIONS":
+            self.send_response(standin.fixtures.options_status)
+            self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin", "*"))
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "content-type")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        for route_method, pattern, name in self.routes:
+            match = pattern.match(parsed.path)
+            if match and route_method in (None, method):
+                getattr(standin, name)(self, params, body, *match.groups())
+                return
+
+        standin._respond(self, 404, "Not found", "text/plain")
+
+    def do_GET(self):
+        self.__route("GET")
+
+    def do_POST(self):
+        self.__route("POST")
+
+    def do_PUT(self):
+        self.__route("PUT")
+
+    def do_DELETE(self):
+        self.__route("DELETE")
+
+    def do_OPTIONS(self):
+        self.__route("OPTIONS")
+
+    def log_message(self, format, *args):
+        """Do not log every request to stderr"""
+
+class _HTTPServer(http.server.ThreadingHTTPServer):
+    """Threading HTTP server that knows its StandInServer"""
+    daemon_threads = True
+
+    def __init__(self, address, standin):
+        """Threading HTTP server that knows its StandInServer.
+
+    Args:
+        address (tuple): Host and port to listen on.
+        standin (StandInServer): The stand-in server that serves the requests.
+        """
+
+        self.standin = standin
+        super().__init__(address, _Handler)
+
+class StandInServer:
+    """A local HTTP server that stands in for every Rumble endpoint Cocorum uses"""
+    def __init__(self, fixtures: Fixtures = None, host: str = "127.0.0.1", port: int = 0):
+        """A local HTTP server that stands in for every Rumble endpoint Cocorum uses.
+
+    Args:
+        fixtures (Fixtures): The data to serve.
+            Defaults to the default fixtures.
+        host (str): Address to listen on.
+            Defaults to 127.0.0.1.
+        port (int): Port to listen on.
+            Defaults to 0, any free port.
+        """
+
+        self.fixtures = fixtures or Fixtures()
+        self.host = host
+        self.port = port
+
+        # Every request served, as dicts with method, path, params and size keys
+        self.requests = []
+
+        # Uploaded files by server filename
+        self.uploads = {}
+
+        self.__httpd = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__chat_streams = {}
+        self.__ids = itertools.count(1000000)
+        self.__stopping = threading.Event()
+
+    def __enter__(self):
+        """Start the server for a with statement"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the server at the end of a with statement"""
+        self.stop()
+
+    def start(self):
+        """Start serving in a background thread"""
+        if self.__httpd:
+            return
+
+        self.__stopping.clear()
+        self.__httpd = _HTTPServer((self.host, self.port), self)
+        self.port = self.__httpd.server_address[1]
+        self.__thread = threading.Thread(target = self.__httpd.serve_forever, daemon = True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop serving, closing any open chat streams"""
+        if not self.__httpd:
+            return
+
+        self.__stopping.set()
+        with self.__lock:
+            streams = list(self.__chat_streams.values())
+        for stream in streams:
+            with stream.condition:
+                stream.condition.notify_all()
+
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
+        self.__httpd = None
+
+    @property
+    def base_url(self):
+        """The base URL of the server, for every Rumble host"""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_url(self):
+        """A Live Stream API URL on the server"""
+        return self.base_url + LIVESTREAM_API_PATH + "?key=standin"
+
+    def config(self, **kwargs) -> Config:
+        """Build a Config with every base URL pointing at the server.
+
+    Args:
+        **kwargs: Other Config settings.
+
+    Returns:
+        Config (Config): The config.
+        """
+
+        return Config(rumble_base = self.base_url, chat_base = self.base_url, upload_base = self.base_url, **kwargs)
+
+    def next_id(self) -> int:
+        """Get a new unique numeric ID, for messages, comments and uploads"""
+        with self.__lock:
+            return next(self.__ids)
+
+    def chat_stream(self, stream_id) -> _ChatStream:
+        """Get the events of a chat stream, creating it from the fixtures on first use.
+
+    Args:
+        stream_id (int, str): The stream ID in base 10 int or base 36 str.
+
+    Returns:
+        Stream (_ChatStream): The stream.
+        """
+
+        stream_id = utils.ensure_b10(stream_id)
+        with self.__lock:
+            stream = self.__chat_streams.get(stream_id)
+            if stream is None:
+                stream = _ChatStream(self.fixtures.chat_events.get(stream_id) or [chat_init_event()])
+                self.__chat_streams[stream_id] = stream
+
+        return stream
+
+    def push_chat_event(self, stream_id, event: dict):
+        """Send an SSE event to every client of a chat stream, and to clients that connect later.
+
+    Args:
+        stream_id (int, str): The stream ID in base 10 int or base 36 str.
+        event (dict): The event JSON, see chat_messages_event().
+        """
+
+        stream = self.chat_stream(stream_id)
+        with stream.condition:
+            stream.events.append(event)
+            stream.condition.notify_all()
+
+    def close_chat(self, stream_id):
+        """End a chat stream after its remaining events are sent.
+
+    Args:
+        stream_id (int, str): The stream ID in base 10 int or base 36 str.
+        """
+
+        stream = self.chat_stream(stream_id)
+        with stream.condition:
+            stream.closed = True
+            stream.condition.notify_all()
+
+    def _record(self, method: str, path: str, params: dict, size: int):
+        """Log a request"""
+        with self.__lock:
+            self.requests.append({"method": method, "path": path, "params": params, "size": size})
+
+    def _respond(self, handler, status: int, body, content_type: str = "application/json"):
+        """Send a complete response.
+
+    Args:
+        handler (_Handler): The request handler.
+        status (int): The HTTP status code.
+        body (str, bytes, dict, list): The body, dicts and lists are sent as JSON.
+        content_type (str): The content type of a str or bytes body.
+            Defaults to application/json.
+        """
+
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+            content_type = "application/json"
+        if isinstance(body, str):
+            body = body.encode(static.Misc.text_encoding)
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _respond_page(self, handler, body: str, status: int = 200):
+        """Send an HTML page.
+
+    Args:
+        handler (_Handler): The request handler.
+        body (str): The inside of the page body.
+        status (int): The HTTP status code.
+            Defaults to 200.
+        """
+
+        self._respond(handler, status, f"<html><head><title>Rumble</title></head><body>{body}</body></html>", "text/html")
+
+    def _serve_livestream_api(self, handler, params, body):
+        """Serve the Live Stream API"""
+        data = self.fixtures.livestream_api
+        if callable(data):
+            data = data()
+        self._respond(handler, 200, dict(data, now = int(time.time())))
+
+    def _serve_chat_stream(self, handler, params, body, stream_id):
+        """Serve a chat SSE stream, until it is closed or the server stops"""
+        stream = self.chat_stream(int(stream_id))
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+
+        # Chunked like Rumble's, so clients get each event as soon as it is written
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        handler.close_connection = True
+
+        sent = 0
+        try:
+            while True:
+                with stream.condition:
+                    stream.condition.wait_for(lambda: sent < len(stream.events) or stream.closed or self.__stopping.is_set())
+                    pending = stream.events[sent:]
+                    closed = stream.closed or self.__stopping.is_set()
+
+                for event in pending:
+                    data = b"data: " + json.dumps(event).encode(static.Misc.text_encoding) + b"\n\n"
+                    handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                handler.wfile.flush()
+                sent += len(pending)
+
+                if closed:
+                    handler.wfile.write(b"0\r\n\r\n")
+                    return
+
+        # The client went away
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _serve_chat_message(self, handler, params, body, stream_id):
+        """Post a chat message, echoing it to the chat stream like Rumble does"""
+        data = json.loads(body)["data"]
+        user = chat_user_json(self.fixtures.user_id)
+        user["username"] = self.fixtures.username
+        message = chat_message_json(self.next_id(), self.fixtures.user_id, data["message"]["text"], data.get("channel_id"))
+        self.push_chat_event(int(stream_id), chat_messages_event([message], [user]))
+        self._respond(handler, 200, {"data": {"id": message["id"], "user": user}})
+
+    def _serve_chat_delete(self, handler, params, body, stream_id, message_id):
+        """Delete a chat message, announcing it on the chat stream"""
+        self.push_chat_event(int(stream_id), {"type": "delete_messages", "data": {"message_ids": [int(message_id)]}})
+        self._respond(handler, 200, {"data": {"success": True}})
+
+    def _serve_chat_command(self, handler, params, body):
+        """Run a chat command, which always succeeds"""
+        self._respond(handler, 200, {"data": {"success": True}})
+
+    def _serve_login_test(self, handler, params, body):
+        """Serve the login test page, logged in if the session cookie is right"""
+        cookies = handler.headers.get("Cookie", "")
+        logged_in = f"{static.Misc.session_token_key}={self.fixtures.session_token}" in cookies
+        title = "Rumble" if logged_in else "Login"
+        self._respond(handler, 200, f"<html><head><title>{title}</title></head><body></body></html>", "text/html")
+
+    def _serve_mutes_page(self, handler, params, body):
+        """Serve the mutes page, with every mute on the first page"""
+        buttons = ""
+        if params.get("pg", "1") == "1":
+            buttons = "".join(
+                f'<button class="unmute_action button-small" data-username="{html.escape(username)}" data-record-id="{record_id}">Unmute</button>'
+                for username, record_id in self.fixtures.mutes.items()
+                )
+        self._respond_page(handler, buttons)
+
+    def _serve_channels_page(self, handler, params, body, username):
+        """Serve the channels page of a user"""
+        self._respond_page(handler, "".join(
+            f'<div data-type="channel" data-id="{channel["id"]}" data-slug="{html.escape(channel["slug"])}" data-title="{html.escape(channel["title"])}"></div>'
+            for channel in self.fixtures.channels
+            ))
+
+    def _serve_videos_page(self, handler, params, body, username):
+        """Serve the videos of a user or channel, all on the first page, later pages are soft 404s"""
+        if params.get("page", "1") != "1":
+            self._respond_page(handler, "<h1>No more videos</h1>", 404)
+            return
+
+        self._respond_page(handler, "".join(
+            f'<div class="videostream thumbnail__grid--item" data-video-id="{video["id"]}">'
+            f'<img class="thumbnail__image" src="{self.base_url}/thumbnails/{video["id"]}.jpg">'
+            f'<a class="videostream__link link" href="/v{utils.base_10_to_36(video["id"])}-video.html"></a>'
+            f'<h3 class="thumbnail__title" title="{html.escape(video["title"])}">{html.escape(video["title"])}</h3>'
+            f'<time class="videostream__data--subitem videostream__time" datetime="{FIXTURE_TIMESTAMP}"></time>'
+            '</div>'
+            for video in self.fixtures.videos
+            ))
+
+    def _serve_playlists_page(self, handler, params, body):
+        """Serve the playlists page of the account"""
+        self._respond_page(handler, "".join(
+            '<div class="playlist">'
+            f'<img class="thumbnail__image" src="{self.base_url}/thumbnails/{playlist["id"]}.jpg">'
+            f'<a class="playlist__name link" href="/playlists/{playlist["id"]}"></a>'
+            f'<a class="channel__link link" href="/user/{html.escape(self.fixtures.username)}"></a>'
+            '</div>'
+            for playlist in self.fixtures.playlists
+            ))
+
+    def _serve_playlist_page(self, handler, params, body, playlist_id):
+        """Serve the page of one playlist"""
+        for playlist in self.fixtures.playlists:
+            if str(playlist["id"]) == playlist_id:
+                self._respond_page(handler,
+                    f'<h1 class="playlist-control-panel__playlist-name">{html.escape(playlist["title"])}</h1>'
+                    f'<div class="playlist-control-panel__description">{html.escape(playlist["description"])}</div>'
+                    f'<span class="playlist-control-panel__visibility-state">{html.escape(playlist["visibility"])}</span>'
+                    )
+                return
+
+        self._respond_page(handler, "<h1>Not found</h1>", 404)
+
+    def _serve_servicephp(self, handler, params, body):
+        """Serve service.php, from the fixtures or the built-in responses"""
+        name = params.get("name", "")
+        form = {key: values[-1] for key, values in urllib.parse.parse_qs(body.decode(static.Misc.text_encoding, errors = "replace")).items()}
+
+        response = self.fixtures.servicephp.get(name)
+        if callable(response):
+            response = response(params, form)
+        elif response is None:
+            builtin = getattr(self, "_sphp_" + name.replace(".", "_"), None)
+            response = builtin(params, form) if builtin else {"data": {"success": True}}
+
+        self._respond(handler, 200, response)
+
+    def _sphp_user_get_salts(self, params, form):
+        """Salts to hash the password with"""
+        return {"data": {"salts": ["standin-salt-1", "standin-salt-2", "standin-salt-3"]}}
+
+    def _sphp_user_login(self, params, form):
+        """Log in, accepting any password"""
+        return {"data": {"session": self.fixtures.session_token}}
+
+    def _sphp_user_has_unread_notifications(self, params, form):
+        """The logged in user's ID, which is all Cocorum reads from this"""
+        return {"user": {"id": "_" + utils.base_10_to_36(self.fixtures.user_id)}, "data": {"has_unread": False}}
+
+    def _sphp_chat_message_pin(self, params, form):
+        """Pin a chat message, announcing it on the chat stream"""
+        message_id = int(form["message_id"])
+        stream = self.chat_stream(int(form["video_id"]))
+        with stream.condition:
+            known = [message for event in stream.events for message in event["data"].get("messages", ()) if int(message["id"]) == message_id]
+
+        self.push_chat_event(int(form["video_id"]), {"type": "pin_message", "data": {"message": known[-1] if known else chat_message_json(message_id, self.fixtures.user_id)}})
+        return {"data": {"success": True}}
+
+    def _sphp_comment_list(self, params, form):
+        """The comments under a video, as HTML"""
+        video_id = params["video"]
+        items = "".join(
+            f'<li class="comment-item{" comment-item-first" * (i == 0)}" data-comment-id="{comment["id"]}" data-username="{html.escape(comment["username"])}"'
+            f' data-entity-type="user" data-video-fid="{utils.base_36_to_10(video_id)}" data-actions="pin,delete">'
+            f'<p class="comment-text">{html.escape(comment["text"])}</p>'
+            f'<div class="rumbles-vote" data-type="2" data-id="{comment["id"]}"><span class="rumbles-count">0</span></div>'
+            '</li>'
+            for i, comment in enumerate(self.fixtures.comments.get(video_id, ()))
+            )
+        return {"html": f"<ul>{items}</ul>"}
+
+    def _sphp_comment_add(self, params, form):
+        """Post a comment, adding it to the fixtures"""
+        comment_id = self.next_id()
+        self.fixtures.comments.setdefault(utils.base_10_to_36(int(form["video"])), []).append(
+            {"id": comment_id, "username": self.fixtures.username, "text": form.get("comment", "")}
+            )
+        return {"data": {
+            "comment_id": comment_id,
+            "comment_text": form.get("comment", ""),
+            "comment_user_display": self.fixtures.username,
+            "comment_tree_size": 0,
+            }}
+
+    def _sphp_comment_restore(self, params, form):
+        """Restore a comment"""
+        return {"data": {"comment_id": int(form["comment_id"]), "comment_text": "", "comment_user_display": self.fixtures.username, "comment_tree_size": 0}}
+
+    def _sphp_user_rumbles(self, params, form):
+        """Vote on content"""
+        vote = int(form.get("vote", 0))
+        return {"data": {"num_votes_up": max(vote, 0), "num_votes_down": max(-vote, 0), "score": vote, "votes": abs(vote),
+            "content_type": int(form.get("type", 1)), "content_id": int(form.get("id", 0))}}
+
+    def _sphp_media_share(self, params, form):
+        """The share box of a video, as HTML"""
+        return {"html": f'<div class="fb-share-button share-fb" data-url="{self.base_url}/v{params["video"]}-video.html"></div>'}
+
+    def __playlist_json(self, form, playlist_id):
+        """Build the response JSON of a playlist"""
+        return {"data": {
+            "id": playlist_id,
+            "title": form.get("title", ""),
+            "description": form.get("description", ""),
+            "visibility": form.get("visibility", "public"),
+            "url": f"{self.base_url}/playlists/{playlist_id}",
+            "channel": form.get("channel_id"),
+            "created_on": FIXTURE_TIMESTAMP,
+            "updated_on": FIXTURE_TIMESTAMP,
+            "permissions": {},
+            "num_items": 0,
+            "is_following": False,
+            "items": [],
+            "extra": None,
+            "user": {"id": self.fixtures.user_id, "username": self.fixtures.username, "picture": "", "verified_badge": False, "followers": 0, "followed": False},
+            }}
+
+    def _sphp_playlist_add(self, params, form):
+        """Create a playlist"""
+        return self.__playlist_json(form, utils.base_10_to_36(self.next_id()))
+
+    def _sphp_playlist_edit(self, params, form):
+        """Edit a playlist"""
+        return self.__playlist_json(form, form.get("playlist_id", ""))
+
+    def _serve_uploadphp(self, handler, params, body):
+        """Serve upload.php: the upload page, chunks, merging, durations, thumbnails and publishing"""
+        # The upload page, scraped for categories
+        if handler.command == "GET":
+            options1 = "".join(f'<div class="select-option" data-value="{value}">{html.escape(name)}</div>' for name, value in self.fixtures.categories1.items())
+            options2 = "".join(f'<div class="select-option" data-value="{value}">{html.escape(name)}</div>' for name, value in self.fixtures.categories2.items())
+            self._respond_page(handler, f'<div><input id="category_primary">{options1}</div><div><input id="category_secondary">{options2}</div>')
+            return
+
+        # Publish the uploaded video
+        if "form" in params:
+            form = {key: values[-1] for key, values in urllib.parse.parse_qs(body.decode(static.Misc.text_encoding, errors = "replace")).items()}
+            video_id = self.next_id()
+            url = f"{self.base_url}/v{utils.base_10_to_36(video_id)}-video.html"
+            data = {"url": url, "fid": video_id, "title": form.get("title", ""), "embed": f'<iframe src="{url}"></iframe>', "embedMonetize": ""}
+            self._respond(handler, 200, f"<script>window.parent.upload_complete({json.dumps(data)});</script>", "text/html")
+            return
+
+        # A chunk of a video
+        if "chunk" in params and "merge" not in params:
+            self.uploads[params["chunk"]] = body
+            self._respond(handler, 200, params["chunk"], "text/plain")
+            return
+
+        # Merge the chunks of a video
+        if "merge" in params:
+            upload_id = params["chunk"].rsplit(".", 1)[0]
+            self.uploads[params["chunk"]] = b"".join(self.uploads.pop(f"{i}_{upload_id}.mp4", b"") for i in range(int(params["merge"]) + 1))
+            self._respond(handler, 200, params["chunk"], "text/plain")
+            return
+
+        if "duration" in params:
+            self._respond(handler, 200, str(self.fixtures.video_duration), "text/plain")
+            return
+
+        if "thumbnails" in params:
+            self._respond(handler, 200, {str(i): f"{self.base_url}/thumbnails/{params['thumbnails']}.{i}.jpg" for i in range(3)})
+            return
+
+        # A custom thumbnail
+        if "cthumb" in params:
+            self.uploads[params["cthumb"]] = body
+            self._respond(handler, 200, params["cthumb"], "text/plain")
+            return
+
+        # A whole video in one request
+        filename = f"{self.next_id()}.mp4"
+        self.uploads[filename] = body
+        self._respond(handler, 200, filename, "text/plain")
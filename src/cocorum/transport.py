@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""HTTP transport
+
+A shared, pooled HTTP transport for all of Cocorum's network requests.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import http.cookiejar
+import threading
+import time
+import requests
+import requests.adapters
+from .metrics import get_default_registry
+
+class _NoStoredCookiesPolicy(http.cookiejar.DefaultCookiePolicy):
+    """Cookie policy that never stores cookies set by a response.
+    This keeps one login's cookies from leaking into another's requests over a shared transport."""
+    def set_ok(self, cookie, request):
+        """Refuse to store any cookie from a response"""
+        return False
+
+class Transport:
+    """Pooled HTTP transport with keep-alive connections, shared between Cocorum clients"""
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, host_pool_sizes: dict = None, headers: dict = None, cookies: dict = None, retries = 0, metrics = None):
+        """Pooled HTTP transport with keep-alive connections, shared between Cocorum clients.
+
+    Args:
+        pool_connections (int): How many hosts to keep connection pools for.
+            Defaults to 10.
+        pool_maxsize (int): How many connections to keep alive per host.
+            Defaults to 10.
+        host_pool_sizes (dict): URL prefix : pool size pairs, for hosts that need a different pool size.
+            Defaults to no per-host sizes.
+        headers (dict): Headers to send with every request. Per-request headers override these.
+            Defaults to the requests library defaults.
+        cookies (dict): Cookies to send with every request. Per-request cookies override these.
+            Defaults to no cookies.
+        retries (int, urllib3.util.Retry): How to retry failed requests, passed to each connection pool.
+            Defaults to 0, no retries.
+        metrics (MetricsRegistry): Where to record request counts, latencies, bytes and retries.
+            Defaults to the shared default registry.
+        """
+
+        self.metrics = metrics or get_default_registry()
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+
+        self.session = requests.Session()
+        self.session.cookies.set_policy(_NoStoredCookiesPolicy())
+
+        if headers:
+            self.session.headers.update(headers)
+
+        if cookies:
+            for name, value in cookies.items():
+                self.session.cookies.set(name, value)
+
+        # Replace the default adapters so they use our pool sizes
+        for prefix in ("https://", "http://"):
+            self.session.mount(prefix, self._new_adapter(pool_maxsize))
+
+        for prefix, size in (host_pool_sizes or {}).items():
+            self.set_host_pool_size(prefix, size)
+
+    def _new_adapter(self, pool_maxsize: int):
+        """Create a connection pooling adapter.
+
+    Args:
+        pool_maxsize (int): How many connections to keep alive per host.
+
+    Returns:
+        Adapter (requests.adapters.HTTPAdapter): The new adapter.
+        """
+
+        return requests.adapters.HTTPAdapter(
+            pool_connections = self.pool_connections,
+            pool_maxsize = pool_maxsize,
+            max_retries = self.retries,
+            )
+
+    def set_host_pool_size(self, prefix: str, size: int):
+        """Set how many connections to keep alive for one host.
+
+    Args:
+        prefix (str): The URL prefix of the host, e.g. https://web7.rumble.com
+        size (int): How many connections to keep alive for it.
+        """
+
+        self.session.mount(prefix, self._new_adapter(size))
+
+    @property
+    def headers(self):
+        """The headers sent with every request"""
+        return self.session.headers
+
+    @property
+    def cookies(self):
+        """The cookies sent with every request"""
+        return self.session.cookies
+
+    def request(self, method: str, url: str, endpoint: str = "other", **kwargs):
+        """Make an HTTP request over the pooled connections, recording its metrics.
+
+    Args:
+        method (str): The HTTP method to use.
+        url (str): The URL to request.
+        endpoint (str): What the request is for, to label its metrics with, e.g. servicephp.chat.message.list
+            Defaults to other.
+        **kwargs: Any other arguments accepted by requests.Session.request().
+
+    Returns:
+        Response (requests.models.Response): The response from the request.
+        """
+
+        start = time.perf_counter()
+        try:
+            response = self._send(method, url, endpoint, **kwargs)
+
+        except Exception as e:
+            self.metrics.counter("http_errors", endpoint = endpoint, method = method, error = type(e).__name__).inc()
+            raise
+
+        finally:
+            self.metrics.histogram("http_latency_seconds", endpoint = endpoint).observe(time.perf_counter() - start)
+
+        self.record_response(response, endpoint)
+        return response
+
+    def _send(self, method: str, url: str, endpoint: str, **kwargs):
+        """Actually make a request, without recording metrics. Subclasses can override this to change where responses come from.
+
+    Args:
+        method (str): The HTTP method to use.
+        url (str): The URL to request.
+        endpoint (str): What the request is for.
+        **kwargs: Any other arguments accepted by requests.Session.request().
+
+    Returns:
+        Response (requests.models.Response): The response from the request.
+        """
+
+        return self.session.request(method, url, **kwargs)
+
+    def record_response(self, response, endpoint: str):
+        """Record the status, bytes and retries of a response.
+    The body size is only counted if it was already read, streamed bodies are left alone.
+
+    Args:
+        response (requests.models.Response): The response.
+        endpoint (str): What the request was for.
+        """
+
+        method = response.request.method
+        self.metrics.counter("http_requests", endpoint = endpoint, method = method, status = response.status_code).inc()
+
+        body = response.request.body
+        if isinstance(body, (bytes, str)):
+            self.metrics.counter("http_sent_bytes", endpoint = endpoint).inc(len(body))
+
+        # requests sets _content once the body has been read
+        if response._content:
+            self.metrics.counter("http_received_bytes", endpoint = endpoint).inc(len(response._content))
+
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            self.metrics.counter("http_retries", endpoint = endpoint).inc(len(retries.history))
+
+    def get(self, url: str, **kwargs):
+        """Make a GET request, see request()"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """Make a POST request, see request()"""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        """Make a PUT request, see request()"""
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        """Make a DELETE request, see request()"""
+        return self.request("DELETE", url, **kwargs)
+
+    def options(self, url: str, **kwargs):
+        """Make an OPTIONS request, see request()"""
+        return self.request("OPTIONS", url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+def get_default_transport() -> Transport:
+    """Get the transport shared by every client that was not given its own.
+
+    Returns:
+        Transport (Transport): The default transport, created on first use.
+        """
+
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+
+        return _default_transport
+
+def set_default_transport(transport: Transport):
+    """Replace the transport shared by every client that was not given its own.
+    Clients that already exist keep the transport they were created with.
+
+    Args:
+        transport (Transport): The new default transport.
+        """
+
+    global _default_transport
+    with _default_lock:
+        _default_transport = transport
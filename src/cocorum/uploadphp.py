@@ -19,12 +19,12 @@ import mimetypes
 import os
 import random
 import time
-import requests
-import json5 as json
 from .jsonhandles import JSONObj
 from . import scraping
 from . import static
 from . import utils
+from . import profiling
+from .decoding import get_default_decoder
 
 class UploadResponse(JSONObj):
     """Response to a successful video upload"""
@@ -65,17 +65,26 @@ class UploadResponse(JSONObj):
 
 class UploadPHP:
     """Upload videos to Rumble"""
-    def __init__(self, servicephp):
+    def __init__(self, servicephp, transport = None, decoder = None, config = None):
         """Upload videos to Rumble.
 
     Args:
         servicephp (ServicePHP): ServicePHP object, for authentication.
+        transport (Transport): The HTTP transport to make requests with.
+            Defaults to the one the ServicePHP object uses, or the config's if one is given.
+        decoder (decoding.Decoder): The JSON decoder for responses.
+            Defaults to the shared default decoder.
+        config (Config): Settings for timeouts, chunk size, base URLs and headers.
+            Defaults to the one the ServicePHP object uses.
         """
 
         self.servicephp = servicephp
+        self.config = config or self.servicephp.config
+        self.transport = transport or (config.transport if config else self.servicephp.transport)
+        self.decoder = decoder or get_default_decoder()
 
         # Create a scraper to get some extra data we need
-        self.scraper = scraping.Scraper(self.servicephp)
+        self.scraper = scraping.Scraper(self.servicephp, self.transport, self.config)
 
         # Get list of channels we could use
         self.channels = self.scraper.get_channels()
@@ -92,7 +101,7 @@ class UploadPHP:
         """Our Rumble session cookie to authenticate requests"""
         return self.servicephp.session_cookie
 
-    def uphp_request(self, additional_params: dict, method = "PUT", data: dict = None, timeout = static.Delays.request_timeout):
+    def uphp_request(self, additional_params: dict, method = "PUT", data: dict = None, timeout = None):
         """Make a request to Upload.PHP with common settings.
 
     Args:
@@ -102,7 +111,7 @@ class UploadPHP:
         data (dict): Form data for the request.
             Defaults to None.
         timeout (int, float): Request timeout.
-            Defaults to static.Delays.request_timeout
+            Defaults to the config's request_timeout.
 
     Returns:
         Response (requests.models.Response): The response from the request.
@@ -110,14 +119,15 @@ class UploadPHP:
 
         params = {"api": static.Upload.api_ver}
         params.update(additional_params)
-        r = requests.request(
+        r = self.transport.request(
                 method,
-                static.URI.uploadphp,
+                self.config.uploadphp_url,
+                endpoint = "uploadphp",
                 params = params,
                 data = data,
-                headers = static.RequestHeaders.user_agent,
+                headers = self.config.headers,
                 cookies = self.session_cookie,
-                timeout = timeout,
+                timeout = timeout or self.config.request_timeout,
                 )
         assert r.status_code == 200, f"Upload.PHP request failed: {r}\n{r.text}"
         # If the request json has a data -> success value, make sure it is True
@@ -160,7 +170,7 @@ class UploadPHP:
 
         # Base upload params
         upload_params = {
-            "chunkSz": static.Upload.chunksz,
+            "chunkSz": self.config.upload_chunk_size,
             "chunkQty": self.__cur_num_chunks,
             }
 
@@ -175,13 +185,18 @@ class UploadPHP:
 
                 # Get permission to upload the chunk
                 assert utils.options_check(
-                    static.URI.uploadphp,
+                    self.config.uploadphp_url,
                     "PUT",
+                    origin = self.config.rumble_base,
                     cookies = self.session_cookie,
                     params = chunk_params,
+                    transport = self.transport,
+                    config = self.config,
                     ), f"Chunk {i} upload failed at OPTIONS request."
                 # Upload the chunk
-                self.uphp_request(chunk_params, data = f.read(static.Upload.chunksz), timeout = 300) # Set static? TODO
+                data = f.read(self.config.upload_chunk_size)
+                with profiling.section(profiling.Points.upload_chunk, chunk = i, chunks = self.__cur_num_chunks, size = len(data)):
+                    self.uphp_request(chunk_params, data = data, timeout = self.config.upload_timeout)
 
         # Params for the merge request
         merge_params = upload_params.copy()
@@ -212,13 +227,16 @@ class UploadPHP:
         with open(file_path, "rb") as f:
             # Get permission to upload the file
             assert utils.options_check(
-                static.URI.uploadphp,
+                self.config.uploadphp_url,
                 "PUT",
+                origin = self.config.rumble_base,
                 cookies = self.session_cookie,
                 params = {"api": static.Upload.api_ver},
+                transport = self.transport,
+                config = self.config,
                 ), "File upload failed at OPTIONS request."
             # Upload the file
-            r = self.uphp_request({}, data = f.read(), timeout = 300) # Set static? TODO
+            r = self.uphp_request({}, data = f.read(), timeout = self.config.upload_timeout)
 
         uploaded_fn = r.text
         print("Video file on server is", uploaded_fn)
@@ -294,9 +312,9 @@ class UploadPHP:
         self.__cur_upload_id = f"{start_time}-{random.randrange(1000000) :06}"
 
         # Is the file large enough that it needs to be chunked
-        if self.__cur_file_size > static.Upload.chunksz:
+        if self.__cur_file_size > self.config.upload_chunk_size:
             # Number of chunks we will need to do, rounded up
-            self.__cur_num_chunks = self.__cur_file_size // static.Upload.chunksz + 1
+            self.__cur_num_chunks = self.__cur_file_size // self.config.upload_chunk_size + 1
             server_filename = self._chunked_vidfile_upload(file_path)
         else:
             server_filename = self._unchunked_vidfile_upload(file_path)
@@ -391,4 +409,4 @@ class UploadPHP:
             )
 
         # Extract the json from the response HTML, and return it as an JSONObj derivative
-        return UploadResponse(json.loads(r.text[r.text.find("{") : r.text.rfind("}") + 1]))
+        return UploadResponse(self.decoder.loads(r.text[r.text.find("{") : r.text.rfind("}") + 1]))
@@ -17,11 +17,15 @@ S.D.G."""
 
 import base64
 import calendar
+import datetime
+import functools
 import hashlib
+import sys
 import time
 import uuid
-import requests
 from . import static
+from .transport import get_default_transport
+from .config import get_default_config
 
 class MD5Ex:
     """MD5 extended hashing utilities"""
@@ -68,18 +72,51 @@ class MD5Ex:
 
         return current
 
+@functools.lru_cache(maxsize = static.Misc.timestamp_cache_size)
 def parse_timestamp(timestamp: str) -> float:
-    """Parse a Rumble timestamp.
+    """Parse a Rumble timestamp, applying its timezone offset.
+    Results are cached, since the same timestamps are parsed again and again.
 
     Args:
-        timestamp (str): Timestamp in Rumble's API format.
+        timestamp (str): Timestamp in Rumble's API format, e.g. 2025-01-31T23:59:59+00:00
 
     Returns:
         Timestamp (float): The same timestamp value, in seconds since Epoch, UTC.
         """
 
-    # Trims off the 6 TODO characters at the end
-    return calendar.timegm(time.strptime(timestamp[:-6], static.Misc.timestamp_format))
+    # Fast path for Rumble's fixed format, sliced directly instead of going through strptime
+    if len(timestamp) == 25 and timestamp[19] in "+-" and timestamp[10] == "T":
+        seconds = calendar.timegm((
+            int(timestamp[0:4]),
+            int(timestamp[5:7]),
+            int(timestamp[8:10]),
+            int(timestamp[11:13]),
+            int(timestamp[14:16]),
+            int(timestamp[17:19]),
+            ))
+        offset = int(timestamp[20:22]) * 3600 + int(timestamp[23:25]) * 60
+        return seconds - offset if timestamp[19] == "+" else seconds + offset
+
+    # Anything else ISO 8601, assumed UTC if it has no offset
+    parsed = datetime.datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo = datetime.timezone.utc)
+    return parsed.timestamp()
+
+def parse_timestamps(timestamps) -> list:
+    """Parse many Rumble timestamps at once.
+
+    Args:
+        timestamps (Iterable): Timestamps in Rumble's API format.
+
+    Returns:
+        Timestamps (list): The same timestamp values in the same order, in seconds since Epoch, UTC.
+        """
+
+    # Parse each distinct timestamp only once
+    timestamps = list(timestamps)
+    parsed = {timestamp : parse_timestamp(timestamp) for timestamp in set(timestamps)}
+    return [parsed[timestamp] for timestamp in timestamps]
 
 def form_timestamp(seconds: float, suffix = "+00:00") -> str:
     """Form a Rumble timestamp.
@@ -104,13 +141,18 @@ def base_10_to_36(b10) -> str:
         """
 
     b10 = int(b10)
-    b36 = ""
-    base_len = len(static.Misc.base36)
+    if not b10:
+        return static.Misc.base36[0]
+
+    # Collect the digits least significant first, then join them once
+    digits = []
+    sign = "-" if b10 < 0 else ""
+    b10 = abs(b10)
     while b10:
-        b36 = static.Misc.base36[b10 % base_len] + b36
-        b10 //= base_len
+        b10, digit = divmod(b10, 36)
+        digits.append(static.Misc.base36[digit])
 
-    return b36
+    return sign + "".join(reversed(digits))
 
 def base_36_to_10(b36) -> int:
     """Convert a base 36 number to base 10.
@@ -124,6 +166,108 @@ def base_36_to_10(b36) -> int:
 
     return int(str(b36), 36)
 
+def base_10_to_36_many(numbers):
+    """Convert many base 10 numbers to base 36 at once.
+
+    Args:
+        numbers (Iterable, numpy.ndarray): The base 10 numbers. A NumPy array of non-negative integers is converted vectorized.
+
+    Returns:
+        B36 (list, numpy.ndarray): The same numbers in base 36, as a NumPy array of str if given a NumPy array.
+        """
+
+    # NumPy is optional, and if it was never imported we cannot have been given an array
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(numbers, numpy.ndarray):
+        return _base_10_to_36_array(numbers)
+
+    return [base_10_to_36(b10) for b10 in numbers]
+
+def base_36_to_10_many(numbers):
+    """Convert many base 36 numbers to base 10 at once.
+
+    Args:
+        numbers (Iterable, numpy.ndarray): The base 36 numbers. A NumPy array of str is converted vectorized.
+
+    Returns:
+        B10 (list, numpy.ndarray): The same numbers in base 10, as a NumPy int64 array if given a NumPy array (uint64 if any are too large for int64).
+        """
+
+    # NumPy is optional, and if it was never imported we cannot have been given an array
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(numbers, numpy.ndarray):
+        return _base_36_to_10_array(numbers)
+
+    return [int(str(b36), 36) for b36 in numbers]
+
+def _base_10_to_36_array(numbers):
+    """Convert a NumPy array of non-negative base 10 integers to base 36, vectorized.
+
+    Args:
+        numbers (numpy.ndarray): The base 10 numbers, up to 64 bits.
+
+    Returns:
+        B36 (numpy.ndarray): The same numbers in base 36, as str.
+        """
+
+    import numpy
+
+    assert not numbers.size or numbers.min() >= 0, "Only non-negative numbers can be converted in bulk"
+    values = numbers.astype(numpy.uint64).ravel()
+
+    # Fill in digit columns from the right, 13 base 36 digits hold any 64 bit number
+    width = 13
+    alphabet = numpy.frombuffer(static.Misc.base36.encode(), dtype = numpy.uint8)
+    chars = numpy.empty((values.size, width), dtype = numpy.uint8)
+    for column in range(width - 1, -1, -1):
+        values, digits = numpy.divmod(values, numpy.uint64(36))
+        chars[:, column] = alphabet[digits]
+
+    # Reinterpret each row as one string, and drop the leading zeros
+    b36 = numpy.char.lstrip(chars.view(f"S{width}").ravel(), b"0")
+    b36[b36 == b""] = b"0"
+    return b36.astype(str).reshape(numbers.shape)
+
+def _base_36_to_10_array(numbers):
+    """Convert a NumPy array of base 36 strings to base 10, vectorized.
+
+    Args:
+        numbers (numpy.ndarray): The base 36 numbers, up to 13 digits and 64 bits.
+
+    Returns:
+        B10 (numpy.ndarray): The same numbers in base 10, as int64, or uint64 if any are too large for int64.
+        """
+
+    import numpy
+
+    # Work on the raw bytes of each string, which are null padded on the right
+    encoded = numpy.char.lower(numbers.astype(str)).astype(numpy.bytes_).ravel()
+    width = encoded.dtype.itemsize
+    assert width <= 13, "Only numbers of up to 13 base 36 digits can be converted in bulk"
+    chars = encoded.view(numpy.uint8).reshape(encoded.size, width)
+
+    # Map each byte to its digit value
+    lookup = numpy.zeros(256, dtype = numpy.uint64)
+    lookup[numpy.frombuffer(static.Misc.base36.encode(), dtype = numpy.uint8)] = numpy.arange(36)
+    digits = lookup[chars]
+
+    # Horner's method across the columns, skipping the padding.
+    # 13 digits can go past 64 bits, so check each step would fit first.
+    base = numpy.uint64(36)
+    limit = numpy.uint64(2 ** 64 - 1)
+    b10 = numpy.zeros(encoded.size, dtype = numpy.uint64)
+    for column in range(width):
+        present = chars[:, column] != 0
+        if numpy.any(present & (b10 > (limit - digits[:, column]) // base)):
+            raise ValueError("Only numbers of up to 64 bits can be converted in bulk")
+        b10 = numpy.where(present, b10 * base + digits[:, column], b10)
+
+    # Keep the usual signed type unless a number needs all 64 bits
+    if not b10.size or b10.max() <= numpy.iinfo(numpy.int64).max:
+        b10 = b10.astype(numpy.int64)
+
+    return b10.reshape(numbers.shape)
+
 def ensure_b36(num, assume_10 = False) -> str:
     """No matter wether a number is base 36 or 10, return 36.
 
@@ -173,7 +317,7 @@ def ensure_b10(num, assume_10 = False) -> int:
 
         # The string number is in base 10
         if num.isnumeric() and assume_10:
-            return base_10_to_36(num), int(num)
+            return int(num)
 
     # It is base 36:
     return base_36_to_10(num)
@@ -245,20 +389,26 @@ def generate_request_id() -> str:
     b64_encoded = base64.b64encode(random_uuid).decode(static.Misc.text_encoding)
     return b64_encoded.rstrip('=')[:43]
 
-def test_session_cookie(session_cookie: dict) -> bool:
+def test_session_cookie(session_cookie: dict, transport = None, config = None) -> bool:
     """Test if a session cookie dict is valid.
 
     Args:
         session_cookie (dict): The session cookie dict to test.
+        transport (Transport): The HTTP transport to make the request with.
+            Defaults to the shared default transport.
+        config (Config): Settings for the timeout, base URL and headers.
+            Defaults to the default config.
 
     Returns:
         Result (bool): Is the cookie dict valid?
         """
 
-    r = requests.get(static.URI.login_test,
+    config = config or get_default_config()
+    r = (transport or get_default_transport()).get(config.login_test_url,
+            endpoint = "login_test",
             cookies = session_cookie,
-            headers = static.RequestHeaders.user_agent,
-            timeout = static.Delays.request_timeout,
+            headers = config.headers,
+            timeout = config.request_timeout,
         )
 
     assert r.status_code == 200, f"Testing session token failed: {r}"
@@ -268,7 +418,7 @@ def test_session_cookie(session_cookie: dict) -> bool:
     # If the session token is invalid, it won't log us in and "Login" will still be shown
     return "Login" not in title
 
-def options_check(url: str, method: str, origin = static.URI.rumble_base, cookies: dict = {}, params: dict = {}) -> bool:
+def options_check(url: str, method: str, origin = static.URI.rumble_base, cookies: dict = {}, params: dict = {}, transport = None, config = None) -> bool:
     """Check of we are allowed to do method on url via an options request
 
     Args:
@@ -280,13 +430,20 @@ def options_check(url: str, method: str, origin = static.URI.rumble_base, cookie
             Defaults to no cookies.
         params (dict): Parameters to use in the request.
             Defaults to no parameters.
+        transport (Transport): The HTTP transport to make the request with.
+            Defaults to the shared default transport.
+        config (Config): Settings for the timeout.
+            Defaults to the default config.
 
     Returns:
         Result (bool): Is the HTTP method allowed at the URL?
         """
 
-    r = requests.options(
+    config = config or get_default_config()
+
+    r = (transport or get_default_transport()).options(
         url,
+        endpoint = "options",
         headers = {
             'Access-Control-Request-Method' : method.upper(),
             'Access-Control-Request-Headers' : 'content-type',
@@ -294,6 +451,6 @@ def options_check(url: str, method: str, origin = static.URI.rumble_base, cookie
             },
         cookies = cookies,
         params = params,
-        timeout = static.Delays.request_timeout,
+        timeout = config.request_timeout,
         )
     return r.status_code == 200
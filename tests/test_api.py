@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Live Stream API tests
+
+Tests for the Rumble Live Stream API wrappers, RumbleAPI and AsyncRumbleAPI, against the stand-in server in cocorum.testing.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import threading
+import time
+import warnings
+import pytest
+from cocorum import RumbleAPI, testing
+from cocorum.asyncapi import AsyncRumbleAPI
+
+@pytest.fixture
+def server():
+    """A running stand-in server, whose Live Stream API records when each request came in and takes a moment to answer"""
+    with testing.StandInServer() as server:
+        server.request_times = []
+
+        def slow_api():
+            server.request_times.append(time.time())
+            time.sleep(0.2)
+            return testing.livestream_api_json(2)
+
+        server.fixtures.livestream_api = slow_api
+        yield server
+
+def make_api(server, **kwargs) -> RumbleAPI:
+    """Connect to the server's Live Stream API, without the warnings about short intervals"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return RumbleAPI(server.api_url, config = server.config(), **kwargs)
+
+def run_threads(target, count: int = 8):
+    """Run a function in several threads at once, and wait for them all"""
+    barrier = threading.Barrier(count)
+
+    def worker():
+        """Start together with the other workers"""
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target = worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_single_flight_refresh(server):
+    """Many threads finding the data stale at once make only one request between them"""
+    api = make_api(server, min_request_interval = 0)
+    assert len(server.request_times) == 1
+
+    api.last_refresh_time = 0 # Make the data stale
+    run_threads(api.check_refresh)
+    assert len(server.request_times) == 2
+
+def test_no_wait_keeps_previous_data(server):
+    """With refresh_wait off, readers return the previous data instead of waiting on the refresh"""
+    api = make_api(server, min_request_interval = 0, refresh_wait = False)
+    api.last_refresh_time = 0
+
+    refresher = threading.Thread(target = api.check_refresh)
+    refresher.start()
+    while len(server.request_times) < 2:
+        time.sleep(0.005)
+
+    start = time.time()
+    assert len(api.livestreams) == 2
+    assert time.time() - start < 0.1
+    refresher.join()
+
+def test_request_spacing_floor(server):
+    """Refreshes forced from many threads at once are still spaced min_request_interval apart"""
+    api = make_api(server, min_request_interval = 0.4)
+    run_threads(api.refresh, count = 3)
+
+    times = server.request_times
+    assert len(times) == 4
+
+    # Measured on arrival at the server, so allow for a little jitter. Without the floor they would only be the 0.2 second response time apart.
+    assert all(later - earlier > 0.35 for earlier, later in zip(times, times[1:]))
+
+def test_async_before_refresh():
+    """An async API that has not refreshed yet has no livestreams, rather than failing"""
+    api = AsyncRumbleAPI("https://rumble.com/-livestream-api/get-data?key=standin")
+    assert dict(api.livestreams) == {}
+    assert api.latest_livestream is None
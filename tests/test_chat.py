@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Chat tests
+
+Tests for the chat SSE wrapper in cocorum.chatapi, against the stand-in server in cocorum.testing.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import pytest
+from cocorum import chatapi, testing
+
+STREAM_ID = 5
+
+@pytest.fixture
+def server():
+    """A running stand-in server"""
+    with testing.StandInServer() as server:
+        yield server
+
+def open_chat(server, events: list, **kwargs) -> chatapi.ChatAPI:
+    """Connect to a chat stream that sends some events and then closes.
+
+    Args:
+        server (StandInServer): The server to connect to.
+        events (list): The SSE events, starting with an init event.
+        **kwargs: Other ChatAPI arguments.
+
+    Returns:
+        Chat (ChatAPI): The connected chat.
+        """
+
+    server.fixtures.chat_events[STREAM_ID] = events
+    server.close_chat(STREAM_ID)
+    return chatapi.ChatAPI(STREAM_ID, config = server.config(), **kwargs)
+
+def test_failing_callback(server):
+    """A message callback that raises only warns, and the rest of the batch is still stored and called back"""
+    messages = [testing.chat_message_json(i, 1, f"Message {i}") for i in (1, 2, 3)]
+    chat = open_chat(server, [testing.chat_init_event(3), testing.chat_messages_event(messages)], queue_messages = False)
+    seen = []
+
+    @chat.on_message
+    def callback(message):
+        seen.append(message.message_id)
+        if message.message_id == 2:
+            raise RuntimeError("broken")
+
+    with pytest.warns(UserWarning, match = "broken"):
+        chat.run()
+
+    assert seen == [1, 2, 3]
+    assert all(chat.message_by_id(i) for i in (1, 2, 3))
+
+def test_resent_init_no_duplicates(server):
+    """An init event re-sent after reconnecting does not add the messages we already have again"""
+    chat = open_chat(server, [testing.chat_init_event(3, 3), testing.chat_init_event(3, 4)])
+    received = []
+    while message := chat.get_message():
+        received.append(message.message_id)
+
+    assert received == [0, 1, 2, 3]
+    assert [message.message_id for message in chat.history] == [0, 1, 2, 3]
+
+def test_delete_unread_message(server):
+    """Deleting a message still in the mailbox flags it before it is read"""
+    chat = open_chat(server, [
+        testing.chat_init_event(3),
+        testing.chat_messages_event([testing.chat_message_json(10, 1), testing.chat_message_json(11, 2)]),
+        {"type": "delete_messages", "data": {"message_ids": [10]}},
+        ])
+    deleted = []
+    chat.on_delete(lambda message_id, message: deleted.append((message_id, message)))
+
+    # Handle both events before reading anything
+    chat.poll_event()
+    chat.poll_event()
+
+    first = chat.get_message()
+    assert first.message_id == 10 and first.deleted
+    assert not chat.get_message().deleted
+    assert deleted == [(10, first)]
+
+def test_shrink_history(server):
+    """Shrinking history_len drops the oldest messages from the history and from the ID index"""
+    messages = [testing.chat_message_json(i, 1) for i in range(1, 6)]
+    chat = open_chat(server, [testing.chat_init_event(3), testing.chat_messages_event(messages)], queue_messages = False)
+    chat.run()
+    assert len(chat.history) == 5
+
+    chat.history_len = 2
+    assert [message.message_id for message in chat.history] == [4, 5]
+    assert chat.message_by_id(1) is None and chat.message_by_id(3) is None
+    assert chat.message_by_id(5) is chat.history[-1]
+
+    # Growing it again keeps what is left
+    chat.history_len = 10
+    assert [message.message_id for message in chat.history] == [4, 5]
+
+def test_history_eviction(server):
+    """Messages that fall off the end of the history leave the ID index too"""
+    messages = [testing.chat_message_json(i, 1) for i in range(1, 6)]
+    chat = open_chat(server, [testing.chat_init_event(3), testing.chat_messages_event(messages)], history_len = 3)
+    while chat.get_message():
+        pass
+
+    assert [message.message_id for message in chat.history] == [3, 4, 5]
+    assert chat.message_by_id(2) is None
+
+def test_channel_user(server):
+    """A channel resolves to its user once a message shows the user appearing as it"""
+    init = testing.chat_init_event(3)
+    init["data"]["channels"] = [{"id": "77", "username": "channel77", "link": "/c/channel77"}]
+    chat = open_chat(server, [init, testing.chat_messages_event([testing.chat_message_json(10, 1, channel_id = 77)])], queue_messages = False)
+
+    channel = chat.channels[77]
+    assert channel.user is None
+
+    chat.run()
+    assert channel.user is chat.users[1]
+    assert chat.users[1].channel_id == 77
+    assert channel.is_appearing
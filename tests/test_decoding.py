@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Decoding tests
+
+Tests for the JSON decoder with json5 fallback in cocorum.decoding.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import json
+import threading
+import pytest
+from cocorum import decoding
+
+@pytest.fixture(params = ["json", "fastest"])
+def decoder(request):
+    """A fresh decoder, with the standard library decoder or the fastest available"""
+    return decoding.Decoder(json.loads if request.param == "json" else None)
+
+def test_strict_json(decoder):
+    """Strict JSON, as str or bytes, is decoded without the fallback"""
+    assert decoder.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert decoder.loads(b'{"b": null}') == {"b": None}
+    assert (decoder.decodes, decoder.fallbacks) == (2, 0)
+    assert decoder.fallback_rate == 0.0
+
+def test_json5_fallback(decoder):
+    """JSON5 that the strict decoder rejects is decoded by json5, and counted"""
+    assert decoder.loads("{'a': 1, b: [2,],}") == {"a": 1, "b": [2]}
+    assert decoder.loads(b"{'c': 'd'}") == {"c": "d"}
+    assert decoder.loads("[3]") == [3]
+    assert (decoder.decodes, decoder.fallbacks) == (3, 2)
+    assert decoder.fallback_rate == pytest.approx(2 / 3)
+
+def test_invalid(decoder):
+    """Data that neither decoder accepts still raises"""
+    with pytest.raises(ValueError):
+        decoder.loads("{not json")
+
+def test_counts_across_threads():
+    """Decodes from many threads are all counted"""
+    decoder = decoding.Decoder(json.loads)
+
+    def worker():
+        """Decode a mix of strict JSON and JSON5"""
+        for _ in range(100):
+            decoder.loads("[1]")
+            decoder.loads("[1,]")
+
+    threads = [threading.Thread(target = worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (decoder.decodes, decoder.fallbacks) == (800, 400)
+
+def test_default_decoder():
+    """The default decoder is shared until replaced"""
+    original = decoding.get_default_decoder()
+    assert decoding.get_default_decoder() is original
+
+    replacement = decoding.Decoder(json.loads)
+    decoding.set_default_decoder(replacement)
+    try:
+        assert decoding.get_default_decoder() is replacement
+    finally:
+        decoding.set_default_decoder(original)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Change event tests
+
+Tests for cocorum.events, the typed changes found between Live Stream API refreshes.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import copy
+import json
+from cocorum import APIIngester, events, metrics, testing
+
+def ingest_pair(old: dict, new: dict) -> tuple:
+    """Take in two API responses, the way a client would on two refreshes.
+
+    Returns:
+        Old (APISnapshot): The snapshot after the first response.
+        New (APISnapshot): The snapshot after the second response.
+        Changes (list): The change events the ingester found.
+        """
+
+    ingester = APIIngester(metrics.MetricsRegistry())
+    ingester.ingest(json.dumps(old).encode())
+    old_snapshot = ingester.snapshot
+    ingester.ingest(json.dumps(new).encode())
+    return old_snapshot, ingester.snapshot, ingester.changes
+
+def kinds(changes: list) -> list:
+    """The kind of each change event"""
+    return [event.kind for event in changes]
+
+def test_no_baseline():
+    """The first response is the baseline, so it has no changes"""
+    ingester = APIIngester(metrics.MetricsRegistry())
+    assert ingester.ingest(json.dumps(testing.livestream_api_json(2)).encode())
+    assert ingester.changes == []
+
+def test_unchanged():
+    """Nothing but the timestamp changing makes no events"""
+    data = testing.livestream_api_json(2)
+    _, _, changes = ingest_pair(data, dict(data, now = 5))
+    assert changes == []
+
+def test_unchanged_keeps_snapshot():
+    """A response where only the timestamp changed keeps the same snapshot, and still updates the timestamp"""
+    data = testing.livestream_api_json(2)
+    ingester = APIIngester(metrics.MetricsRegistry())
+    ingester.ingest(json.dumps(data).encode())
+    snapshot = ingester.snapshot
+    assert not ingester.ingest(json.dumps(dict(data, now = data["now"] + 5)).encode())
+    assert ingester.snapshot is snapshot
+    assert ingester.now == data["now"] + 5
+
+def test_followers_and_subscribers():
+    """New followers and subscribers are reported oldest first, old ones are not repeated"""
+    old = testing.livestream_api_json(1)
+    old["followers"]["recent_followers"] = [{"username": "a", "followed_on": "2025-01-01T00:00:00+00:00"}]
+    new = copy.deepcopy(old)
+    new["followers"]["recent_followers"] = [
+        {"username": "c", "followed_on": "2025-01-01T00:00:02+00:00"},
+        {"username": "b", "followed_on": "2025-01-01T00:00:01+00:00"},
+        {"username": "a", "followed_on": "2025-01-01T00:00:00+00:00"},
+        ]
+    new["subscribers"]["recent_subscribers"] = [{"username": "d", "subscribed_on": "2025-01-01T00:00:03+00:00", "amount_cents": 500, "amount_dollars": 5}]
+
+    _, _, changes = ingest_pair(old, new)
+    assert kinds(changes) == ["follower_added", "follower_added", "subscriber_added"]
+    assert [event.follower.username for event in changes[:2]] == ["b", "c"]
+    assert changes[2].subscriber.username == "d"
+
+def test_gifted_subs():
+    """Only gifts beyond those already seen are reported, even when they look identical"""
+    gift = {"purchased_by": "e", "video_id": 1, "total_gifts": 5, "gift_type": "sub"}
+    old = testing.livestream_api_json(1)
+    old["recent_gifted_subs"] = [gift]
+    new = copy.deepcopy(old)
+    new["recent_gifted_subs"] = [gift, dict(gift)]
+
+    _, _, changes = ingest_pair(old, new)
+    assert kinds(changes) == ["gifted_sub_added"]
+
+def test_livestreams():
+    """Livestreams appearing, ending, disappearing and changing are reported"""
+    old = testing.livestream_api_json(3)
+    new = copy.deepcopy(old)
+    gone = new["livestreams"].pop(0)
+    new["livestreams"][0]["is_live"] = False
+    new["livestreams"][1]["title"] = "New title"
+    new["livestreams"][1]["watching_now"] = 10
+    new["livestreams"].append(testing.livestream_json(3))
+
+    old_snapshot, new_snapshot, changes = ingest_pair(old, new)
+    assert kinds(changes) == [
+        "livestream_ended", "livestream_disappeared", # The first livestream, which was live
+        "livestream_ended", # The second
+        "livestream_changed", "livestream_count_changed", # The third
+        "livestream_appeared", "livestream_went_live", # The new one
+        ]
+    assert changes[0].livestream.stream_id == gone["id"]
+    assert (changes[3].field, changes[3].old, changes[3].new) == ("title", "Livestream 2", "New title")
+    assert (changes[4].field, changes[4].old, changes[4].new) == ("watching_now", 1, 10)
+
+    # The ingester and a direct diff agree
+    assert kinds(events.diff_snapshots(old_snapshot, new_snapshot)) == kinds(changes)
+
+def test_unchanged_livestream_keeps_json():
+    """A livestream that did not change keeps its old JSON object, so it is skipped by identity"""
+    old = testing.livestream_api_json(2)
+    new = copy.deepcopy(old)
+    new["livestreams"][1]["likes"] = 3
+
+    old_snapshot, new_snapshot, changes = ingest_pair(old, new)
+    first_id = old["livestreams"][0]["id"]
+    assert new_snapshot.livestreams[first_id]._jsondata is old_snapshot.livestreams[first_id]._jsondata
+    assert kinds(changes) == ["livestream_count_changed"]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Polling tests
+
+Tests for cocorum.polling, the scheduler for polling many Live Stream API keys.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import threading
+import time
+import pytest
+from cocorum import polling
+
+class BlockingAPI:
+    """Stands in for a RumbleAPI whose refreshes wait until released"""
+    refresh_rate = 1.0
+    min_request_interval = 0
+    last_refresh_time = 0
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.refreshes = 0
+
+    def refresh(self):
+        self.last_refresh_time = time.time()
+        self.refreshes += 1
+        self.started.set()
+        self.release.wait(5)
+
+def queued(scheduler, api) -> int:
+    """How many queue entries an API has"""
+    return sum(entry[2] is api for entry in scheduler._PollScheduler__queue)
+
+def wait_for(condition, timeout = 5):
+    """Wait until a condition is true"""
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, "Timed out"
+        time.sleep(0.005)
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """A scheduler that allows short intervals, stopped afterwards"""
+    monkeypatch.setattr(polling.static.Delays, "api_refresh_minimum", 0.01)
+    scheduler = polling.PollScheduler(max_workers = 2)
+    yield scheduler
+    scheduler.stop(wait = False)
+
+def test_rebalance_during_poll(scheduler):
+    """Rebalancing while a poll is in flight leaves the API with one queue entry, not two"""
+    api = BlockingAPI()
+    scheduler.add(api)
+    scheduler.start()
+    api.started.wait(5)
+
+    scheduler.rebalance()
+    assert queued(scheduler, api) == 0
+
+    api.release.set()
+    wait_for(lambda: scheduler.stats[api].successes == 1)
+    assert queued(scheduler, api) == 1
+
+def test_readd_during_poll(scheduler):
+    """Removing and adding back an API while it is polled leaves it with one queue entry"""
+    api = BlockingAPI()
+    scheduler.add(api)
+    scheduler.start()
+    api.started.wait(5)
+
+    scheduler.remove(api)
+    scheduler.add(api)
+    api.release.set()
+    wait_for(lambda: scheduler.stats[api].last_poll_time)
+    assert queued(scheduler, api) == 1
+
+def test_rebalance_spreads_polls(scheduler):
+    """Rebalancing spreads idle APIs evenly across their interval"""
+    apis = [BlockingAPI() for _ in range(4)]
+    for api in apis:
+        scheduler.add(api)
+
+    start = time.time()
+    scheduler.rebalance()
+    dues = sorted(entry[0] - start for entry in scheduler._PollScheduler__queue)
+    assert len(dues) == 4
+    for i, due in enumerate(dues):
+        assert due == pytest.approx(i * 0.25, abs = 0.05)
+
+def test_interval_changed_by_refresh(scheduler):
+    """A refresh that changes the refresh rate, as a refresh policy does, sets when the next poll is due"""
+    api = BlockingAPI()
+    api.release.set()
+    original_refresh = api.refresh
+
+    def refresh():
+        original_refresh()
+        api.refresh_rate = 30.0
+
+    api.refresh = refresh
+    scheduler.add(api)
+    scheduler.start()
+    wait_for(lambda: scheduler.stats[api].successes == 1 and queued(scheduler, api) == 1)
+
+    due = next(entry[0] for entry in scheduler._PollScheduler__queue if entry[2] is api)
+    assert due - scheduler.stats[api].last_poll_time > 20
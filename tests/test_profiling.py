@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Profiling tests
+
+Tests for the hot path hooks and profilers in cocorum.profiling.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import threading
+import warnings
+import pytest
+from cocorum import profiling
+
+def busy_work():
+    """Something for the profiler to see"""
+    return sum(i * i for i in range(2000))
+
+def test_broken_hook_warns():
+    """A hook that raises only warns, and the hot path still runs"""
+    def broken(point, info):
+        raise RuntimeError("broken")
+
+    hook = profiling.register_hook(profiling.Points.api_parse, before = broken)
+    try:
+        with pytest.warns(UserWarning, match = "broken"):
+            with profiling.section(profiling.Points.api_parse):
+                result = busy_work()
+    finally:
+        profiling.unregister_hook(hook)
+
+    assert result == busy_work()
+
+def test_cprofile_window_threads():
+    """Threads overlapping inside hot paths share the one profiler without errors"""
+    window = profiling.CProfileWindow(points = (profiling.Points.api_parse,))
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def worker():
+        """Enter the hot path at the same time as the other workers"""
+        try:
+            barrier.wait()
+            for _ in range(20):
+                with profiling.section(profiling.Points.api_parse):
+                    busy_work()
+        except Exception as e:
+            errors.append(e)
+
+    window.start()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            threads = [threading.Thread(target = worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        window.stop()
+
+    assert not errors
+    stats = window.stats()
+    assert stats is not None
+    assert any(func[2] == "busy_work" for func in stats.stats)
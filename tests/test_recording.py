@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Recording tests
+
+Tests for cocorum.recording, recording traffic from the stand-in server in cocorum.testing and replaying it offline.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import gzip
+import warnings
+import pytest
+from cocorum import RumbleAPI, chatapi, recording, testing
+
+@pytest.fixture
+def server():
+    """A running stand-in server"""
+    with testing.StandInServer() as server:
+        yield server
+
+def read_chat(chat) -> list:
+    """Read every message until the chat closes"""
+    messages = []
+    while message := chat.get_message():
+        messages.append((message.message_id, message.user.username, message.text))
+    return messages
+
+def test_replay_chat(server, tmp_path):
+    """A recorded chat session replays with the same messages, without the server"""
+    path = tmp_path / "chat.jsonl.gz"
+    server.fixtures.chat_events[5] = [
+        testing.chat_init_event(3, 4),
+        testing.chat_messages_event([testing.chat_message_json(10, 1, "Hello"), testing.chat_message_json(11, 2, "World")]),
+        {"type": "delete_messages", "data": {"message_ids": [10]}},
+        ]
+    server.close_chat(5)
+
+    with recording.RecordingTransport(path) as transport:
+        recorded = read_chat(chatapi.ChatAPI(5, transport = transport, config = server.config()))
+
+    assert len(recorded) == 6
+    server.stop()
+
+    replay = recording.ReplayTransport(path, speed = None)
+    chat = chatapi.ChatAPI(5, transport = replay, config = server.config())
+    assert read_chat(chat) == recorded
+    assert chat.message_by_id(10).deleted
+    assert replay.remaining == 0
+
+def test_replay_api_redacts_key(server, tmp_path):
+    """The Live Stream API key is not written to the recording, and the replay still matches"""
+    path = tmp_path / "api.jsonl.gz"
+    server.fixtures.livestream_api = testing.livestream_api_json(2)
+    api_url = server.api_url
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with recording.RecordingTransport(path) as transport:
+            RumbleAPI(api_url, min_request_interval = 0, transport = transport, config = server.config()).refresh()
+
+        with gzip.open(path, "rt") as f:
+            assert "key=standin" not in f.read()
+
+        api = RumbleAPI(api_url, min_request_interval = 0, transport = recording.ReplayTransport(path, speed = None), config = server.config())
+        api.refresh()
+
+    assert len(api.livestreams) == 2
+
+def test_replay_runs_out(server, tmp_path):
+    """Asking a replay for an exchange it does not have is an error"""
+    path = tmp_path / "empty.jsonl.gz"
+    recording.RecordingTransport(path).close()
+
+    with pytest.raises(ValueError):
+        recording.ReplayTransport(path, speed = None).get(server.api_url, endpoint = "livestream_api")
+
+def test_truncated_recording_warns(server, tmp_path):
+    """A recording that was not closed properly warns, and replays what it has"""
+    path = tmp_path / "api.jsonl.gz"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with recording.RecordingTransport(path) as transport:
+            RumbleAPI(server.api_url, min_request_interval = 0, transport = transport, config = server.config()).refresh()
+
+    recorded = recording.ReplayTransport(path, speed = None).remaining
+    data = path.read_bytes()
+    path.write_bytes(data[:-8]) # Cut off the gzip trailer
+
+    with pytest.warns(UserWarning, match = "ends early"):
+        replay = recording.ReplayTransport(path, speed = None)
+    assert replay.remaining == recorded
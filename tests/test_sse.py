@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""SSE parser tests
+
+Tests for cocorum.sse, the server-sent event reader used by the chat.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import gzip
+import io
+import random
+import time
+import pytest
+import urllib3
+from cocorum import sse
+
+class StreamRaw:
+    """Stands in for a chunked raw response, giving out fixed pieces"""
+    chunked = True
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def stream(self, amt = 2 ** 16, decode_content = None):
+        yield from self.pieces
+
+class Response:
+    """Stands in for a streamed requests response"""
+    def __init__(self, raw):
+        self.raw = raw
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def read_events(pieces):
+    """Parse the events in a stream split into pieces"""
+    return [(event.data, event.event, event.event_id) for event in sse.SSEReader(Response(StreamRaw(pieces))).events()]
+
+def test_single_data_lines():
+    """Plain data events come out as bytes, in order"""
+    body = b'data: {"a": 1}\n\ndata:{"b": 2}\n\n'
+    assert read_events([body]) == [(b'{"a": 1}', "message", None), (b'{"b": 2}', "message", None)]
+
+def test_fields_comments_and_multiline_data():
+    """Event types, IDs and multi-line data are parsed, comments and data-less events are skipped"""
+    body = b": keepalive\n\nevent: update\nid: 7\ndata: one\ndata: two\n\nevent: nodata\n\nretry: 500\ndata: x\n\n"
+    events = list(sse.SSEReader(Response(StreamRaw([body]))).events())
+    assert [(event.data, event.event, event.event_id) for event in events] == [(b"one\ntwo", "update", "7"), (b"x", "message", None)]
+    assert events[1].retry == 500
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+def test_any_split_and_line_ending(newline):
+    """Events come out the same however the stream is split, with any line ending"""
+    body = b"".join(b"id: %d" % i + newline + b"data: %d" % i + newline + newline for i in range(50))
+    expected = [(b"%d" % i, "message", str(i)) for i in range(50)]
+
+    generator = random.Random(0)
+    for _ in range(20):
+        cuts = sorted(generator.sample(range(1, len(body)), 40))
+        pieces = [body[start:end] for start, end in zip([0] + cuts, cuts + [len(body)])]
+        assert read_events(pieces) == expected
+
+    # One byte at a time puts every CR and LF on a boundary
+    assert read_events([bytes([byte]) for byte in body]) == expected
+
+def test_unterminated_last_event():
+    """An event cut off by the end of the stream is still given out"""
+    assert read_events([b"data: 1\n\ndata: 2"]) == [(b"1", "message", None), (b"2", "message", None)]
+
+def test_large_event_in_small_pieces():
+    """A large event arriving in many small reads is parsed in linear time"""
+    data = b"x" * 2_000_000
+    body = b"data: " + data + b"\n\n"
+    pieces = [body[i:i + 1400] for i in range(0, len(body), 1400)]
+
+    start = time.perf_counter()
+    assert read_events(pieces) == [(data, "message", None)]
+    assert time.perf_counter() - start < 0.5
+
+def test_gzip_without_chunked_encoding():
+    """A gzip body without chunked encoding is read with read1() and decoded"""
+    body = gzip.compress(b'data: {"a":1}\n\ndata: {"b":2}\n\n')
+    # requests leaves decoding off on its raw responses, so the reader must ask for it
+    raw = urllib3.HTTPResponse(io.BytesIO(body), headers = {"content-encoding": "gzip"}, preload_content = False, decode_content = False)
+    assert not raw.chunked
+
+    assert [event.data for event in sse.SSEReader(Response(raw)).events()] == [b'{"a":1}', b'{"b":2}']
+
+def test_close():
+    """Closing the reader closes the response"""
+    response = Response(StreamRaw([]))
+    sse.SSEReader(response).close()
+    assert response.closed
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Utility tests
+
+Tests for the conversions and parsers in cocorum.utils.
+
+Copyright 2025 Wilbur Jaywright.
+
+This file is part of Cocorum.
+
+Cocorum is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+Cocorum is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with Cocorum. If not, see <https://www.gnu.org/licenses/>.
+
+S.D.G."""
+
+import pytest
+from cocorum import utils
+
+NUMBERS = [0, 1, 35, 36, 1295, 36 ** 12 - 1, 36 ** 12, 2 ** 63 - 1]
+
+def test_bulk_conversions():
+    """The bulk conversions agree with the single ones, both ways"""
+    b36 = utils.base_10_to_36_many(NUMBERS)
+    assert b36 == [utils.base_10_to_36(b10) for b10 in NUMBERS]
+    assert utils.base_36_to_10_many(b36) == NUMBERS
+
+def test_bulk_conversions_numpy():
+    """The vectorized conversions agree with the single ones, and round trip any 64 bit number"""
+    numpy = pytest.importorskip("numpy")
+    b10 = numpy.array(NUMBERS, dtype = numpy.int64)
+    b36 = utils.base_10_to_36_many(b10)
+    assert b36.tolist() == [utils.base_10_to_36(number) for number in NUMBERS]
+
+    back = utils.base_36_to_10_many(b36)
+    assert back.dtype == numpy.int64
+    assert back.tolist() == NUMBERS
+
+    # Numbers past int64 come back unsigned
+    unsigned = numpy.array([2 ** 64 - 1, 5], dtype = numpy.uint64)
+    back = utils.base_36_to_10_many(utils.base_10_to_36_many(unsigned))
+    assert back.dtype == numpy.uint64
+    assert back.tolist() == [2 ** 64 - 1, 5]
+
+    # Upper case digits and a multi-dimensional shape
+    assert utils.base_36_to_10_many(numpy.array([["Z", "10"], ["a", "0"]])).tolist() == [[35, 36], [10, 0]]
+
+def test_bulk_overflow_numpy():
+    """Numbers too large for 64 bits are refused rather than wrapped around"""
+    numpy = pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        utils.base_36_to_10_many(numpy.array([utils.base_10_to_36(2 ** 64)]))
+
+@pytest.mark.parametrize("num, assume_10, expected", [
+    (36, False, 36),
+    ("10", False, 36),
+    ("10", True, 10),
+    ("a", True, 10),
+    ])
+def test_ensure_b10(num, assume_10, expected):
+    """Numbers in either base come out as a base 10 int"""
+    assert utils.ensure_b10(num, assume_10) == expected
+
+@pytest.mark.parametrize("timestamp, expected", [
+    ("2025-01-31T23:59:59+00:00", 1738367999),
+    ("2025-01-31T23:59:59+05:30", 1738367999 - 5 * 3600 - 30 * 60),
+    ("2025-01-31T23:59:59-04:00", 1738367999 + 4 * 3600),
+    ])
+def test_parse_timestamp_offsets(timestamp, expected):
+    """Rumble timestamps have their offset applied, giving UTC"""
+    assert utils.parse_timestamp(timestamp) == expected
+
+@pytest.mark.parametrize("timestamp, expected", [
+    ("2025-01-31T23:59:59", 1738367999), # No offset, assumed UTC
+    ("2025-01-31T23:59:59.500000+00:00", 1738367999.5), # Fractional seconds
+    ("2025-01-31 23:59:59-01:00", 1738367999 + 3600), # Space separator
+    ])
+def test_parse_timestamp_fallback(timestamp, expected):
+    """Other ISO 8601 timestamps are parsed by the fallback"""
+    assert utils.parse_timestamp(timestamp) == expected
+
+def test_parse_timestamps_order():
+    """Parsing many timestamps keeps their order, repeats included"""
+    timestamps = ["2025-01-01T00:00:02+00:00", "2025-01-01T00:00:01+00:00", "2025-01-01T00:00:02+00:00", "2025-01-01T00:00:00+00:00"]
+    assert utils.parse_timestamps(timestamps) == [utils.parse_timestamp(timestamp) for timestamp in timestamps]
+    assert utils.parse_timestamps(iter(timestamps)) == [1735689602, 1735689601, 1735689602, 1735689600]
+
+def test_form_timestamp_round_trip():
+    """Formed timestamps parse back to the same time"""
+    assert utils.parse_timestamp(utils.form_timestamp(1738367999)) == 1738367999